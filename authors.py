@@ -0,0 +1,141 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from engagement import top_k
+
+# "A, B and C", "A and B", "A & B": a standalone "and" or "&" separates co-authors, and so does a
+# comma unless what follows it is a role, an agency or a name suffix ("A, Contributor", "A, AP").
+SEPARATOR = re.compile(r"\s*(?:,\s*and\s+|&|\band\b)\s*", re.IGNORECASE)
+BYLINE_PREFIX = re.compile(r"^by\s+", re.IGNORECASE)
+AFFILIATION = re.compile(
+    r"^(?:the\s+)?(?:associated press|ap|reuters|afp|upi|bloomberg|cnn|huffpost|huffington post)$"
+    r"|\b(?:contributor|staff|writer|reporter|editor|correspondent|columnist|producer|intern|fellow|wire)",
+    re.IGNORECASE,
+)
+NAME_SUFFIX = re.compile(r"^(?:jr|sr|ii|iii|iv|md|phd)\.?$", re.IGNORECASE)
+SEARCH_LIMIT = 200
+
+
+def split_authors(raw):
+    """Individual author names in a byline, whitespace-normalized, without a leading "By".
+
+    Roles and agencies after a name ("A, Contributor", "A, AP") are dropped and suffixes stay
+    with their name ("A, Jr."); a byline that is only an agency ("Associated Press") keeps it.
+    """
+    if not isinstance(raw, str):
+        return []
+    names = []
+    for part in SEPARATOR.split(raw):
+        for name in part.split(","):
+            name = BYLINE_PREFIX.sub("", " ".join(name.split()))
+            if not name:
+                continue
+            if names and NAME_SUFFIX.match(name):
+                names[-1] = f"{names[-1]} {name}"
+            elif not (names and AFFILIATION.search(name)):
+                names.append(name)
+    return names
+
+
+def gather(indptr, indices, rows):
+    """Concatenated CSR entries of the given rows, and how many each row contributed."""
+    counts = indptr[rows + 1] - indptr[rows]
+    first = np.cumsum(counts) - counts
+    positions = np.repeat(indptr[rows] - first, counts) + np.arange(counts.sum())
+    return indices[positions], counts
+
+
+class AuthorIndex:
+    """Author dimension of the news table, built once per load.
+
+    Bylines are split once per distinct string, so "A, B and C" credits A, B and C. Names are
+    matched case-insensitively and shown as first spelled. articles_indptr/articles_authors map
+    each row to its author ids (CSR); author_indptr/author_rows map each author back to its
+    sorted rows, so filtering by an author and counting articles per author are array lookups.
+    """
+
+    def __init__(self, authors):
+        codes, bylines = pd.factorize(pd.Series(authors).reset_index(drop=True), use_na_sentinel=True)
+        ids = {}
+        names = []
+        byline_authors = []
+        for byline in bylines:
+            credited = []
+            for name in split_authors(byline):
+                key = name.casefold()
+                if key not in ids:
+                    ids[key] = len(names)
+                    names.append(name)
+                if ids[key] not in credited:
+                    credited.append(ids[key])
+            byline_authors.append(credited)
+        self.ids = ids
+        self.names = np.asarray(names, dtype=object)
+        self.num_rows = len(codes)
+
+        # Byline -> authors, then row -> authors through each row's byline code; rows with no
+        # byline point at an extra empty entry.
+        byline_sizes = np.array([len(credited) for credited in byline_authors] + [0], dtype=np.int64)
+        byline_indptr = np.concatenate([[0], np.cumsum(byline_sizes)])
+        byline_indices = np.fromiter((i for credited in byline_authors for i in credited), dtype=np.int64,
+                                     count=int(byline_sizes.sum()))
+        rows = np.where(codes >= 0, codes, len(bylines))
+        self.articles_authors, row_sizes = gather(byline_indptr, byline_indices, rows)
+        self.articles_indptr = np.concatenate([[0], np.cumsum(row_sizes)])
+
+        self.counts = np.bincount(self.articles_authors, minlength=len(names))
+        article_rows = np.repeat(np.arange(self.num_rows), row_sizes)
+        order = np.argsort(self.articles_authors, kind="stable")
+        self.author_rows = article_rows[order]
+        self.author_indptr = np.concatenate([[0], np.cumsum(self.counts)])
+
+        # Every word of every name, sorted, for prefix lookups on first or last names alike.
+        words = [(word, author) for author, name in enumerate(names) for word in name.casefold().split()]
+        words.sort()
+        self._words = np.array([word for word, _ in words], dtype=str)
+        self._word_authors = np.array([author for _, author in words], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def id(self, name):
+        return self.ids.get(" ".join(str(name).split()).casefold())
+
+    def rows(self, name):
+        """Sorted positions of the articles credited to name, co-authored ones included."""
+        author = self.id(name)
+        if author is None:
+            return np.empty(0, dtype=np.int64)
+        return self.author_rows[self.author_indptr[author]:self.author_indptr[author + 1]]
+
+    def authors_of(self, row):
+        return list(self.names[self.articles_authors[self.articles_indptr[row]:self.articles_indptr[row + 1]]])
+
+    def search(self, prefix="", limit=SEARCH_LIMIT):
+        """Up to limit names with a word starting with prefix, most prolific first."""
+        prefix = " ".join(prefix.split()).casefold()
+        if not prefix:
+            candidates = np.arange(len(self.names))
+        else:
+            # Match the first word by prefix, then check the whole prefix against each name.
+            first = prefix.split()[0]
+            lo, hi = np.searchsorted(self._words, [first, first + "\U0010ffff"])
+            candidates = np.unique(self._word_authors[lo:hi])
+            if " " in prefix:
+                candidates = np.array([author for author in candidates
+                                       if prefix in self.names[author].casefold()], dtype=np.int64)
+        chosen = candidates[top_k(self.counts[candidates], limit)]
+        return list(self.names[chosen])
+
+    def top(self, n=10, rows=None):
+        """Articles per author, most first, over all rows or just the given positions."""
+        if rows is None:
+            counts = self.counts
+        else:
+            authors, _ = gather(self.articles_indptr, self.articles_authors, np.asarray(rows, dtype=np.int64))
+            counts = np.bincount(authors, minlength=len(self.names))
+        chosen = top_k(counts, n)
+        chosen = chosen[counts[chosen] > 0]
+        return pd.Series(counts[chosen], index=pd.Index(self.names[chosen], name="authors"), name="count")
@@ -0,0 +1,228 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from authors import AuthorIndex
+from charts import density_grid, lttb
+from compact import NEWS_LAYOUT, YOUTUBE_LAYOUT, compact_frame
+from dedup import NEWS_TEXT_COLUMNS, NearDuplicateIndex, combine_text
+from engagement import EngagementAnalytics, top_videos
+from filter_engine import FilterEngine
+from rollups import RollupCube
+from search_index import SearchIndex
+from synthetic import make_news, make_youtube
+from table_window import NEWS_TABLE_COLUMNS, YOUTUBE_TABLE_COLUMNS, article_cards, page_window
+
+SCALES = [100000, 1000000, 10000000]
+THRESHOLDS_PATH = "benchmark_thresholds.json"
+
+
+def timed(fn, repeats):
+    """Run fn repeats times; return its last result and every wall-clock duration in seconds."""
+    durations = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - started)
+    return result, durations
+
+
+class Recorder:
+    def __init__(self, dataset, num_rows, repeats):
+        self.dataset = dataset
+        self.num_rows = num_rows
+        self.repeats = repeats
+        self.results = []
+
+    def stage(self, name, fn, repeats=None):
+        result, durations = timed(fn, repeats or self.repeats)
+        self.results.append({
+            "dataset": self.dataset,
+            "stage": name,
+            "rows": self.num_rows,
+            "rows_out": len(result) if isinstance(result, (pd.DataFrame, pd.Series, np.ndarray)) else None,
+            "best_s": min(durations),
+            "median_s": statistics.median(durations),
+            "ns_per_row": min(durations) * 1e9 / max(self.num_rows, 1),
+        })
+        return result
+
+
+def bench_youtube(num_rows, seed, repeats, directory):
+    record = Recorder("youtube", num_rows, repeats)
+    path = os.path.join(directory, "youtube.parquet")
+    make_youtube(num_rows, seed).to_parquet(path, index=False)
+
+    df = record.stage("load", lambda: compact_frame(pd.read_parquet(path), **YOUTUBE_LAYOUT))
+    dimensions = ["category_id", "channel_title"]
+    engine = record.stage("filter_index", lambda: FilterEngine(df, "publish_time", dimensions))
+    start, end = pd.Timestamp("2023-01-01"), pd.Timestamp("2024-06-30")
+    equals = {"category_id": df["category_id"].mode()[0], "channel_title": df["channel_title"].mode()[0]}
+    filtered = record.stage("filter_date", lambda: engine.filter(start, end))
+    record.stage("filter_date_category_channel", lambda: engine.filter(start, end, equals))
+
+    search = record.stage("search_index", lambda: SearchIndex(df, ["title", "tags"]))
+    record.stage("search", lambda: search.search("music live"))
+
+    cube = record.stage("rollup_index", lambda: RollupCube(df, "publish_time", ["category_id"], ["channel_title"]))
+    # Channel totals answer the sidebar's default, whole-snapshot date range.
+    first, last = engine.time_bounds()
+    category = {"category_id": equals["category_id"]}
+    in_category = engine.filter(first, last, category)
+    record.stage("top_channels", lambda: cube.top("channel_title", 10, first, last, category))
+    record.stage("top_channels_groupby", lambda: in_category["channel_title"].value_counts().head(10))
+
+    record.stage("table_page", lambda: page_window(filtered, 2, columns=YOUTUBE_TABLE_COLUMNS))
+    record.stage("scatter_grid", lambda: density_grid(filtered))
+
+    engagement = record.stage("engagement_index", lambda: EngagementAnalytics(df))
+    record.stage("leaderboard", lambda: engagement.leaderboard("likes", equals["category_id"]))
+    record.stage("top_liked", lambda: top_videos(filtered, "likes"))
+    record.stage("top_liked_sort", lambda: filtered.sort_values("likes", ascending=False).head(10))
+    return record.results
+
+
+def bench_news(num_rows, seed, repeats, directory):
+    record = Recorder("news", num_rows, repeats)
+    path = os.path.join(directory, "news.arrow")
+    table = pa.Table.from_pandas(make_news(num_rows, seed), preserve_index=False)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    del table
+
+    def load():
+        with pa.memory_map(path) as source:
+            df = pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True, self_destruct=True)
+        return compact_frame(df, **NEWS_LAYOUT)
+
+    df = record.stage("load", load)
+    # The same indexes the news view builds: authors are served by AuthorIndex, not the engine or cube.
+    engine = record.stage("filter_index", lambda: FilterEngine(df, "date", ["category"]))
+    start, end = pd.Timestamp("2016-01-01"), pd.Timestamp("2020-12-31")
+    equals = {"category": "POLITICS"}
+    record.stage("filter_date", lambda: engine.filter(start, end))
+    filtered = record.stage("filter_date_category", lambda: engine.filter(start, end, equals))
+
+    search = record.stage("search_index", lambda: SearchIndex(df, ["headline"]))
+    record.stage("search", lambda: search.search("study"))
+
+    cube = record.stage("rollup_index", lambda: RollupCube(df, "date", ["category"]))
+    per_day = record.stage("per_day", lambda: cube.per_day(start, end, equals))
+    record.stage("per_day_groupby", lambda: filtered.groupby(filtered["date"].dt.date).size())
+
+    authors = record.stage("author_index", lambda: AuthorIndex(df["authors"]))
+    author = authors.top(1).index[0]
+    record.stage("filter_date_category_author",
+                 lambda: engine.query(start, end, equals, authors.rows(author)))
+    positions = engine.query(start, end, equals)
+    record.stage("top_authors", lambda: authors.top(10, positions))
+    record.stage("author_search", lambda: authors.search("ma"))
+
+    record.stage("table_page", lambda: page_window(filtered, 2, 100, NEWS_TABLE_COLUMNS))
+    record.stage("article_cards", lambda: article_cards(filtered.iloc[100:200]))
+    record.stage("per_day_lttb", lambda: lttb(per_day))
+
+    texts = combine_text(df, NEWS_TEXT_COLUMNS)
+    record.stage("near_duplicates", lambda: NearDuplicateIndex().add(df["link"], texts), 1)
+    return record.results
+
+
+def run_benchmarks(scales=(SCALES[0],), seed=0, repeats=3, datasets=("youtube", "news")):
+    """Benchmark every dashboard stage at each scale and return a JSON-serializable report."""
+    benches = {"youtube": bench_youtube, "news": bench_news}
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for num_rows in scales:
+            for dataset in datasets:
+                logging.info(f"Benchmarking {dataset} at {num_rows} rows.")
+                results.extend(benches[dataset](num_rows, seed, repeats, directory))
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "seed": seed,
+        "repeats": repeats,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "results": results,
+    }
+
+
+def threshold_for(limit, num_rows):
+    """(budget, unit) of a thresholds entry at num_rows, or None when it has no budget there."""
+    if not isinstance(limit, dict):
+        return limit, "ns/row"
+    budget = limit["ms"]
+    if isinstance(budget, dict):
+        budget = budget.get(str(num_rows))
+    return None if budget is None else (budget, "ms")
+
+
+def check_thresholds(report, thresholds):
+    """Return a message for every stage slower than its threshold.
+
+    thresholds maps "dataset.stage" to the allowed nanoseconds per input row, for stages that
+    scale with the table, or to {"ms": budget} for stages that are constant-time or scale with
+    their result: budget is milliseconds at every scale, or a mapping from row count to
+    milliseconds (row counts it does not list are not checked).
+    """
+    failures = []
+    for result in report["results"]:
+        key = f"{result['dataset']}.{result['stage']}"
+        if key not in thresholds:
+            continue
+        limit = threshold_for(thresholds[key], result["rows"])
+        if limit is None:
+            continue
+        budget, unit = limit
+        actual = result["ns_per_row"] if unit == "ns/row" else result["best_s"] * 1000
+        if actual > budget:
+            failures.append(f"{key} at {result['rows']} rows: {actual:.1f} {unit} > {budget} {unit}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each dashboard stage on seeded synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[SCALES[0]], help=f"row counts, e.g. {SCALES}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--datasets", nargs="+", default=["youtube", "news"], choices=["youtube", "news"])
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH, help="JSON of allowed ns/row or ms per dataset.stage")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.rows, args.seed, args.repeats, args.datasets)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    failures = check_thresholds(report, thresholds)
+    for failure in failures:
+        logging.error(f"Regression: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import logging
+import os
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+DATASET_ID = "youtube-analytics-454211.media_analytics"
+UPLOAD_STATE_DIR = "upload_state"
+CHUNK_ROWS = 100000
+
+# Column types from the notebook's SchemaField lists, kept here as the single source of truth.
+YOUTUBE_DATA_SCHEMA = [
+    ("video_id", "STRING"),
+    ("title", "STRING"),
+    ("channel_title", "STRING"),
+    ("category_id", "INTEGER"),
+    ("publish_time", "DATETIME"),
+    ("description", "STRING"),
+    ("tags", "STRING"),
+    ("thumbnail_link", "STRING"),
+    ("video_link", "STRING"),
+    ("views", "INTEGER"),
+    ("likes", "INTEGER"),
+    ("comment_count", "INTEGER"),
+    ("comments_disabled", "BOOLEAN"),
+    ("channel_name", "STRING"),
+    ("subscribers_count", "INTEGER"),
+    ("total_videos", "INTEGER"),
+]
+YOUTUBE_VIDEOS_SCHEMA = [
+    ("video_id", "STRING"),
+    ("title", "STRING"),
+    ("channel_title", "STRING"),
+    ("category_id", "INTEGER"),
+    ("publish_time", "DATETIME"),
+    ("views", "INTEGER"),
+    ("likes", "INTEGER"),
+    ("comment_count", "INTEGER"),
+    ("tags", "STRING"),
+    ("description", "STRING"),
+]
+NEWS_SCHEMA = [
+    ("category", "STRING"),
+    ("headline", "STRING"),
+    ("authors", "STRING"),
+    ("link", "STRING"),
+    ("short_description", "STRING"),
+    ("date", "DATETIME"),
+]
+
+# table name -> (schema, merge key)
+TABLES = {
+    "youtube_data": (YOUTUBE_DATA_SCHEMA, ["video_id"]),
+    "youtube_videos": (YOUTUBE_VIDEOS_SCHEMA, ["video_id"]),
+    "news_sentiment_data": (NEWS_SCHEMA, ["link", "date"]),
+}
+
+
+def schema_fields(schema):
+    from google.cloud import bigquery
+
+    return [bigquery.SchemaField(name, kind) for name, kind in schema]
+
+
+def row_hashes(df, columns):
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+
+def merge_statement(target, staging, schema, keys):
+    columns = [name for name, _ in schema]
+    on = " AND ".join(f"T.{key} = S.{key}" for key in keys)
+    updates = ", ".join(f"{column} = S.{column}" for column in columns if column not in keys)
+    return (
+        f"MERGE `{target}` T USING `{staging}` S ON {on}"
+        f" WHEN MATCHED THEN UPDATE SET {updates}"
+        f" WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) VALUES ({', '.join('S.' + c for c in columns)})"
+    )
+
+
+class DeltaUploader:
+    """Uploads only the rows of a frame that are new or changed since the last successful upload.
+
+    A local manifest keeps one hash per key of what was last uploaded. The delta is staged as
+    Parquet chunks, loaded into a temporary staging table in parallel, and applied to the target
+    with a single MERGE. Rows missing from the new frame are left in place.
+    """
+
+    def __init__(self, client, table, dataset_id=DATASET_ID, state_dir=UPLOAD_STATE_DIR,
+                 chunk_rows=CHUNK_ROWS, max_workers=4):
+        self.client = client
+        self.table = table
+        self.schema, self.keys = TABLES[table]
+        self.table_id = f"{dataset_id}.{table}"
+        self.manifest_path = os.path.join(state_dir, f"{table}.parquet")
+        self.chunk_rows = chunk_rows
+        self.max_workers = max_workers
+
+    def read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return pd.DataFrame({**{key: pd.Series(dtype=object) for key in self.keys},
+                                 "row_hash": pd.Series(dtype="uint64")})
+        return pd.read_parquet(self.manifest_path)
+
+    def write_manifest(self, manifest):
+        directory = os.path.dirname(self.manifest_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = self.manifest_path + ".tmp"
+        manifest.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def prepare(self, df):
+        columns = [name for name, _ in self.schema]
+        df = df[columns].drop_duplicates(self.keys, keep="last").reset_index(drop=True)
+        for name, kind in self.schema:
+            if kind == "DATETIME":
+                df[name] = pd.to_datetime(df[name], errors="coerce")
+        return df
+
+    def diff(self, df, manifest):
+        """Return the rows of df whose key is new or whose content hash changed, plus the new manifest."""
+        current = df[self.keys].copy()
+        current["row_hash"] = row_hashes(df, [name for name, _ in self.schema])
+        if manifest.empty:
+            return df, current
+        previous = manifest.rename(columns={"row_hash": "previous_hash"})
+        joined = current.merge(previous, on=self.keys, how="left")
+        changed = (joined["previous_hash"].isna() | (joined["row_hash"] != joined["previous_hash"])).to_numpy()
+        merged = pd.concat([manifest, current], ignore_index=True).drop_duplicates(self.keys, keep="last")
+        return df[changed], merged.reset_index(drop=True)
+
+    def stage(self, delta, directory):
+        paths = []
+        for i, start in enumerate(range(0, len(delta), self.chunk_rows)):
+            path = os.path.join(directory, f"chunk-{i:05d}.parquet")
+            delta.iloc[start:start + self.chunk_rows].to_parquet(path, index=False)
+            paths.append(path)
+        return paths
+
+    def load_chunk(self, path, staging_id):
+        from google.cloud import bigquery
+
+        job_config = bigquery.LoadJobConfig(
+            schema=schema_fields(self.schema),
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition="WRITE_APPEND",
+        )
+        with open(path, "rb") as f:
+            self.client.load_table_from_file(f, staging_id, job_config=job_config).result()
+
+    def ensure_columns(self):
+        """Create the target table, and add schema columns it lacks so the MERGE can set them.
+
+        Tables first loaded by the notebook can predate a column (news_sentiment_data had no
+        authors); added columns are NULLABLE, which is the only schema change BigQuery allows here.
+        """
+        from google.cloud import bigquery
+
+        self.client.create_table(bigquery.Table(self.table_id, schema=schema_fields(self.schema)), exists_ok=True)
+        table = self.client.get_table(self.table_id)
+        present = {field.name for field in table.schema}
+        missing = [field for field in schema_fields(self.schema) if field.name not in present]
+        if missing:
+            table.schema = list(table.schema) + missing
+            self.client.update_table(table, ["schema"])
+            logging.info(f"Added {', '.join(field.name for field in missing)} to {self.table_id}.")
+
+    def upload(self, df):
+        """Apply the delta of df to the target table and return the number of rows sent."""
+        from google.cloud import bigquery
+
+        df = self.prepare(df)
+        delta, manifest = self.diff(df, self.read_manifest())
+        if delta.empty:
+            logging.info(f"No new or changed rows for {self.table_id}.")
+            return 0
+
+        self.ensure_columns()
+        staging_id = f"{self.table_id}__staging_{uuid.uuid4().hex[:8]}"
+        self.client.create_table(bigquery.Table(staging_id, schema=schema_fields(self.schema)))
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                paths = self.stage(delta, directory)
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    list(pool.map(lambda path: self.load_chunk(path, staging_id), paths))
+            self.client.query(merge_statement(self.table_id, staging_id, self.schema, self.keys)).result()
+        finally:
+            self.client.delete_table(staging_id, not_found_ok=True)
+
+        self.write_manifest(manifest)
+        logging.info(f"Merged {len(delta)} new or changed rows into {self.table_id} in {len(paths)} chunks.")
+        return len(delta)
@@ -0,0 +1,103 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Above this many filtered rows the Views-vs-Likes chart is drawn from a binned grid instead of raw points.
+SCATTER_MAX_POINTS = int(os.environ.get("MEDIA_SCATTER_MAX_POINTS", 20000))
+GRID_BINS = 64
+LINE_MAX_POINTS = 500
+
+# counts and dominant hold one cell per (x bin, y bin); dominant is -1 where a cell is empty.
+DensityGrid = namedtuple("DensityGrid", ["counts", "dominant", "categories", "x_edges", "y_edges", "total"])
+
+
+def log_axis(values):
+    """Map non-negative counters onto log10(1 + value), the axis the grid is binned on."""
+    return np.log10(1 + np.clip(pd.to_numeric(values, errors="coerce").fillna(0).to_numpy(dtype=float), 0, None))
+
+
+def density_grid(df, x_column="views", y_column="likes", category_column="category_id", bins=GRID_BINS):
+    """Bin rows on log-scaled axes, keeping the row count and the most common category per cell.
+
+    The result has bins x bins cells whatever the row count, so drawing it costs the same for
+    a hundred rows as for ten million.
+    """
+    x = log_axis(df[x_column])
+    y = log_axis(df[y_column])
+    x_edges = np.linspace(0, max(x.max(initial=0), 1), bins + 1)
+    y_edges = np.linspace(0, max(y.max(initial=0), 1), bins + 1)
+    x_bins = np.clip(np.searchsorted(x_edges, x, side="right") - 1, 0, bins - 1)
+    y_bins = np.clip(np.searchsorted(y_edges, y, side="right") - 1, 0, bins - 1)
+    cells = x_bins * bins + y_bins
+
+    codes, categories = pd.factorize(df[category_column], sort=True, use_na_sentinel=False)
+    num_categories = max(len(categories), 1)
+    per_category = np.bincount(cells * num_categories + codes, minlength=bins * bins * num_categories)
+    per_category = per_category.reshape(bins * bins, num_categories)
+    counts = per_category.sum(axis=1)
+    dominant = np.where(counts > 0, per_category.argmax(axis=1), -1)
+    return DensityGrid(
+        counts.reshape(bins, bins), dominant.reshape(bins, bins),
+        [str(category) for category in categories], x_edges, y_edges, len(df),
+    )
+
+
+def draw_density_grid(ax, grid, cmap="viridis"):
+    """Draw a DensityGrid: hue is the cell's dominant category, opacity grows with log(count)."""
+    from matplotlib import colormaps
+    from matplotlib.patches import Patch
+    from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+    colormap = colormaps[cmap].resampled(max(len(grid.categories), 1))
+    image = colormap(np.clip(grid.dominant, 0, None)).astype(float)
+    weight = np.log1p(grid.counts) / max(np.log1p(grid.counts.max()), 1)
+    image[..., 3] = np.where(grid.counts > 0, 0.25 + 0.75 * weight, 0)
+    ax.imshow(
+        image.transpose(1, 0, 2), origin="lower", aspect="auto", interpolation="nearest",
+        extent=(grid.x_edges[0], grid.x_edges[-1], grid.y_edges[0], grid.y_edges[-1]),
+    )
+    label = FuncFormatter(lambda value, _: f"{10 ** value - 1:,.0f}")
+    for axis in (ax.xaxis, ax.yaxis):
+        axis.set_major_locator(MaxNLocator(integer=True))
+        axis.set_major_formatter(label)
+
+    present = np.unique(grid.dominant[grid.dominant >= 0])
+    ax.legend(
+        handles=[Patch(color=colormap(code), label=grid.categories[code]) for code in present[:12]],
+        title="Dominant category", fontsize="small", loc="upper left",
+    )
+    return ax
+
+
+def lttb(series, max_points=LINE_MAX_POINTS):
+    """Downsample a series to at most max_points with Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept, and from each bucket in between the point forming the
+    largest triangle with the previous pick and the next bucket's mean, so peaks and dips survive.
+    The index may hold dates, timestamps or numbers.
+    """
+    n = len(series)
+    if n <= max_points or max_points < 3:
+        return series
+    index = series.index
+    if isinstance(index, pd.DatetimeIndex) or (n and hasattr(index[0], "toordinal")):
+        x = pd.to_datetime(pd.Series(index)).to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    else:
+        x = np.asarray(index, dtype=float)
+    y = series.to_numpy(dtype=float)
+
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    picks = np.empty(max_points, dtype=np.intp)
+    picks[0], picks[-1] = 0, n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        next_x, next_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        area = np.abs((x[previous] - next_x) * (y[lo:hi] - y[previous])
+                      - (x[previous] - x[lo:hi]) * (next_y - y[previous]))
+        previous = lo + int(area.argmax())
+        picks[i + 1] = previous
+    return series.iloc[picks]
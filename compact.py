@@ -0,0 +1,43 @@
+import pandas as pd
+
+# Column roles per dataset: repetitive labels become categoricals, counters are downcast to the
+# smallest integer type that holds them, and free text is stored as Arrow strings.
+YOUTUBE_LAYOUT = {
+    "categories": ["channel_title", "channel_name"],
+    "counters": ["category_id", "views", "likes", "comment_count", "subscribers_count", "total_videos", "cluster_id"],
+    "text": ["video_id", "title", "description", "tags", "thumbnail_link", "video_link"],
+}
+NEWS_LAYOUT = {
+    "categories": ["category", "authors"],
+    "counters": ["cluster_id"],
+    "text": ["headline", "short_description", "link"],
+}
+
+
+def downcast_counter(values):
+    """Smallest integer dtype holding every value; nullable columns stay nullable."""
+    if values.dtype.kind not in "iu" and not pd.api.types.is_integer_dtype(values.dtype):
+        return values
+    if values.isna().all():
+        return values
+    return pd.to_numeric(values, downcast="unsigned" if values.min() >= 0 else "integer")
+
+
+def compact_frame(df, categories=(), counters=(), text=()):
+    """Return df with the given columns re-encoded compactly; columns not present are skipped."""
+    df = df.copy(deep=False)
+    for column in categories:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    for column in counters:
+        if column in df.columns:
+            df[column] = downcast_counter(df[column])
+    for column in text:
+        if column in df.columns:
+            df[column] = df[column].astype("string[pyarrow]")
+    return df
+
+
+def memory_footprint(df):
+    """Bytes held by the frame, counting string payloads."""
+    return int(df.memory_usage(deep=True, index=True).sum())
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+STATE_PATH = "crawl_state.db"
+
+# (max video age, refresh interval): recent videos' counters move fast, old ones rarely change.
+REFRESH_TIERS = [
+    (timedelta(days=7), timedelta(hours=6)),
+    (timedelta(days=90), timedelta(days=3)),
+    (None, timedelta(days=30)),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    publish_time TEXT NOT NULL,
+    refreshed_at TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS videos_channel ON videos (channel_id, publish_time);
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id TEXT PRIMARY KEY,
+    last_video_id TEXT,
+    last_publish_time TEXT
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    channel_id TEXT PRIMARY KEY,
+    page_token TEXT,
+    video_ids TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS etags (
+    batch_key TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    etag TEXT NOT NULL
+);
+"""
+BATCH_SIZE = 50
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def naive_utc(value):
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(None)
+    return timestamp.isoformat()
+
+
+def batch_key(video_ids):
+    return hashlib.sha1(",".join(sorted(video_ids)).encode()).hexdigest()
+
+
+def refresh_interval(age):
+    for max_age, interval in REFRESH_TIERS:
+        if max_age is None or age <= max_age:
+            return interval
+
+
+class CrawlState:
+    """SQLite-backed record of what has been crawled, so runs only fetch what changed.
+
+    Every write commits immediately, which makes a crashed crawl resumable: discovered ids and
+    the next search page token are checkpointed per channel, and fetched videos are stored as
+    soon as their batch returns.
+    """
+
+    def __init__(self, path=STATE_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(etags)")}
+        if "channel_id" not in columns:
+            # ETags from before they were kept per channel cannot be pruned; they are only a cache.
+            self.conn.executescript("DROP TABLE etags;" + SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def known_ids(self, channel_id):
+        rows = self.conn.execute("SELECT video_id FROM videos WHERE channel_id = ?", (channel_id,))
+        return {video_id for video_id, in rows}
+
+    def last_seen(self, channel_id):
+        return self.conn.execute(
+            "SELECT last_video_id, last_publish_time FROM channels WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+
+    def checkpoint(self, channel_id):
+        """Return (page_token, video_ids) saved by an interrupted discovery pass, or None."""
+        row = self.conn.execute(
+            "SELECT page_token, video_ids FROM checkpoints WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+        return None if row is None else (row[0], json.loads(row[1]))
+
+    def save_checkpoint(self, channel_id, page_token, video_ids):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)", (channel_id, page_token, json.dumps(video_ids))
+            )
+
+    def clear_checkpoint(self, channel_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM checkpoints WHERE channel_id = ?", (channel_id,))
+
+    def etag(self, video_ids):
+        row = self.conn.execute("SELECT etag FROM etags WHERE batch_key = ?", (batch_key(video_ids),)).fetchone()
+        return None if row is None else row[0]
+
+    def save_etag(self, channel_id, video_ids, etag):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO etags VALUES (?, ?, ?)", (batch_key(video_ids), channel_id, etag))
+
+    def prune_etags(self, channel_id, batches):
+        """Drop the channel's ETags for id sets that are no longer among its batches."""
+        keys = [batch_key(batch) for batch in batches]
+        with self.conn:
+            self.conn.execute(
+                f"DELETE FROM etags WHERE channel_id = ? AND batch_key NOT IN ({','.join('?' * len(keys))})",
+                [channel_id] + keys,
+            )
+
+    def refresh_batches(self, channel_id, size=BATCH_SIZE):
+        """The channel's known ids in publish order, cut into fixed chunks of size.
+
+        New uploads are the newest, so they only extend the last chunk: every earlier chunk keeps
+        the same ids from run to run, and its stored ETag keeps matching.
+        """
+        rows = self.conn.execute(
+            "SELECT video_id FROM videos WHERE channel_id = ? ORDER BY publish_time, video_id", (channel_id,)
+        )
+        video_ids = [video_id for video_id, in rows]
+        return [video_ids[i:i + size] for i in range(0, len(video_ids), size)]
+
+    def record_videos(self, channel_id, records, now=None):
+        """Store fetched videos and advance the channel's newest-seen marker."""
+        if not records:
+            return
+        refreshed_at = (now or utcnow()).isoformat()
+        rows = [
+            (record["video_id"], channel_id, naive_utc(record["publish_time"]), refreshed_at,
+             json.dumps(record))
+            for record in records
+        ]
+        newest = max(rows, key=lambda row: (row[2], row[0]))
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?)", rows)
+            self.conn.execute(
+                "INSERT INTO channels VALUES (?, ?, ?) ON CONFLICT (channel_id) DO UPDATE SET"
+                " last_video_id = excluded.last_video_id, last_publish_time = excluded.last_publish_time"
+                " WHERE excluded.last_publish_time >= channels.last_publish_time",
+                (channel_id, newest[0], newest[2]),
+            )
+
+    def touch(self, video_ids, now=None):
+        """Mark videos as refreshed without changing their stored record (a 304 response)."""
+        refreshed_at = (now or utcnow()).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE videos SET refreshed_at = ? WHERE video_id = ?", [(refreshed_at, v) for v in video_ids]
+            )
+
+    def records(self, video_ids):
+        placeholders = ",".join("?" * len(video_ids))
+        rows = self.conn.execute(f"SELECT record FROM videos WHERE video_id IN ({placeholders})", list(video_ids))
+        return [json.loads(record) for record, in rows]
+
+    def due_for_refresh(self, channel_id, now=None):
+        """Known video ids whose statistics are due under REFRESH_TIERS, oldest first."""
+        now = now or utcnow()
+        rows = self.conn.execute(
+            "SELECT video_id, publish_time, refreshed_at FROM videos WHERE channel_id = ? ORDER BY publish_time",
+            (channel_id,),
+        )
+        due = []
+        for video_id, publish_time, refreshed_at in rows:
+            age = now - datetime.fromisoformat(publish_time)
+            if now - datetime.fromisoformat(refreshed_at) >= refresh_interval(age):
+                due.append(video_id)
+        return due
+
+    def all_records(self):
+        return [json.loads(record) for record, in self.conn.execute("SELECT record FROM videos")]
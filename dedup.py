@@ -0,0 +1,356 @@
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# 16 bands of 4 rows: pairs above ~0.5 similarity usually share a band, and candidates are
+# then confirmed against THRESHOLD on the full signature.
+NUM_PERM = 64
+BANDS = 16
+# Estimated Jaccard similarity of shingle sets above which two documents are the same story.
+THRESHOLD = 0.8
+SHINGLE_SIZE = 5
+BATCH_SIZE = 50000
+NEWS_TEXT_COLUMNS = ["headline", "short_description"]
+YOUTUBE_TEXT_COLUMNS = ["title", "tags"]
+NEWS_DEDUP_PATH = os.path.join("snapshots", "news_minhash.arrow")
+YOUTUBE_DEDUP_PATH = os.path.join("snapshots", "youtube_minhash.arrow")
+METADATA_KEY = b"minhash"
+# Segments save_new() may leave next to a saved index before they are folded back into it.
+MAX_SEGMENTS = 16
+NO_SHINGLES = np.iinfo(np.uint32).max
+# Bumped whenever normalization or shingle hashing changes, so saved signatures are rebuilt.
+SHINGLE_FORMAT = 2
+FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def normalize(texts):
+    """Lowercased letters, marks and digits of any script, separated by single spaces.
+
+    Marks are kept so Telugu or Hindi vowel signs stay attached to their consonants.
+    """
+    texts = pd.Series(texts, dtype="string[pyarrow]").fillna("")
+    return texts.str.lower().str.replace(r"[^\p{L}\p{M}\p{N}]+", " ", regex=True).str.strip()
+
+
+def combine_text(df, columns):
+    """The columns joined by spaces, e.g. headline + short_description or title + tags."""
+    parts = [df[column].astype("string[pyarrow]").fillna("") for column in columns]
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + " " + part
+    return text.reset_index(drop=True)
+
+
+def shingle_hashes(texts, size=SHINGLE_SIZE):
+    """A 64-bit FNV-1a hash of every size-character window of every normalized text.
+
+    The texts are concatenated into one buffer of code points and each window is hashed from
+    shifted views of it, so there is no per-document Python loop and every script counts the
+    same. Returns (hashes, counts): the windows in document order and how many belong to each
+    document.
+    """
+    texts = normalize(texts)
+    lengths = texts.str.len().to_numpy(dtype=np.int64)
+    buffer = np.frombuffer("".join(texts.tolist()).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    counts = np.maximum(lengths - size + 1, 0)
+    starts = np.cumsum(lengths) - lengths
+    first = np.cumsum(counts) - counts
+    windows = np.repeat(starts - first, counts) + np.arange(counts.sum())
+    hashes = np.full(len(windows), FNV_OFFSET, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for offset in range(size):
+            np.bitwise_xor(hashes, buffer[windows + offset], out=hashes)
+            np.multiply(hashes, FNV_PRIME, out=hashes)
+    return hashes, counts
+
+
+def permutations(num_perm=NUM_PERM, seed=0):
+    # Multiply-shift hashing: odd 64-bit multipliers, wrapping arithmetic, keep the top 32 bits.
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(0, 2 ** 64 - 1, num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+    offsets = rng.integers(0, 2 ** 64 - 1, num_perm, dtype=np.uint64, endpoint=True)
+    return multipliers, offsets
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, seed=0, size=SHINGLE_SIZE):
+    """One row of num_perm uint32 minimums per text; texts shorter than a shingle get NO_SHINGLES."""
+    hashes, counts = shingle_hashes(texts, size)
+    signatures = np.full((len(counts), num_perm), NO_SHINGLES, dtype=np.uint32)
+    present = counts > 0
+    if not present.any():
+        return signatures
+    bounds = (np.cumsum(counts) - counts)[present]
+    multipliers, offsets = permutations(num_perm, seed)
+    permuted = np.empty_like(hashes)
+    with np.errstate(over="ignore"):
+        for i in range(num_perm):
+            # In place: one buffer of the window count, however many permutations.
+            np.multiply(hashes, multipliers[i], out=permuted)
+            np.add(permuted, offsets[i], out=permuted)
+            np.right_shift(permuted, np.uint64(32), out=permuted)
+            signatures[present, i] = np.minimum.reduceat(permuted, bounds)
+    return signatures
+
+
+def band_keys(signatures, bands=BANDS, seed=1):
+    """A 64-bit key per band of rows_per_band signature values; equal keys make candidate pairs."""
+    rows_per_band = signatures.shape[1] // bands
+    weights = np.random.default_rng(seed).integers(0, 2 ** 63, rows_per_band, dtype=np.uint64) | np.uint64(1)
+    keys = np.zeros((len(signatures), bands), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for row in range(rows_per_band):
+            keys = keys * np.uint64(0x100000001B3) + signatures[:, row::rows_per_band][:, :bands] * weights[row]
+    return keys
+
+
+def similarity(signatures_a, signatures_b):
+    """Estimated Jaccard similarity per row pair: the share of equal signature values."""
+    return (signatures_a == signatures_b).mean(axis=1)
+
+
+class NearDuplicateIndex:
+    """MinHash signatures and LSH buckets for every document seen so far, persisted between runs.
+
+    add() signs only documents whose key it has not seen, looks their band keys up in the
+    existing buckets and among themselves, confirms candidates by signature similarity, and
+    returns a cluster id per document: the position of the earliest document of its cluster.
+    History is never relabelled, so ids stay stable across incremental runs.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, threshold=THRESHOLD, shingle_size=SHINGLE_SIZE, seed=0):
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.keys = []
+        self.positions = {}
+        # Documents already on disk at the path last saved to or loaded from, and in how many files.
+        self.saved = 0
+        self.segments = 0
+        # signatures and clusters are views of buffers that double when full, so adding a batch
+        # does not copy the whole history.
+        self._signature_buffer = np.empty((0, num_perm), dtype=np.uint32)
+        self._cluster_buffer = np.empty(0, dtype=np.int64)
+        self.signatures = self._signature_buffer
+        self.clusters = self._cluster_buffer
+        # Per band: runs of sorted band keys and, for each, the first document that produced it.
+        # A key lives in one run only; runs are merged as they reach the size of the one before,
+        # so each key is copied O(log n) times however many batches arrive.
+        self.buckets = [[] for _ in range(bands)]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def settings(self):
+        return {"num_perm": self.num_perm, "bands": self.bands, "threshold": self.threshold,
+                "shingle_size": self.shingle_size, "seed": self.seed, "shingle_format": SHINGLE_FORMAT}
+
+    @staticmethod
+    def _lookup(run, new_keys):
+        """Mask of new_keys found in one bucket run, and the run's document for each."""
+        run_keys, run_docs = run
+        slot = np.minimum(np.searchsorted(run_keys, new_keys), len(run_keys) - 1)
+        return run_keys[slot] == new_keys, run_docs[slot]
+
+    def _candidates(self, keys, documents):
+        """Pairs of positions sharing a band key: each new document with history and with each other.
+
+        keys holds the band keys of the new documents at the given positions.
+        """
+        pairs = [np.empty((0, 2), dtype=np.int64)]
+        for band in range(self.bands):
+            # Sorted needles keep the bucket searches cache friendly.
+            order = np.argsort(keys[:, band], kind="stable")
+            new_keys = keys[order, band]
+            for run in self.buckets[band]:
+                found, history_docs = self._lookup(run, new_keys)
+                pairs.append(np.column_stack([documents[order[found]], history_docs[found]]))
+
+            # Within the batch, every document in a run of equal keys pairs with the run's first one.
+            run_start = np.r_[True, new_keys[1:] != new_keys[:-1]]
+            heads = order[np.maximum.accumulate(np.where(run_start, np.arange(len(order)), 0))]
+            pairs.append(np.column_stack([documents[order[~run_start]], documents[heads[~run_start]]]))
+        pairs = np.concatenate(pairs).astype(np.int64)
+        # Positions fit in 32 bits, so a pair packs into one int64 and 1-d unique drops repeats.
+        packed = np.unique((pairs[:, 0] << 32) | pairs[:, 1])
+        return np.column_stack([packed >> 32, packed & 0xFFFFFFFF])
+
+    def _add_to_buckets(self, keys, documents):
+        for band in range(self.bands):
+            runs = self.buckets[band]
+            new_keys, first = np.unique(keys[:, band], return_index=True)
+            fresh = np.ones(len(new_keys), dtype=bool)
+            for run in runs:
+                fresh &= ~self._lookup(run, new_keys)[0]
+            run = (new_keys[fresh], documents[first[fresh]])
+            while runs and len(runs[-1][0]) <= len(run[0]):
+                merged_keys = np.concatenate([runs[-1][0], run[0]])
+                order = np.argsort(merged_keys, kind="stable")
+                run = (merged_keys[order], np.concatenate([runs.pop()[1], run[1]])[order])
+            if len(run[0]):
+                runs.append(run)
+
+    def _append(self, signatures, clusters):
+        count, total = len(self.signatures), len(self.signatures) + len(signatures)
+        if total > len(self._cluster_buffer):
+            capacity = max(total, 2 * len(self._cluster_buffer))
+            signature_buffer = np.empty((capacity, self.num_perm), dtype=np.uint32)
+            cluster_buffer = np.empty(capacity, dtype=np.int64)
+            signature_buffer[:count] = self.signatures
+            cluster_buffer[:count] = self.clusters
+            self._signature_buffer, self._cluster_buffer = signature_buffer, cluster_buffer
+        self._signature_buffer[count:total] = signatures
+        self._cluster_buffer[count:total] = clusters
+        self.signatures = self._signature_buffer[:total]
+        self.clusters = self._cluster_buffer[:total]
+
+    def _add_batch(self, keys, texts):
+        offset = len(self.keys)
+        signatures = minhash_signatures(texts, self.num_perm, self.seed, self.shingle_size)
+        # Texts too short for a single shingle are never anyone's duplicate.
+        signable = np.flatnonzero(signatures[:, 0] != NO_SHINGLES)
+        documents = signable + offset
+        keys_by_band = band_keys(signatures[signable], self.bands)
+        pairs = self._candidates(keys_by_band, documents)
+        self._append(signatures, np.arange(offset, offset + len(keys), dtype=np.int64))
+        pairs = pairs[similarity(self.signatures[pairs[:, 0]], self.signatures[pairs[:, 1]]) >= self.threshold]
+        if len(pairs):
+            # Spread the smallest cluster id along confirmed pairs until nothing changes; history
+            # keeps its labels, so a new document joins the oldest cluster it matches. Only the
+            # documents in some pair take part, numbered by their rank among them.
+            nodes, edges = np.unique(pairs, return_inverse=True)
+            edges = edges.reshape(pairs.shape)
+            labels = self.clusters[nodes]
+            history = nodes < offset
+            while True:
+                lowest = np.minimum(labels[edges[:, 0]], labels[edges[:, 1]])
+                updated = labels.copy()
+                np.minimum.at(updated, edges[:, 0], lowest)
+                np.minimum.at(updated, edges[:, 1], lowest)
+                updated[history] = labels[history]
+                if np.array_equal(updated, labels):
+                    break
+                labels = updated
+            self.clusters[nodes[~history]] = labels[~history]
+
+        self._add_to_buckets(keys_by_band, documents)
+        for position, key in enumerate(keys, offset):
+            self.positions[key] = position
+        self.keys.extend(keys)
+
+    def add(self, keys, texts, batch_size=BATCH_SIZE):
+        """Cluster ids for the documents; unseen keys are signed and indexed, in batches."""
+        keys = [str(key) for key in keys]
+        texts = pd.Series(texts, dtype="string[pyarrow]").reset_index(drop=True)
+        unseen, seen_in_call = [], set()
+        for i, key in enumerate(keys):
+            if key not in self.positions and key not in seen_in_call:
+                unseen.append(i)
+                seen_in_call.add(key)
+        for start in range(0, len(unseen), batch_size):
+            batch = unseen[start:start + batch_size]
+            self._add_batch([keys[i] for i in batch], texts.iloc[batch])
+        if unseen:
+            logging.info(f"Signed {len(unseen)} new documents; the near-duplicate index holds {len(self)}.")
+        return self.clusters[[self.positions[key] for key in keys]]
+
+    def _write(self, path, start=0):
+        table = pa.table({
+            "key": pa.array(self.keys[start:], pa.string()),
+            "cluster": pa.array(self.clusters[start:]),
+            "signature": pa.FixedSizeListArray.from_arrays(pa.array(self.signatures[start:].ravel()), self.num_perm),
+        })
+        table = table.replace_schema_metadata({METADATA_KEY: json.dumps(self.settings())})
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = path + ".tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def save(self, path):
+        """Write every document to path, replacing any segments save_new() left next to it."""
+        self._write(path)
+        for _, segment in _segments(path):
+            os.remove(segment)
+        self.saved, self.segments = len(self), 0
+
+    def save_new(self, path):
+        """Write only the documents added since the index was loaded from or saved to path.
+
+        They go to a segment file beside path that load() reads after it, so a refresh writes its
+        delta rather than the whole index; every MAX_SEGMENTS segments are folded into path.
+        Cluster ids of saved documents never change, so the files on disk stay valid.
+        """
+        if self.saved == len(self):
+            return
+        if self.saved == 0 or self.segments >= MAX_SEGMENTS:
+            self.save(path)
+            return
+        self._write(f"{path}.{self.saved}", self.saved)
+        self.saved, self.segments = len(self), self.segments + 1
+
+    def _read(self, path):
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if json.loads((table.schema.metadata or {}).get(METADATA_KEY, b"{}")) != self.settings():
+            return False
+        keys = table.column("key").to_pylist()
+        self.positions.update((key, position) for position, key in enumerate(keys, len(self.keys)))
+        self.keys.extend(keys)
+        self._append(table.column("signature").combine_chunks().values.to_numpy().reshape(-1, self.num_perm),
+                     table.column("cluster").to_numpy())
+        return True
+
+    @classmethod
+    def load(cls, path, **settings):
+        """The index saved at path, or an empty one if there is none or it was built with other settings."""
+        index = cls(**settings)
+        if not os.path.exists(path):
+            return index
+        if not index._read(path):
+            logging.info(f"Near-duplicate index at {path} was built with other settings; starting over.")
+            return index
+        for start, segment in _segments(path):
+            # Segments older than the last full save, or past a missing one, are skipped.
+            if start == len(index) and index._read(segment):
+                index.segments += 1
+        index.saved = len(index)
+        signable = np.flatnonzero(index.signatures[:, 0] != NO_SHINGLES)
+        index._add_to_buckets(band_keys(index.signatures[signable], index.bands), signable)
+        return index
+
+
+def _segments(path):
+    """(start, path) of the segment files beside path, by the position of their first document."""
+    directory, name = os.path.split(path)
+    segments = []
+    for entry in os.listdir(directory or "."):
+        suffix = entry[len(name) + 1:]
+        if entry.startswith(name + ".") and suffix.isdigit():
+            segments.append((int(suffix), os.path.join(directory, entry)))
+    return sorted(segments)
+
+
+def cluster_ids(keys, texts, path=None, **settings):
+    """Cluster id per document, checking only new keys against the index persisted at path."""
+    index = NearDuplicateIndex.load(path, **settings) if path else NearDuplicateIndex(**settings)
+    clusters = index.add(keys, texts)
+    if path:
+        index.save(path)
+    return clusters
+
+
+def collapse(df, column="cluster_id"):
+    """Keep the first row of every near-duplicate cluster; frames without cluster ids pass through."""
+    if column not in df.columns:
+        return df
+    return df[~df[column].duplicated()]
@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+
+LEADERBOARD_SIZE = 10
+# Rankings the notebook printed: top liked, top commented and highest likes-per-view videos.
+LEADERBOARD_METRICS = ["likes", "comment_count", "engagement_rate"]
+LEADERBOARD_COLUMNS = ["video_id", "title", "channel_title", "category_id", "views", "likes", "comment_count"]
+SUM_COLUMNS = ["views", "likes", "comment_count"]
+GROUP_KEYS = ["category_id", "channel_title"]
+
+
+def _numbers(values):
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def engagement_rate(likes, views):
+    """likes / views as float64, 0.0 wherever views is zero or missing rather than inf or NaN."""
+    likes = np.nan_to_num(_numbers(likes))
+    views = _numbers(views)
+    rate = np.zeros(len(views))
+    np.divide(likes, views, out=rate, where=views > 0)
+    return rate
+
+
+def top_k(values, k):
+    """Positions of the k largest values, largest first, like a stable descending sort's head(k).
+
+    argpartition finds the k-th largest value in linear time; only the rows tied with or above
+    it are then ordered, with ties going to the earlier position. NaN ranks last.
+    """
+    values = _numbers(values)
+    values = np.where(np.isnan(values), -np.inf, values)
+    if k <= 0 or len(values) == 0:
+        return np.array([], dtype=np.intp)
+    if k < len(values):
+        threshold = values[np.argpartition(values, len(values) - k)[len(values) - k]]
+        candidates = np.flatnonzero(values >= threshold)
+    else:
+        candidates = np.arange(len(values))
+    order = np.lexsort((candidates, -values[candidates]))
+    return candidates[order[:k]]
+
+
+def metric_values(df, metric):
+    if metric == "engagement_rate":
+        return engagement_rate(df["likes"], df["views"])
+    return _numbers(df[metric])
+
+
+def _rows(df, positions):
+    rows = df[[column for column in LEADERBOARD_COLUMNS if column in df.columns]].iloc[positions]
+    rows = rows.assign(engagement_rate=engagement_rate(rows["likes"], rows["views"]))
+    return rows.reset_index(drop=True)
+
+
+def top_videos(df, metric, k=LEADERBOARD_SIZE):
+    """The k rows of df with the largest metric, with engagement_rate added."""
+    return _rows(df, top_k(metric_values(df, metric), k))
+
+
+def group_sums(df, keys=GROUP_KEYS):
+    """Video count and counter sums per key combination."""
+    sums = pd.DataFrame({"videos": np.ones(len(df), dtype=np.int64)})
+    for column in SUM_COLUMNS:
+        sums[column] = np.nan_to_num(_numbers(df[column]))
+    grouped = sums.groupby([df[key].reset_index(drop=True) for key in keys], sort=False, observed=True).sum()
+    grouped.index.names = keys
+    return grouped
+
+
+def summarize_groups(sums, level):
+    """Per-value totals at one level of group_sums(), with average likes and engagement rate."""
+    totals = sums.groupby(level=level, sort=False).sum()
+    totals["videos"] = totals["videos"].astype(np.int64)
+    totals["avg_likes"] = totals["likes"] / totals["videos"]
+    totals["engagement_rate"] = engagement_rate(totals["likes"], totals["views"])
+    return totals.sort_values("avg_likes", ascending=False, kind="stable")
+
+
+class Leaderboard:
+    """The top k rows by one metric, kept as a k-row frame and folded forward as rows arrive."""
+
+    def __init__(self, metric, k=LEADERBOARD_SIZE):
+        self.metric = metric
+        self.k = k
+        self.rows = None
+
+    def update(self, new_rows, values=None, positions=None):
+        """Fold in new_rows, or just the rows at positions; values is the metric over all of new_rows."""
+        if values is None:
+            values = metric_values(new_rows, self.metric)
+        if positions is None:
+            chosen = top_k(values, self.k)
+        else:
+            chosen = positions[top_k(values[positions], self.k)]
+        candidates = _rows(new_rows, chosen)
+        if self.rows is not None:
+            # The held rows go first so ties keep favouring the earlier video, as a full sort would.
+            candidates = pd.concat([self.rows, candidates], ignore_index=True)
+        self.rows = candidates.iloc[top_k(candidates[self.metric], self.k)].reset_index(drop=True)
+        return self
+
+    def copy(self):
+        board = Leaderboard(self.metric, self.k)
+        board.rows = self.rows
+        return board
+
+
+class EngagementAnalytics:
+    """Running engagement aggregates and leaderboards over the YouTube rows seen so far.
+
+    Sums and counts per (category_id, channel_title) and a top-k board per metric, overall and
+    per category, are maintained with update(new_rows): the cost is linear in the new rows, and
+    reading a leaderboard costs the same whatever the table size.
+    """
+
+    def __init__(self, df=None, k=LEADERBOARD_SIZE):
+        self.k = k
+        self.rows = 0
+        self.last_id = None
+        self.sums = group_sums(pd.DataFrame(columns=GROUP_KEYS + SUM_COLUMNS))
+        self.boards = {metric: Leaderboard(metric, k) for metric in LEADERBOARD_METRICS}
+        self.category_boards = {}
+        if df is not None:
+            self.update(df)
+
+    def update(self, new_rows):
+        if new_rows.empty:
+            return self
+        new_sums = group_sums(new_rows)
+        self.sums = self.sums.add(new_sums, fill_value=0)
+        values = {metric: metric_values(new_rows, metric) for metric in LEADERBOARD_METRICS}
+        for metric, board in self.boards.items():
+            board.update(new_rows, values[metric])
+        categories = new_rows["category_id"].to_numpy()
+        for category, positions in pd.Series(categories).groupby(categories).indices.items():
+            boards = self.category_boards.setdefault(
+                category, {metric: Leaderboard(metric, self.k) for metric in LEADERBOARD_METRICS}
+            )
+            for metric, board in boards.items():
+                board.update(new_rows, values[metric], positions)
+        self.rows += len(new_rows)
+        self.last_id = new_rows["video_id"].iloc[-1]
+        return self
+
+    def copy(self):
+        analytics = EngagementAnalytics(k=self.k)
+        analytics.rows = self.rows
+        analytics.last_id = self.last_id
+        analytics.sums = self.sums
+        analytics.boards = {metric: board.copy() for metric, board in self.boards.items()}
+        analytics.category_boards = {
+            category: {metric: board.copy() for metric, board in boards.items()}
+            for category, boards in self.category_boards.items()
+        }
+        return analytics
+
+    def extended(self, df):
+        """Analytics for df, which usually is this frame with rows appended.
+
+        When the first self.rows rows are the ones already counted, only the rest are folded
+        into a copy (self keeps serving readers meanwhile); otherwise everything is rebuilt.
+        """
+        if 0 < self.rows <= len(df) and df["video_id"].iloc[self.rows - 1] == self.last_id:
+            return self.copy().update(df.iloc[self.rows:])
+        return EngagementAnalytics(df, self.k)
+
+    def leaderboard(self, metric, category=None):
+        if category is None or category == "All":
+            rows = self.boards[metric].rows
+        else:
+            boards = self.category_boards.get(_category_key(category, self.category_boards))
+            rows = boards[metric].rows if boards else None
+        return rows if rows is not None else pd.DataFrame(columns=LEADERBOARD_COLUMNS + ["engagement_rate"])
+
+    def categories(self):
+        return summarize_groups(self.sums, "category_id")
+
+    def channels(self, category=None):
+        sums = self.sums
+        if category is not None and category != "All":
+            key = _category_key(category, self.category_boards)
+            sums = sums[sums.index.get_level_values("category_id") == key]
+        return summarize_groups(sums, "channel_title")
+
+
+def _category_key(category, known):
+    # Sidebar selections can arrive as strings; match them to the stored category ids.
+    for key in known:
+        if str(key) == str(category):
+            return key
+    return category
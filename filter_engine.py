@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+
+def day_after(end):
+    """Exclusive upper bound for a whole end date: midnight at the start of the following day."""
+    return pd.Timestamp(end).floor("D") + pd.Timedelta(days=1)
+
+
+class FilterEngine:
+    """Row-id indexes over one frame, built once per load and shared by every rerun.
+
+    Rows are kept sorted by the time column so a date range is a searchsorted slice, and each
+    categorical column is factorized into per-row codes plus per-value row-id lists. A query
+    starts from the smallest candidate set and checks the remaining predicates on just those
+    rows, so its cost follows the result size rather than the table size.
+
+    The end date is inclusive of the whole day, i.e. rows before day_after(end).
+    """
+
+    def __init__(self, df, time_column, columns):
+        self.df = df
+        self.time_column = time_column
+        self.num_rows = len(df)
+
+        times = pd.to_datetime(df[time_column]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        valid = times != np.iinfo(np.int64).min
+        self._times = times
+        self._time_order = np.flatnonzero(valid)[np.argsort(times[valid], kind="stable")]
+        self._sorted_times = times[self._time_order]
+
+        self._codes = {}
+        self._lookup = {}
+        self._values = {}
+        self._value_rows = {}
+        for column in columns:
+            codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+            labels = [str(value) for value in uniques]
+            order = np.argsort(codes, kind="stable")
+            order = order[codes[order] >= 0]
+            self._codes[column] = codes
+            self._lookup[column] = {label: code for code, label in enumerate(labels)}
+            self._values[column] = labels
+            self._value_rows[column] = (order, np.searchsorted(codes[order], np.arange(len(labels) + 1)))
+
+    def values(self, column):
+        """Distinct values of a column as strings, in order of first appearance."""
+        return list(self._values[column])
+
+    def time_bounds(self):
+        if len(self._sorted_times) == 0:
+            return None, None
+        return pd.Timestamp(self._sorted_times[0]), pd.Timestamp(self._sorted_times[-1])
+
+    def _time_slice(self, start, end):
+        lo = 0 if start is None else np.searchsorted(self._sorted_times, pd.Timestamp(start).value, side="left")
+        hi = len(self._sorted_times) if end is None else \
+            np.searchsorted(self._sorted_times, day_after(end).value, side="left")
+        return self._time_order[lo:hi]
+
+    def query(self, start=None, end=None, equals=None, rows=None):
+        """Return sorted positions of rows between the start and end dates whose columns equal the given values.
+
+        Values of None or "All" are ignored, matching the sidebar's "All" option; rows restricts
+        the result to a precomputed set of positions such as keyword matches.
+        """
+        candidates = [("time", self._time_slice(start, end))]
+        checks = []
+        for column, value in (equals or {}).items():
+            if value is None or value == "All":
+                continue
+            code = self._lookup[column].get(str(value))
+            if code is None:
+                return np.empty(0, dtype=np.intp)
+            order, offsets = self._value_rows[column]
+            candidates.append((column, order[offsets[code]:offsets[code + 1]]))
+            checks.append((column, code))
+        if rows is not None:
+            candidates.append(("rows", np.asarray(rows, dtype=np.intp)))
+
+        name, result = min(candidates, key=lambda candidate: len(candidate[1]))
+        if name != "time" and (start is not None or end is not None):
+            times = self._times[result]
+            keep = times != np.iinfo(np.int64).min
+            if start is not None:
+                keep &= times >= pd.Timestamp(start).value
+            if end is not None:
+                keep &= times < day_after(end).value
+            result = result[keep]
+        for column, code in checks:
+            if column != name:
+                result = result[self._codes[column][result] == code]
+        if rows is not None and name != "rows":
+            result = result[np.isin(result, rows)]
+        return np.sort(result)
+
+    def filter(self, start=None, end=None, equals=None, rows=None):
+        return self.df.iloc[self.query(start, end, equals, rows)]
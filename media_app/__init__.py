@@ -0,0 +1,6 @@
+"""Core of the Media Analytics Dashboard.
+
+articles.py, dashboard.py, a.py and papers.py are thin entry points over media_app.app.run().
+BigQuery, matplotlib and the thumbnail client are imported only by the view that needs them,
+and each dataset is loaded the first time its view is selected.
+"""
@@ -0,0 +1,61 @@
+import importlib
+import logging
+import os
+from collections import deque
+
+import streamlit as st
+
+from perf import stage_breakdown, start_trace
+
+# Each view lives in its own module, imported only when it is selected: the news view never
+# loads BigQuery, matplotlib or the thumbnail client.
+VIEW_MODULES = {
+    "YouTube Analytics": "media_app.youtube_view",
+    "News Articles": "media_app.news_view",
+}
+PERF_HISTORY = 20
+
+
+def configure_logging(log_file=None):
+    if log_file is None:
+        logging.basicConfig(level=logging.INFO)
+        return
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def run(views=tuple(VIEW_MODULES), sidebar_header="Filters", log_file=None, news_layout=None):
+    """Render one rerun of the dashboard offering the given views.
+
+    news_layout is a media_app.news_view.NewsLayout; the news view's default is used when None.
+    Timing spans for the rerun are logged as one JSON record; summarize with `python perf.py <log>`.
+    """
+    configure_logging(log_file)
+    logging.info("Streamlit Dashboard Started")
+    perf_trace = start_trace()
+    perf_history = st.session_state.setdefault("perf_history", deque(maxlen=PERF_HISTORY))
+
+    # finish() also runs when a view calls st.stop() or raises, so slow or failing reruns are
+    # logged too and the trace never stays active past its rerun.
+    try:
+        st.title("Media Analytics Dashboard")
+        st.sidebar.header(sidebar_header)
+
+        if len(views) > 1:
+            data_selection = st.sidebar.radio("Select Dataset", views, key="dataset")
+        else:
+            data_selection = views[0]
+        show_perf_panel = st.sidebar.checkbox("Show performance panel", key="perf_panel")
+        perf_trace.view = data_selection
+
+        view = importlib.import_module(VIEW_MODULES[data_selection])
+        if data_selection == "News Articles" and news_layout is not None:
+            view.render(perf_trace, news_layout)
+        else:
+            view.render(perf_trace)
+    finally:
+        perf_trace.finish(perf_history)
+
+    if show_perf_panel:
+        st.sidebar.subheader("Performance (ms)")
+        st.sidebar.dataframe(stage_breakdown(perf_history))
@@ -0,0 +1,148 @@
+import logging
+import os
+
+import pandas as pd
+import streamlit as st
+
+from authors import AuthorIndex
+from compact import NEWS_LAYOUT, YOUTUBE_LAYOUT, compact_frame
+from dedup import YOUTUBE_DEDUP_PATH, YOUTUBE_TEXT_COLUMNS, NearDuplicateIndex, combine_text
+from engagement import EngagementAnalytics
+from filter_engine import FilterEngine
+from news_snapshot import NEWS_CSV_PATH, load_news_snapshot
+from pushdown import YouTubePushdown
+from refresher import BackgroundRefresher
+from rollups import RollupCube
+from search_index import SearchIndex
+from youtube_loader import SNAPSHOT_PATH, IncrementalYouTubeLoader
+
+CREDENTIALS_PATH = r"C:\Users\dell\Downloads\youtube-analytics-454211-6e15abea6a50.json"
+
+# Set MEDIA_PUSHDOWN=1 to filter YouTube data in BigQuery instead of holding the full table in memory.
+PUSHDOWN_MODE = os.environ.get("MEDIA_PUSHDOWN") == "1"
+YOUTUBE_REFRESH_SECONDS = int(os.environ.get("MEDIA_REFRESH_SECONDS", 600))
+
+
+@st.cache_resource
+def bigquery_client():
+    # Imported on first use, so sessions that only open the news view never load the client library.
+    from google.cloud import bigquery
+
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = CREDENTIALS_PATH
+    return bigquery.Client()
+
+
+@st.cache_resource
+def youtube_duplicates():
+    return NearDuplicateIndex.load(YOUTUBE_DEDUP_PATH)
+
+
+def with_duplicate_clusters(df):
+    """df with a cluster_id shared by re-uploads whose title and tags barely differ.
+
+    Only videos the persisted index has not seen are signed, and only they are written back,
+    so a refresh costs the delta.
+    """
+    duplicates = youtube_duplicates()
+    df = df.assign(cluster_id=duplicates.add(df["video_id"], combine_text(df, YOUTUBE_TEXT_COLUMNS)))
+    duplicates.save_new(YOUTUBE_DEDUP_PATH)
+    return df
+
+
+def fetch_youtube_data():
+    logging.info("Fetching YouTube data from BigQuery.")
+    df = compact_frame(with_duplicate_clusters(IncrementalYouTubeLoader(bigquery_client()).load()), **YOUTUBE_LAYOUT)
+    logging.info(f"YouTube data loaded successfully with {df.shape[0]} records.")
+    return df
+
+
+def read_youtube_snapshot():
+    if not os.path.exists(SNAPSHOT_PATH):
+        return None
+    return compact_frame(pd.read_parquet(SNAPSHOT_PATH), **YOUTUBE_LAYOUT)
+
+
+def youtube_indexes(df, previous=None):
+    """Indexes over one YouTube snapshot.
+
+    previous holds the last snapshot's indexes; its rollup and engagement aggregates are advanced
+    by the new rows rather than rebuilt.
+    """
+    if previous is None:
+        rollup = RollupCube(df, "publish_time", ["category_id"], totals=["channel_title"], key="video_id")
+        engagement = EngagementAnalytics(df)
+    else:
+        rollup = previous["rollup"].extended(df)
+        engagement = previous["engagement"].extended(df)
+    return {
+        "engine": FilterEngine(df, "publish_time", ["category_id", "channel_title"]),
+        "search": SearchIndex(df, ["title", "tags"]),
+        "rollup": rollup,
+        "engagement": engagement,
+    }
+
+
+@st.cache_resource
+def youtube_refresher():
+    latest = {}
+
+    def derive(df):
+        # Refreshes append rows past the loader's watermark, so the rollup and engagement
+        # aggregates only need to fold in those rows rather than be rebuilt.
+        indexes = youtube_indexes(df, latest.get("indexes"))
+        latest["indexes"] = indexes
+        return indexes
+
+    return BackgroundRefresher(
+        fetch_youtube_data, YOUTUBE_REFRESH_SECONDS, derive, read_youtube_snapshot, "youtube"
+    ).start()
+
+
+@st.cache_resource
+def youtube_pushdown():
+    return YouTubePushdown(bigquery_client())
+
+
+@st.cache_data(ttl=600)
+def fetch_youtube_options():
+    logging.info("Fetching YouTube filter options from BigQuery.")
+    return youtube_pushdown().fetch_options()
+
+
+@st.cache_resource
+def load_news_data():
+    logging.info("Loading news dataset.")
+
+    try:
+        df = compact_frame(load_news_snapshot(NEWS_CSV_PATH), **NEWS_LAYOUT)
+        logging.info(f"News data loaded successfully with {df.shape[0]} records.")
+        return df
+    except ValueError as e:
+        logging.error(str(e))
+        st.error(str(e))
+        return pd.DataFrame()
+    except Exception as e:
+        logging.error(f"Error loading news data: {e}")
+        return pd.DataFrame()
+
+
+# The news indexes take no arguments so a rerun never hashes the frame to find them; they are
+# built over the process-wide frame from load_news_data(), each on first use.
+@st.cache_resource
+def news_filter_engine():
+    return FilterEngine(load_news_data(), "date", ["category"])
+
+
+@st.cache_resource
+def news_search_index():
+    return SearchIndex(load_news_data(), ["headline"])
+
+
+@st.cache_resource
+def news_rollup():
+    return RollupCube(load_news_data(), "date", ["category"])
+
+
+@st.cache_resource
+def news_author_index():
+    return AuthorIndex(load_news_data()["authors"])
@@ -0,0 +1,116 @@
+import logging
+from collections import namedtuple
+
+import numpy as np
+import streamlit as st
+
+from charts import lttb
+from media_app.data import load_news_data, news_author_index, news_filter_engine, news_rollup, news_search_index
+from perf import frame_bytes
+from table_window import NEWS_TABLE_COLUMNS, PAGE_SIZE, article_cards, expand_row, num_pages, page_bounds, page_window
+
+VIEW = "News Articles"
+
+# What differs between the news pages: whether authors can be filtered on, table page size,
+# how many authors the bar chart ranks, whether table rows can be expanded, and how many cards
+# to show (None for one per row of the current table page).
+NewsLayout = namedtuple("NewsLayout", ["author_filter", "page_size", "top_authors", "expand_rows", "cards"])
+PAGED_LAYOUT = NewsLayout(author_filter=False, page_size=100, top_authors=5, expand_rows=False, cards=None)
+AUTHOR_LAYOUT = NewsLayout(author_filter=True, page_size=PAGE_SIZE, top_authors=10, expand_rows=True, cards=5)
+
+
+def render(trace, layout=PAGED_LAYOUT):
+    logging.info("News Articles selected.")
+
+    with trace.span("load_news") as span:
+        news_df = load_news_data()
+        news_engine = news_filter_engine()
+        span["rows_out"] = len(news_df)
+    min_news_date, max_news_date = news_engine.time_bounds()
+
+    news_categories = ["All"] + sorted(news_engine.values("category"))
+    selected_news_category = st.sidebar.selectbox("Select News Category", news_categories, key="news_category")
+    news_filters = {"category": selected_news_category}
+    author_index = news_author_index()
+    selected_author = "All"
+    if layout.author_filter:
+        # Options come from a prefix lookup ranked by article count, not the full sorted author list.
+        author_prefix = st.sidebar.text_input("Find Author", key="news_author_search")
+        authors = ["All"] + author_index.search(author_prefix)
+        selected_author = st.sidebar.selectbox("Select Author", authors, key="news_author")
+    search_news_keyword = st.sidebar.text_input("Search in Headlines", key="news_search")
+    news_start_date = st.sidebar.date_input("Start Date", min_news_date, key="news_start")
+    news_end_date = st.sidebar.date_input("End Date", max_news_date, key="news_end")
+    collapse_duplicates = "cluster_id" in news_df.columns and \
+        st.sidebar.checkbox("Collapse near-duplicates", key="news_collapse")
+
+    trace.set_filters(**news_filters, author=selected_author, start=news_start_date, end=news_end_date,
+                      keyword=search_news_keyword, collapse=collapse_duplicates)
+    with trace.span("search", len(news_df)) as span:
+        news_keyword_rows = news_search_index().search(search_news_keyword) if search_news_keyword else None
+        span["rows_out"] = None if news_keyword_rows is None else len(news_keyword_rows)
+    with trace.span("filter", len(news_df)) as span:
+        rows = news_keyword_rows
+        if selected_author != "All":
+            # Every article crediting the author, co-authored ones included.
+            author_rows = author_index.rows(selected_author)
+            rows = author_rows if rows is None else np.intersect1d(rows, author_rows)
+        positions = news_engine.query(news_start_date, news_end_date, news_filters, rows)
+        filtered_news_df = news_df.iloc[positions]
+        if collapse_duplicates:
+            first = ~filtered_news_df["cluster_id"].duplicated().to_numpy()
+            positions, filtered_news_df = positions[first], filtered_news_df[first]
+        span["rows_out"] = len(filtered_news_df)
+
+    logging.info(f"Filtered News data: {filtered_news_df.shape[0]} records found.")
+
+    st.subheader("Filtered News Articles")
+
+    page_number = st.sidebar.number_input(
+        "Page Number", min_value=1, max_value=num_pages(len(filtered_news_df), layout.page_size), step=1, value=1,
+        key="news_page",
+    )
+
+    if filtered_news_df.empty:
+        logging.warning("No articles found for selected filters.")
+        st.warning("No articles found for the selected filters.")
+        return
+
+    with trace.span("render_table", len(filtered_news_df)) as span:
+        news_page = page_window(filtered_news_df, page_number, layout.page_size, NEWS_TABLE_COLUMNS)
+        st.dataframe(news_page)
+        span["rows_out"] = len(news_page)
+        span["bytes"] = frame_bytes(news_page)
+    if layout.expand_rows:
+        expanded_row = st.selectbox(
+            "Expand row", [None] + list(range(len(news_page))),
+            format_func=lambda i: "None" if i is None else f"{news_page.index[i]}. {news_page['headline'].iloc[i]}",
+            key="news_expand",
+        )
+        if expanded_row is not None:
+            st.write(expand_row(filtered_news_df, page_number, expanded_row, layout.page_size).to_dict())
+
+    st.subheader("Articles Published Per Day")
+    with trace.span("aggregate", len(filtered_news_df)):
+        # The rollup counts every row by category and day, so any other filter is counted directly.
+        if search_news_keyword or collapse_duplicates or selected_author != "All":
+            articles_per_day = filtered_news_df.groupby(filtered_news_df['date'].dt.date).size()
+        else:
+            articles_per_day = news_rollup().per_day(news_start_date, news_end_date, news_filters)
+        top_authors = author_index.top(layout.top_authors, None if len(positions) == len(news_df) else positions)
+    with trace.span("render_charts", len(articles_per_day)):
+        st.line_chart(lttb(articles_per_day))
+
+        st.subheader("Most Active Authors")
+        st.bar_chart(top_authors)
+
+    st.subheader("Trending News Articles")
+    if layout.cards is None:
+        start_idx, end_idx = page_bounds(len(filtered_news_df), page_number, layout.page_size)
+        displayed_news_df = filtered_news_df.iloc[start_idx:end_idx]
+    else:
+        displayed_news_df = filtered_news_df.head(layout.cards)
+    with trace.span("render_cards", len(displayed_news_df)) as span:
+        cards = article_cards(displayed_news_df)
+        st.markdown(cards)
+        span["bytes"] = len(cards.encode("utf-8"))
@@ -0,0 +1,196 @@
+import logging
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import streamlit as st
+
+from charts import SCATTER_MAX_POINTS, density_grid, draw_density_grid
+from dedup import collapse
+from engagement import LEADERBOARD_METRICS, group_sums, summarize_groups, top_videos
+from media_app.data import PUSHDOWN_MODE, fetch_youtube_options, youtube_pushdown, youtube_refresher
+from perf import frame_bytes
+from pushdown import YouTubeFilters
+from table_window import YOUTUBE_TABLE_COLUMNS, expand_row, num_pages, page_bounds, page_window
+from thumbnails import PREFETCH_ROWS, ThumbnailCache
+
+VIEW = "YouTube Analytics"
+# Widgets rendered on every rerun; st.tabs runs both tab bodies, so the engagement tab counts too.
+YOUTUBE_WIDGETS = ("table", "scatter", "channels", "preview", "engagement")
+
+
+@st.cache_resource
+def thumbnail_cache():
+    return ThumbnailCache()
+
+
+@st.cache_data(ttl=600)
+def views_likes_grid(_df, filters):
+    return density_grid(_df)
+
+
+def render_engagement(trace, filtered_df, analytics, category):
+    with trace.span("engagement", len(filtered_df)) as span:
+        if analytics is not None:
+            st.caption("All loaded videos" + ("" if category == "All" else f" in category {category}") + ".")
+            boards = {metric: analytics.leaderboard(metric, category) for metric in LEADERBOARD_METRICS}
+            categories = analytics.categories()
+            channels = analytics.channels(category)
+        else:
+            st.caption("Videos matching the current filters.")
+            boards = {metric: top_videos(filtered_df, metric) for metric in LEADERBOARD_METRICS}
+            sums = group_sums(filtered_df)
+            categories = summarize_groups(sums, "category_id")
+            channels = summarize_groups(sums, "channel_title")
+        span["rows_out"] = sum(len(board) for board in boards.values())
+
+    for metric, title in zip(LEADERBOARD_METRICS, ["Top Liked Videos", "Most Commented Videos",
+                                                   "Highest Engagement Rate"]):
+        st.subheader(title)
+        st.dataframe(boards[metric])
+
+    st.subheader("Average Likes per Category")
+    st.bar_chart(categories["avg_likes"])
+
+    st.subheader("Top Channels by Average Likes")
+    st.dataframe(channels.head(10))
+
+
+def render(trace):
+    logging.info("YouTube Analytics selected.")
+
+    if PUSHDOWN_MODE:
+        with trace.span("load_youtube_options"):
+            youtube_options = fetch_youtube_options()
+    else:
+        with trace.span("load_youtube") as span:
+            youtube_snapshot = youtube_refresher().get()
+            span["rows_out"] = 0 if youtube_snapshot is None else len(youtube_snapshot.data)
+        if youtube_snapshot is None:
+            st.error(f"YouTube data is not available yet. Please try again shortly. "
+                     f"({youtube_refresher().last_error})")
+            st.stop()
+        youtube_engine = youtube_snapshot.derived["engine"]
+        min_publish_time, max_publish_time = youtube_engine.time_bounds()
+        youtube_options = {
+            "category_id": youtube_engine.values("category_id"),
+            "channel_title": youtube_engine.values("channel_title"),
+            "min_publish_time": min_publish_time,
+            "max_publish_time": max_publish_time,
+        }
+
+    category_options = ["All"] + list(youtube_options["category_id"])
+    selected_category = st.sidebar.selectbox("Select Category", category_options, key="youtube_category")
+
+    start_date = st.sidebar.date_input("Start Date", youtube_options["min_publish_time"], key="youtube_start")
+    end_date = st.sidebar.date_input("End Date", youtube_options["max_publish_time"], key="youtube_end")
+
+    channel_options = ["All"] + list(youtube_options["channel_title"])
+    selected_channel = st.sidebar.selectbox("Select Channel", channel_options, key="youtube_channel")
+
+    search_keyword = st.sidebar.text_input("Search in Title/Tags", key="youtube_search").strip()
+    # Pushdown results and snapshots read before the first refresh carry no cluster ids.
+    collapse_duplicates = not PUSHDOWN_MODE and "cluster_id" in youtube_snapshot.data.columns and \
+        st.sidebar.checkbox("Collapse near-duplicates", key="youtube_collapse")
+
+    trace.set_filters(category=selected_category, channel=selected_channel, start=start_date, end=end_date,
+                      keyword=search_keyword, collapse=collapse_duplicates)
+    if PUSHDOWN_MODE:
+        with trace.span("filter") as span:
+            filtered_df = youtube_pushdown().fetch(
+                YouTubeFilters(selected_category, selected_channel, start_date, end_date, search_keyword),
+                YOUTUBE_WIDGETS,
+            )
+            span["rows_out"] = len(filtered_df)
+            span["bytes"] = frame_bytes(filtered_df)
+    else:
+        with trace.span("search", len(youtube_snapshot.data)) as span:
+            keyword_rows = youtube_snapshot.derived["search"].search(search_keyword) if search_keyword else None
+            span["rows_out"] = None if keyword_rows is None else len(keyword_rows)
+        with trace.span("filter", len(youtube_snapshot.data)) as span:
+            filtered_df = youtube_engine.filter(
+                start_date, end_date,
+                {"category_id": selected_category, "channel_title": selected_channel},
+                keyword_rows,
+            )
+            if collapse_duplicates:
+                filtered_df = collapse(filtered_df)
+            span["rows_out"] = len(filtered_df)
+
+    logging.info(f"Filtered YouTube data: {filtered_df.shape[0]} records found.")
+
+    table_page = st.sidebar.number_input(
+        "Table Page", min_value=1, max_value=num_pages(len(filtered_df)), step=1, value=1, key="youtube_page"
+    )
+    overview_tab, engagement_tab = st.tabs(["Overview", "Engagement"])
+    with overview_tab:
+        with trace.span("render_table", len(filtered_df)) as span:
+            youtube_page = page_window(filtered_df, table_page, columns=YOUTUBE_TABLE_COLUMNS)
+            st.dataframe(youtube_page)
+            span["rows_out"] = len(youtube_page)
+            span["bytes"] = frame_bytes(youtube_page)
+        expanded_row = st.selectbox(
+            "Expand row", [None] + list(range(len(youtube_page))),
+            format_func=lambda i: "None" if i is None else f"{youtube_page.index[i]}. {youtube_page['title'].iloc[i]}",
+            key="youtube_expand",
+        )
+        if expanded_row is not None:
+            st.write(expand_row(filtered_df, table_page, expanded_row).to_dict())
+
+        with trace.span("render_scatter", len(filtered_df)):
+            fig, ax = plt.subplots(figsize=(10, 6))
+            if len(filtered_df) > SCATTER_MAX_POINTS:
+                # The snapshot version keeps a refresh with the same row count from serving the old grid.
+                grid_key = (None if PUSHDOWN_MODE else youtube_snapshot.version, selected_category, selected_channel,
+                            start_date, end_date, search_keyword, collapse_duplicates, len(filtered_df))
+                grid = views_likes_grid(filtered_df, grid_key)
+                draw_density_grid(ax, grid)
+                ax.set_title(f"Views vs Likes ({grid.total:,} videos, binned)")
+            else:
+                ax.scatter(
+                    filtered_df["views"], filtered_df["likes"],
+                    s=filtered_df["comment_count"], c=filtered_df["category_id"], cmap='viridis', alpha=0.6,
+                )
+                ax.set_title("Scatter Plot (Views vs Likes)")
+            ax.set_xlabel("Views")
+            ax.set_ylabel("Likes")
+            st.pyplot(fig)
+            plt.close(fig)
+
+        with trace.span("aggregate", len(filtered_df)):
+            # Channel counts are kept over the whole snapshot, so a narrower date range is counted
+            # on the filtered rows instead.
+            rollup = None if PUSHDOWN_MODE else youtube_snapshot.derived["rollup"]
+            if rollup is None or search_keyword or collapse_duplicates or not rollup.covers(start_date, end_date):
+                top_channels = filtered_df['channel_title'].value_counts().head(10)
+            else:
+                top_channels = rollup.top(
+                    "channel_title", 10, start_date, end_date,
+                    {"category_id": selected_category, "channel_title": selected_channel},
+                )
+            st.bar_chart(top_channels)
+
+        st.subheader("Trending Videos Preview")
+        with trace.span("render_thumbnails"):
+            thumbnails = thumbnail_cache()
+            # The preview follows the table page. Its rows are queued first, so on a cold cache they
+            # are not stuck behind the prefetch; the rows after them are fetched in the background
+            # so paging forward finds their thumbnails cached.
+            start, end = page_bounds(len(filtered_df), table_page)
+            visible = filtered_df.iloc[start:start + 5]
+            upcoming = filtered_df.iloc[start + 5:end + PREFETCH_ROWS]
+            thumbnails.prefetch(zip(visible["video_id"], visible["thumbnail_link"]))
+            thumbnails.prefetch(zip(upcoming["video_id"], upcoming["thumbnail_link"]))
+            for index, row in visible.iterrows():
+                thumbnail = thumbnails.get(row['video_id'], row['thumbnail_link'])
+                st.image(thumbnail or row['thumbnail_link'], caption=row['title'])
+
+    with engagement_tab:
+        # The snapshot's running aggregates answer category-only selections without touching the
+        # rows; any other filter ranks the filtered frame instead, still without a full sort.
+        unfiltered = not PUSHDOWN_MODE and selected_channel == "All" and not search_keyword and \
+            not collapse_duplicates and \
+            pd.Timestamp(start_date) <= youtube_options["min_publish_time"].floor("D") and \
+            pd.Timestamp(end_date) >= youtube_options["max_publish_time"].floor("D")
+        render_engagement(
+            trace, filtered_df, youtube_snapshot.derived["engagement"] if unfiltered else None, selected_category
+        )
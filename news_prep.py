@@ -0,0 +1,89 @@
+import logging
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from dedup import NEWS_TEXT_COLUMNS, NearDuplicateIndex, combine_text
+
+NEWS_JSON_PATH = "News_Category_Dataset_v3.json"
+NEWS_DATASET_PATH = "news_dataset"
+NEWS_COLUMNS = ["category", "headline", "authors", "link", "short_description", "date"]
+CLUSTER_COLUMN = "cluster_id"
+CHUNK_SIZE = 50000
+
+PARTITIONING = ds.partitioning(pa.schema([("year", pa.int16()), ("month", pa.int8())]), flavor="hive")
+
+
+def clean_chunk(chunk):
+    """Project, type and null-filter one chunk of the raw JSON-lines file."""
+    chunk = chunk[NEWS_COLUMNS].copy()
+    chunk["date"] = pd.to_datetime(chunk["date"], errors="coerce")
+    chunk = chunk.dropna()
+    chunk["year"] = chunk["date"].dt.year.astype("int16")
+    chunk["month"] = chunk["date"].dt.month.astype("int8")
+    return chunk
+
+
+def prepare_news_dataset(json_path=NEWS_JSON_PATH, dataset_path=NEWS_DATASET_PATH, chunk_size=CHUNK_SIZE,
+                         csv_path=None, dedup_path=None):
+    """Stream the JSON-lines file in bounded chunks into a year/month-partitioned Parquet dataset.
+
+    Only one chunk is held in memory at a time, so peak memory does not grow with the input.
+    Any existing dataset at dataset_path is replaced. If csv_path is given, the cleaned rows are
+    also appended there in the 6-column layout load_news_data reads.
+
+    If dedup_path is given, each article also gets a cluster_id: near-duplicate headline and
+    description pairs share one. The MinHash signatures are kept at dedup_path, so a rerun only
+    signs articles whose link it has not seen before.
+    """
+    if os.path.exists(dataset_path):
+        shutil.rmtree(dataset_path)
+    duplicates = NearDuplicateIndex.load(dedup_path) if dedup_path else None
+    columns = NEWS_COLUMNS + ([CLUSTER_COLUMN] if duplicates is not None else [])
+    total = 0
+    with pd.read_json(json_path, lines=True, chunksize=chunk_size, convert_dates=False, dtype=False) as reader:
+        for i, chunk in enumerate(reader):
+            chunk = clean_chunk(chunk)
+            if chunk.empty:
+                continue
+            if duplicates is not None:
+                chunk[CLUSTER_COLUMN] = duplicates.add(chunk["link"], combine_text(chunk, NEWS_TEXT_COLUMNS))
+            ds.write_dataset(
+                pa.Table.from_pandas(chunk, preserve_index=False),
+                dataset_path,
+                format="parquet",
+                partitioning=PARTITIONING,
+                basename_template=f"chunk-{i:05d}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+            if csv_path:
+                chunk[columns].to_csv(csv_path, index=False, mode="w" if total == 0 else "a", header=total == 0)
+            total += len(chunk)
+    if duplicates is not None:
+        duplicates.save(dedup_path)
+    logging.info(f"News dataset written to {dataset_path} with {total} records.")
+    return total
+
+
+def read_news_dataset(dataset_path=NEWS_DATASET_PATH, start=None, end=None, columns=None):
+    """Read articles dated within [start, end], skipping year/month partitions outside the window."""
+    dataset = ds.dataset(dataset_path, format="parquet", partitioning=PARTITIONING)
+    condition = None
+    if start is not None:
+        start = pd.Timestamp(start)
+        condition = ((ds.field("year") > start.year) |
+                     ((ds.field("year") == start.year) & (ds.field("month") >= start.month)))
+        condition &= ds.field("date") >= start.to_pydatetime()
+    if end is not None:
+        end = pd.Timestamp(end)
+        end_condition = ((ds.field("year") < end.year) |
+                         ((ds.field("year") == end.year) & (ds.field("month") <= end.month)))
+        end_condition &= ds.field("date") <= end.to_pydatetime()
+        condition = end_condition if condition is None else condition & end_condition
+    if columns is None:
+        columns = NEWS_COLUMNS + [name for name in [CLUSTER_COLUMN] if name in dataset.schema.names]
+    table = dataset.to_table(columns=columns, filter=condition)
+    return table.to_pandas().sort_values("date", kind="stable", ignore_index=True)
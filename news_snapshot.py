@@ -0,0 +1,118 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+NEWS_CSV_PATH = r"C:\Users\dell\Desktop\Media\news_category_cleaned.csv"
+NEWS_SNAPSHOT_PATH = os.path.join("snapshots", "news_category.arrow")
+NEWS_LAYOUTS = {
+    5: ["category", "headline", "authors", "short_description", "date"],
+    6: ["category", "headline", "authors", "link", "short_description", "date"],
+    # Written by prepare_news_dataset(..., dedup_path=...): near-duplicate articles share a cluster_id.
+    7: ["category", "headline", "authors", "link", "short_description", "date", "cluster_id"],
+}
+METADATA_KEY = b"news_snapshot"
+
+
+def news_columns(csv_path):
+    """Pick the column layout from the CSV header line alone."""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        num_columns = len(next(csv.reader(f), []))
+    if num_columns not in NEWS_LAYOUTS:
+        raise ValueError(f"Unexpected column count: {num_columns}. Check dataset format.")
+    return NEWS_LAYOUTS[num_columns]
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_snapshot_metadata(snapshot_path):
+    if not os.path.exists(snapshot_path):
+        return None
+    with pa.memory_map(snapshot_path) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    if METADATA_KEY not in metadata:
+        return None
+    return json.loads(metadata[METADATA_KEY])
+
+
+def build_news_snapshot(csv_path=NEWS_CSV_PATH, snapshot_path=NEWS_SNAPSHOT_PATH):
+    """Parse the CSV once and write a typed Arrow IPC file with its layout and source stamp in the schema metadata."""
+    column_names = news_columns(csv_path)
+    df = pd.read_csv(csv_path, names=column_names, header=0)
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df["category"] = df["category"].astype("category")
+
+    stat = os.stat(csv_path)
+    metadata = {
+        "columns": column_names,
+        "source_mtime": stat.st_mtime,
+        "source_size": stat.st_size,
+        "source_sha256": file_digest(csv_path),
+    }
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    os.replace(write_snapshot(table, metadata, snapshot_path), snapshot_path)
+    logging.info(f"News snapshot written to {snapshot_path} with {table.num_rows} records.")
+    return metadata
+
+
+def write_snapshot(table, metadata, snapshot_path):
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), METADATA_KEY: json.dumps(metadata)})
+    directory = os.path.dirname(snapshot_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    tmp_path = snapshot_path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return tmp_path
+
+
+def restamp_snapshot(csv_path, metadata, snapshot_path=NEWS_SNAPSHOT_PATH):
+    """Record the CSV's current mtime and size after its hash matched, so later starts skip the hash.
+
+    The mapped columns are written back unchanged; the CSV is not parsed again.
+    """
+    stat = os.stat(csv_path)
+    metadata = {**metadata, "source_mtime": stat.st_mtime, "source_size": stat.st_size}
+    with pa.memory_map(snapshot_path) as source:
+        tmp_path = write_snapshot(pa.ipc.open_file(source).read_all(), metadata, snapshot_path)
+    os.replace(tmp_path, snapshot_path)
+    logging.info(f"News CSV touched but unchanged; restamped {snapshot_path}.")
+    return metadata
+
+
+def snapshot_is_fresh(csv_path, metadata):
+    """A snapshot is fresh if the CSV is unchanged; the hash is only checked when the mtime or size moved."""
+    if metadata is None:
+        return False
+    stat = os.stat(csv_path)
+    if stat.st_mtime == metadata["source_mtime"] and stat.st_size == metadata["source_size"]:
+        return True
+    return stat.st_size == metadata["source_size"] and file_digest(csv_path) == metadata["source_sha256"]
+
+
+def load_news_snapshot(csv_path=NEWS_CSV_PATH, snapshot_path=NEWS_SNAPSHOT_PATH):
+    """Memory-map the news snapshot, rebuilding it first if the CSV changed.
+
+    split_blocks/self_destruct let columns that need no conversion, Arrow-backed strings included,
+    keep pointing at the mapped file instead of being copied onto the heap, so worker processes
+    share those pages; columns pandas has to convert are still copied.
+    """
+    metadata = read_snapshot_metadata(snapshot_path)
+    if not snapshot_is_fresh(csv_path, metadata):
+        logging.info("News snapshot missing or stale, rebuilding from CSV.")
+        build_news_snapshot(csv_path, snapshot_path)
+    elif os.stat(csv_path).st_mtime != metadata["source_mtime"]:
+        restamp_snapshot(csv_path, metadata, snapshot_path)
+    with pa.memory_map(snapshot_path) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True, self_destruct=True)
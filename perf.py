@@ -0,0 +1,172 @@
+import argparse
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+LOG_PATH = os.path.join("logs", "dashboard.log")
+# Structured records are written as "perf {json}" messages so they sit in the same log as the rest.
+PERF_PREFIX = "perf "
+
+_current = contextvars.ContextVar("perf_trace", default=None)
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+class RerunTrace:
+    """Timing spans and data volumes for one script rerun, written as a single JSON log record.
+
+    Code that has no handle on the trace (loaders, the pushdown cache) reaches the active one
+    through current(), so BigQuery job stats and cache hits land on the rerun that caused them.
+    """
+
+    def __init__(self, view=None, filters=None):
+        self.rerun_id = uuid.uuid4().hex[:12]
+        self.view = view
+        self.filters = {key: str(value) for key, value in (filters or {}).items()}
+        self.stages = []
+        self.queries = []
+        self.cache = {}
+        self._started = time.perf_counter()
+        self._token = None
+
+    def set_filters(self, **filters):
+        self.filters = {key: str(value) for key, value in filters.items()}
+
+    def start(self):
+        self._token = _current.set(self)
+        return self
+
+    @contextmanager
+    def span(self, stage, rows_in=None):
+        """Time a block; the yielded dict takes extra fields such as rows_out or bytes."""
+        record = {"stage": stage}
+        if rows_in is not None:
+            record["rows_in"] = int(rows_in)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["ms"] = round((time.perf_counter() - started) * 1000, 3)
+            self.stages.append(record)
+
+    def count_cache(self, name, hit):
+        counts = self.cache.setdefault(name, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
+    def record(self):
+        return {
+            "event": "rerun",
+            "rerun_id": self.rerun_id,
+            "view": self.view,
+            "filters": self.filters,
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "stages": self.stages,
+            "bigquery": self.queries,
+            "cache": self.cache,
+        }
+
+    def finish(self, history=None):
+        """Log the record, append it to history (e.g. a session's recent reruns) and return it."""
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        record = self.record()
+        logging.info(PERF_PREFIX + json.dumps(record, default=str))
+        if history is not None:
+            history.append(record)
+        return record
+
+
+def current():
+    return _current.get()
+
+
+def start_trace(view=None, filters=None):
+    return RerunTrace(view, filters).start()
+
+
+def record_query_job(job, label):
+    """Attach a finished BigQuery job's stats to the active rerun, or log them on their own."""
+    stats = {
+        "label": label,
+        "bytes_processed": getattr(job, "total_bytes_processed", None),
+        "bytes_billed": getattr(job, "total_bytes_billed", None),
+        "cache_hit": getattr(job, "cache_hit", None),
+    }
+    trace = current()
+    if trace is not None:
+        trace.queries.append(stats)
+    else:
+        logging.info(PERF_PREFIX + json.dumps({"event": "bigquery", **stats}, default=str))
+
+
+def count_cache(name, hit):
+    trace = current()
+    if trace is not None:
+        trace.count_cache(name, hit)
+
+
+def stage_breakdown(records):
+    """One row per rerun and one column per stage, in ms; for the sidebar panel."""
+    rows = []
+    for record in records:
+        row = {"rerun": record["rerun_id"], "total": record["total_ms"]}
+        for stage in record["stages"]:
+            row[stage["stage"]] = row.get(stage["stage"], 0) + stage["ms"]
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("rerun") if rows else pd.DataFrame()
+
+
+def read_records(lines):
+    for line in lines:
+        _, found, payload = line.partition(PERF_PREFIX)
+        if not found:
+            continue
+        try:
+            record = json.loads(payload)
+        except ValueError:
+            continue
+        if record.get("event") == "rerun":
+            yield record
+
+
+def summarize(lines):
+    """p50/p95 latency per stage (and for whole reruns) over the perf records in a log."""
+    durations = []
+    for record in read_records(lines):
+        durations.append((record["view"], "total", record["total_ms"]))
+        for stage in record["stages"]:
+            durations.append((record["view"], stage["stage"], stage["ms"]))
+    if not durations:
+        return pd.DataFrame(columns=["view", "stage", "count", "p50_ms", "p95_ms", "max_ms"])
+    df = pd.DataFrame(durations, columns=["view", "stage", "ms"])
+    grouped = df.groupby(["view", "stage"], sort=True)["ms"]
+    return pd.DataFrame({
+        "count": grouped.size(),
+        "p50_ms": grouped.quantile(0.5),
+        "p95_ms": grouped.quantile(0.95),
+        "max_ms": grouped.max(),
+    }).round(2).reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize per-stage rerun latency from the dashboard log.")
+    parser.add_argument("log", nargs="?", default=LOG_PATH)
+    args = parser.parse_args(argv)
+    with open(args.log, encoding="utf-8") as f:
+        summary = summarize(f)
+    print(summary.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+from filter_engine import day_after
+from perf import count_cache, record_query_job
+from youtube_loader import YOUTUBE_COLUMNS, YOUTUBE_TABLE, query_job_config
+
+YouTubeFilters = namedtuple("YouTubeFilters", ["category", "channel", "start_date", "end_date", "keyword"])
+
+# Columns each YouTube widget reads; a query only projects the union of what is on screen.
+WIDGET_COLUMNS = {
+    "table": ["video_id", "title", "channel_title", "category_id", "publish_time", "views", "likes",
+              "comment_count", "comments_disabled", "tags", "thumbnail_link"],
+    "scatter": ["views", "likes", "comment_count", "category_id"],
+    "channels": ["channel_title"],
+    "preview": ["video_id", "thumbnail_link", "title"],
+    "engagement": ["video_id", "title", "channel_title", "category_id", "views", "likes", "comment_count"],
+}
+# Seconds a cached query result is served; matches the filter options' refresh, so rows added
+# to BigQuery show up for filter states that were already cached.
+RESULT_TTL = 600
+
+
+def columns_for(widgets):
+    columns = []
+    for widget in widgets:
+        for column in WIDGET_COLUMNS[widget]:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def normalize_filters(filters, columns):
+    """Turn a filter state into a hashable cache key; equivalent states map to the same key."""
+    return (
+        None if filters.category in (None, "All") else str(filters.category),
+        None if filters.channel in (None, "All") else filters.channel,
+        pd.Timestamp(filters.start_date).isoformat() if filters.start_date is not None else None,
+        pd.Timestamp(filters.end_date).isoformat() if filters.end_date is not None else None,
+        (filters.keyword or "").strip().lower() or None,
+        tuple(column for column in YOUTUBE_COLUMNS if column in columns),
+    )
+
+
+def compile_youtube_query(key, table=YOUTUBE_TABLE):
+    """Compile a normalized filter key into (sql, params) for a parameterized query."""
+    category, channel, start, end, keyword, columns = key
+    conditions = []
+    params = []
+    if start is not None:
+        conditions.append("publish_time >= @start_time")
+        params.append(("start_time", "DATETIME", pd.Timestamp(start).to_pydatetime()))
+    if end is not None:
+        conditions.append("publish_time < @end_time")
+        params.append(("end_time", "DATETIME", day_after(end).to_pydatetime()))
+    if category is not None:
+        conditions.append("CAST(category_id AS STRING) = @category")
+        params.append(("category", "STRING", category))
+    if channel is not None:
+        conditions.append("channel_title = @channel")
+        params.append(("channel", "STRING", channel))
+    if keyword is not None:
+        conditions.append("(STRPOS(LOWER(title), @keyword) > 0 OR STRPOS(LOWER(tags), @keyword) > 0)")
+        params.append(("keyword", "STRING", keyword))
+
+    query = f"SELECT {', '.join(columns)} FROM `{table}`"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return query, params
+
+
+class QueryResultCache:
+    """Thread-safe LRU of query results bounded by the total in-memory size of the cached frames.
+
+    Entries older than ttl seconds count as misses and are dropped.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, ttl=RESULT_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] >= self.ttl:
+                self.current_bytes -= self._entries.pop(key)[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, df):
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (df, size, time.monotonic())
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class YouTubePushdown:
+    """Answers sidebar filter states with parameterized BigQuery queries instead of pandas masks."""
+
+    def __init__(self, client, table=YOUTUBE_TABLE, cache=None):
+        self.client = client
+        self.table = table
+        self.cache = cache if cache is not None else QueryResultCache()
+
+    def fetch(self, filters, widgets=tuple(WIDGET_COLUMNS)):
+        key = normalize_filters(filters, columns_for(widgets))
+        df = self.cache.get(key)
+        count_cache("pushdown", df is not None)
+        if df is not None:
+            return df
+        query, params = compile_youtube_query(key, self.table)
+        job = self.client.query(query, job_config=query_job_config(params))
+        df = job.to_dataframe()
+        record_query_job(job, "youtube_pushdown")
+        if "publish_time" in df.columns:
+            df["publish_time"] = pd.to_datetime(df["publish_time"]).dt.tz_localize(None)
+        logging.info(f"Pushdown query returned {df.shape[0]} records.")
+        self.cache.put(key, df)
+        return df
+
+    def fetch_options(self):
+        """Return the distinct values and date bounds the sidebar widgets need."""
+        query = (
+            "SELECT ARRAY_AGG(DISTINCT CAST(category_id AS STRING) IGNORE NULLS) AS categories,"
+            " ARRAY_AGG(DISTINCT channel_title IGNORE NULLS) AS channels,"
+            " MIN(publish_time) AS min_time, MAX(publish_time) AS max_time"
+            f" FROM `{self.table}`"
+        )
+        job = self.client.query(query)
+        row = job.to_dataframe().iloc[0]
+        record_query_job(job, "youtube_options")
+        return {
+            "category_id": list(row["categories"]),
+            "channel_title": list(row["channels"]),
+            "min_publish_time": pd.Timestamp(row["min_time"]),
+            "max_publish_time": pd.Timestamp(row["max_time"]),
+        }
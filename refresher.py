@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# data and the structures derived from it are swapped together, so readers never pair a new
+# frame with an index built over the old one.
+Snapshot = namedtuple("Snapshot", ["data", "derived", "version", "loaded_at"])
+# Seconds before retrying a failed reload; doubled per consecutive failure, never beyond ttl.
+RETRY_INTERVAL = 30
+
+
+class BackgroundRefresher:
+    """Stale-while-revalidate holder for one dataset.
+
+    get() always returns the current snapshot without waiting; once it is older than ttl
+    seconds a reload is started on a worker thread, and the new data plus its derived indexes
+    replace the snapshot in one assignment when ready. Reloads requested while one is running
+    share it, and a failed reload keeps serving the last good snapshot and is retried after
+    retry seconds, backing off per failure. Only a get() with no snapshot yet can block, when
+    initial() has nothing to serve; while a failed first load waits for its retry, get()
+    returns None and last_error says why.
+    """
+
+    def __init__(self, load, ttl=600, derive=None, initial=None, name="dataset", retry=RETRY_INTERVAL):
+        self.load = load
+        self.ttl = ttl
+        self.retry = retry
+        self.derive = derive or (lambda data: {})
+        self.initial = initial
+        self.name = name
+        self.last_error = None
+        self.last_attempt = None
+        self.failures = 0
+        # time.time() after which get() starts a reload; 0 until the first snapshot is loaded.
+        self._next_attempt = 0
+        self._snapshot = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._pending = None
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"refresh-{name}")
+        self._stop = threading.Event()
+        self._scheduler = None
+
+    def _build(self, data, loaded_at=None):
+        self._version += 1
+        return Snapshot(data, self.derive(data), self._version, time.time() if loaded_at is None else loaded_at)
+
+    def _reload(self):
+        self.last_attempt = time.time()
+        try:
+            started = time.perf_counter()
+            self._snapshot = self._build(self.load())
+            self.last_error = None
+            self.failures = 0
+            self._next_attempt = self._snapshot.loaded_at + self.ttl
+            logging.info(f"Refreshed {self.name} in {time.perf_counter() - started:.2f}s "
+                         f"(version {self._snapshot.version}).")
+        except Exception as e:
+            self.last_error = e
+            self.failures += 1
+            delay = min(self.retry * 2 ** (self.failures - 1), self.ttl)
+            self._next_attempt = self.last_attempt + delay
+            logging.error(f"Refreshing {self.name} failed, keeping the last good snapshot and retrying "
+                          f"in {delay:.0f}s: {e}")
+        finally:
+            with self._lock:
+                self._pending = None
+        return self._snapshot
+
+    def refresh(self):
+        """Start a reload unless one is already running; returns the Future of the running reload."""
+        with self._lock:
+            if self._pending is None:
+                self._pending = self._worker.submit(self._reload)
+            return self._pending
+
+    def _first_snapshot(self):
+        with self._lock:
+            if self._snapshot is not None:
+                return
+            data = self.initial() if self.initial else None
+            if data is not None:
+                # Served straight away but treated as expired, so a reload starts at once.
+                self._snapshot = self._build(data, loaded_at=0)
+        if self._snapshot is None and time.time() >= self._next_attempt:
+            self.refresh().result()
+
+    def get(self):
+        if self._snapshot is None:
+            self._first_snapshot()
+        snapshot = self._snapshot
+        if snapshot is not None and time.time() >= self._next_attempt:
+            self.refresh()
+        return snapshot
+
+    def start(self):
+        """Also reload every ttl seconds on a daemon thread, whether or not anyone reads."""
+        if self._scheduler is None:
+            def run():
+                while not self._stop.wait(self.ttl):
+                    self.refresh().result()
+
+            self._scheduler = threading.Thread(target=run, name=f"schedule-{self.name}", daemon=True)
+            self._scheduler.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        self._worker.shutdown(wait=True)
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+from filter_engine import day_after
+
+
+class RollupCube:
+    """Row counts pre-aggregated by (day, dimension values), built once per load.
+
+    Chart queries sum the matching cells instead of grouping the raw rows. Date bounds are
+    whole dates, as the sidebar date_input supplies them, and the end date counts in full like
+    in FilterEngine, so a range is a slice of days.
+
+    High-cardinality columns such as channels would multiply the cells by their distinct values
+    on every day, leaving about as many cells as rows. They go in totals instead: one count per
+    (dimension values, totals values) over all dated rows, which answers top() whenever the date
+    range covers the whole frame, as the sidebar's default range does.
+
+    With a key column, the cube remembers how many rows it has counted and the key of the last
+    one, so extended() can fold in just the rows a refresh appended.
+    """
+
+    def __init__(self, df, time_column, dimensions, totals=(), key=None):
+        self.time_column = time_column
+        self.dimensions = list(dimensions)
+        self.totals_dimensions = list(totals)
+        self.key = key
+        self.rows = len(df)
+        self.last_key = df[key].iloc[-1] if key is not None and len(df) else None
+        self.cells, self.totals = self._rollup(df)
+        self._reindex()
+
+    def _rollup(self, df):
+        times = pd.to_datetime(df[self.time_column])
+        valid = times.notna().to_numpy()
+        keys = pd.DataFrame({"day": times[valid].dt.floor("D").to_numpy()})
+        for dimension in self.dimensions + self.totals_dimensions:
+            values = df[dimension][valid]
+            keys[dimension] = values.where(values.isna(), values.astype(str)).to_numpy()
+        keys["count"] = 1
+        return self._combine(keys.drop(columns=self.totals_dimensions)), self._sum_totals(keys.drop(columns="day"))
+
+    def _combine(self, cells):
+        keys = ["day"] + self.dimensions
+        cells = cells.groupby(keys, dropna=False, sort=False)["count"].sum().reset_index()
+        return cells.sort_values("day", kind="stable", ignore_index=True)
+
+    def _sum_totals(self, totals):
+        if not self.totals_dimensions:
+            return None
+        keys = self.dimensions + self.totals_dimensions
+        totals = totals.groupby(keys, dropna=False, sort=False)["count"].sum().reset_index()
+        return totals.sort_values("count", ascending=False, kind="stable", ignore_index=True)
+
+    def _reindex(self):
+        # The counted day range decides covers(). Totals are kept most frequent first and queried
+        # as integer codes, so a top() is a few comparisons and at most a bincount.
+        days = self.cells["day"]
+        self.first_day, self.last_day = (days.iloc[0], days.iloc[-1]) if len(days) else (None, None)
+        self._totals_codes = {}
+        if self.totals is None:
+            return
+        for column in self.dimensions + self.totals_dimensions:
+            codes, uniques = pd.factorize(self.totals[column], use_na_sentinel=True)
+            uniques = np.asarray(uniques, dtype=object)
+            self._totals_codes[column] = (codes, {label: code for code, label in enumerate(uniques)}, uniques)
+        self._totals_counts = self.totals["count"].to_numpy()
+
+    def update(self, new_rows):
+        """Fold newly arrived rows into the existing cells."""
+        if new_rows.empty:
+            return self
+        cells, totals = self._rollup(new_rows)
+        self.cells = self._combine(pd.concat([self.cells, cells], ignore_index=True))
+        if self.totals is not None:
+            self.totals = self._sum_totals(pd.concat([self.totals, totals], ignore_index=True))
+        self._reindex()
+        self.rows += len(new_rows)
+        if self.key is not None:
+            self.last_key = new_rows[self.key].iloc[-1]
+        return self
+
+    def copy(self):
+        cube = RollupCube.__new__(RollupCube)
+        cube.__dict__.update(self.__dict__)
+        return cube
+
+    def extended(self, df):
+        """Cube for df, which usually is this frame with rows appended.
+
+        When the first self.rows rows are the ones already counted, only the rest are folded
+        into a copy (self keeps serving readers meanwhile); otherwise everything is rebuilt.
+        """
+        if self.key is not None and 0 < self.rows <= len(df) and df[self.key].iloc[self.rows - 1] == self.last_key:
+            return self.copy().update(df.iloc[self.rows:])
+        return RollupCube(df, self.time_column, self.dimensions, self.totals_dimensions, self.key)
+
+    def _select(self, start, end, equals):
+        cells = self.cells
+        days = cells["day"].to_numpy()
+        lo = 0 if start is None else np.searchsorted(days, np.datetime64(pd.Timestamp(start).floor("D")), "left")
+        hi = len(days) if end is None else np.searchsorted(days, np.datetime64(day_after(end)), "left")
+        cells = cells.iloc[lo:hi]
+        for dimension, value in (equals or {}).items():
+            if value is None or value == "All":
+                continue
+            cells = cells[cells[dimension] == str(value)]
+        return cells
+
+    def per_day(self, start=None, end=None, equals=None):
+        """Rows per calendar day, like groupby(time.dt.date).size() on the filtered frame."""
+        counts = self._select(start, end, equals).groupby("day")["count"].sum()
+        counts.index = pd.Index([day.date() for day in counts.index], name=self.time_column)
+        return counts
+
+    def covers(self, start=None, end=None):
+        """Whether [start, end] includes every counted day, so the totals apply to it."""
+        if self.first_day is None:
+            return True
+        return (start is None or pd.Timestamp(start) < self.first_day + pd.Timedelta(days=1)) and \
+            (end is None or pd.Timestamp(end) >= self.last_day)
+
+    def top(self, dimension, n=10, start=None, end=None, equals=None):
+        """Most frequent values of a dimension, like value_counts().head(n) on the filtered frame.
+
+        Queries involving a totals column are answered from the totals, which only hold for
+        ranges the cube covers(); other ranges raise ValueError.
+        """
+        equals = {column: value for column, value in (equals or {}).items() if value is not None and value != "All"}
+        if dimension in self.totals_dimensions or set(equals).intersection(self.totals_dimensions):
+            if not self.covers(start, end):
+                raise ValueError(f"Totals for {dimension} only cover the full date range")
+            return self._top_totals(dimension, n, equals)
+        counts = self._select(start, end, equals).groupby(dimension)["count"].sum()
+        return counts.sort_values(ascending=False, kind="stable").head(n)
+
+    def _top_totals(self, dimension, n, equals):
+        codes, _, uniques = self._totals_codes[dimension]
+        keep = codes >= 0
+        for column, value in equals.items():
+            column_codes, lookup, _ = self._totals_codes[column]
+            keep &= column_codes == lookup.get(str(value), -2)
+        if len(equals) == len(self._totals_codes) - 1 and dimension not in equals:
+            # Every other column is fixed, so each kept total is one value and they are already ranked.
+            positions = np.flatnonzero(keep)[:n]
+            values, counts = codes[positions], self._totals_counts[positions]
+        else:
+            counts = np.bincount(codes[keep], weights=self._totals_counts[keep], minlength=len(uniques))
+            values = np.flatnonzero(counts)
+            if len(values) > n:
+                values = values[np.argpartition(-counts[values], n - 1)[:n]]
+            values = values[np.lexsort((values, -counts[values]))]
+            counts = counts[values]
+        index = pd.Index(uniques[values], dtype=object, name=dimension)
+        return pd.Series(counts.astype(np.int64), index=index, name="count")
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+MAX_GRAM = 3
+
+
+def _code_points(texts):
+    """Concatenate texts into one array of code points separated by 0."""
+    joined = "\x00".join(text.replace("\x00", " ") for text in texts)
+    return np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+
+
+class NgramIndex:
+    """Case-insensitive substring index over one text column.
+
+    Distinct values are indexed once by their 1-, 2- and 3-grams. Each gram maps to a sorted
+    uint32 array of value ids, and each value id maps back to the rows holding it.
+    """
+
+    # Largest packed (gram, value id) key plus one; past it the postings are sorted on two columns.
+    PACKED_KEY_LIMIT = 2 ** 64
+
+    def __init__(self, values):
+        values = pd.Series(values, dtype=object).reset_index(drop=True)
+        self.num_rows = len(values)
+        value_ids, uniques = pd.factorize(values, use_na_sentinel=True)
+        self.uniques = np.asarray(uniques, dtype=object)
+
+        order = np.argsort(value_ids, kind="stable")
+        order = order[value_ids[order] >= 0]
+        self._value_rows = order.astype(np.uint32)
+        self._value_offsets = np.searchsorted(value_ids[order], np.arange(len(self.uniques) + 1))
+
+        # Grams are packed as base-len(alphabet) numbers over the code points that actually occur,
+        # then combined with the value id so a single sort groups and dedups the postings.
+        points = _code_points(str(value).lower() for value in self.uniques)
+        present = np.zeros(0x110000, dtype=bool)
+        present[points] = True
+        present[0] = True
+        self._alphabet = np.flatnonzero(present).astype(np.uint32)
+        codes = np.searchsorted(self._alphabet, points).astype(np.uint64)
+        owner = np.cumsum(codes == 0).astype(np.uint64)
+        base, num_values = np.uint64(len(self._alphabet)), np.uint64(max(len(self.uniques), 1))
+
+        self._postings = {}
+        for n in range(1, MAX_GRAM + 1):
+            if len(codes) < n:
+                continue
+            keys = self._pack(codes, n)
+            valid = (codes[:len(keys)] != 0) & (owner[:len(keys)] == owner[n - 1:])
+            keys, owners = keys[valid], owner[:len(keys)][valid]
+            if int(base) ** n * int(num_values) <= self.PACKED_KEY_LIMIT:
+                combined = keys * num_values + owners
+                combined.sort()
+                keep = np.ones(len(combined), dtype=bool)
+                keep[1:] = combined[1:] != combined[:-1]
+                combined = combined[keep]
+                grams, owners = combined // num_values, combined % num_values
+            else:
+                # Many distinct characters and values would overflow the packed key.
+                order = np.lexsort((owners, keys))
+                keys, owners = keys[order], owners[order]
+                keep = np.r_[True, (keys[1:] != keys[:-1]) | (owners[1:] != owners[:-1])]
+                grams, owners = keys[keep], owners[keep]
+            starts = np.flatnonzero(np.r_[True, grams[1:] != grams[:-1]])
+            self._postings[n] = (grams[starts], np.append(starts, len(grams)), owners.astype(np.uint32))
+
+    def _pack(self, codes, n):
+        keys = np.zeros(len(codes) - n + 1, dtype=np.uint64)
+        for offset in range(n):
+            keys = keys * np.uint64(len(self._alphabet)) + codes[offset:len(keys) + offset]
+        return keys
+
+    def _posting(self, n, key):
+        grams, offsets, ids = self._postings[n]
+        i = np.searchsorted(grams, key)
+        if i == len(grams) or grams[i] != key:
+            return np.empty(0, dtype=np.uint32)
+        return ids[offsets[i]:offsets[i + 1]]
+
+    def matching_values(self, keyword):
+        """Return ids of distinct values containing keyword, ignoring case."""
+        needle = keyword.lower()
+        n = min(len(needle), MAX_GRAM)
+        points = _code_points([needle])
+        codes = np.searchsorted(self._alphabet, points)
+        if n not in self._postings or (codes == len(self._alphabet)).any() or \
+                (self._alphabet[np.minimum(codes, len(self._alphabet) - 1)] != points).any():
+            return np.empty(0, dtype=np.uint32)
+        keys = np.unique(self._pack(codes.astype(np.uint64), n))
+        postings = sorted((self._posting(n, key) for key in keys), key=len)
+        ids = postings[0]
+        for posting in postings[1:]:
+            if len(ids) == 0:
+                break
+            ids = np.intersect1d(ids, posting, assume_unique=True)
+        if len(needle) <= MAX_GRAM:
+            return ids
+        candidates = pd.Series(self.uniques[ids], dtype=object).astype(str).str.lower()
+        return ids[candidates.str.contains(needle, regex=False).to_numpy()]
+
+    def rows(self, value_ids):
+        """Gather the rows holding any of value_ids, in row order."""
+        starts = self._value_offsets[value_ids]
+        lengths = self._value_offsets[value_ids + 1] - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return np.sort(self._value_rows[positions])
+
+
+class SearchIndex:
+    """Keyword search over one or more columns of a frame, built once per dataset load.
+
+    search() returns the sorted positions of rows where any lowercased column value contains
+    the lowercased keyword as a plain substring, the same test the pushdown query runs with
+    STRPOS(LOWER(...)). Regex metacharacters match themselves, and surrounding whitespace is
+    dropped as normalize_filters drops it.
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.columns = list(columns)
+        self.indexes = {column: NgramIndex(df[column]) for column in self.columns}
+
+    def search(self, keyword):
+        keyword = keyword.strip()
+        if not keyword:
+            return np.arange(len(self.df))
+        positions = [index.rows(index.matching_values(keyword).astype(np.intp)) for index in self.indexes.values()]
+        return np.unique(np.concatenate(positions)).astype(np.intp)
@@ -0,0 +1,87 @@
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Entry point -> the view its first render should show; None when the script has a single view.
+ENTRY_POINTS = {"articles.py": "News Articles", "papers.py": None, "a.py": None, "dashboard.py": None}
+# Modules only the YouTube view should pull in; a news-only start that loads any of them has regressed.
+HEAVY_MODULES = ["google.cloud.bigquery", "matplotlib.pyplot", "thumbnails", "media_app.youtube_view"]
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "loaded": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+_RENDER_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+app = AppTest.from_file({script!r}, default_timeout={timeout})
+if {view!r} is not None:
+    app.session_state["dataset"] = {view!r}
+app.run()
+seconds = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": seconds,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+    "exceptions": [str(exception.message) for exception in app.exception],
+}}))
+"""
+
+
+def _probe(code):
+    # A fresh interpreter per probe, so nothing is already imported or cached: this is a cold start.
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "probe failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_profile(module="media_app.app"):
+    """Seconds to import module in a fresh interpreter, and which HEAVY_MODULES that import loaded."""
+    return _probe(_IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES))
+
+
+def first_render(script, view=None, timeout=300):
+    """Seconds for a cold first run of an entry point (optionally on a given view) under Streamlit's AppTest."""
+    return _probe(_RENDER_PROBE.format(script=os.path.join(ROOT, script), view=view, timeout=timeout,
+                                       heavy=HEAVY_MODULES))
+
+
+def measure(scripts=tuple(ENTRY_POINTS), render=True):
+    report = {"python": sys.version.split()[0], "imports": {}, "first_render": {}}
+    for module in ["media_app.app", "media_app.news_view"]:
+        report["imports"][module] = import_profile(module)
+    if render and importlib.util.find_spec("streamlit") is not None:
+        for script in scripts:
+            report["first_render"][script] = first_render(script, ENTRY_POINTS.get(script))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import and first-render time of the dashboards.")
+    parser.add_argument("--scripts", nargs="+", default=list(ENTRY_POINTS), choices=list(ENTRY_POINTS))
+    parser.add_argument("--no-render", action="store_true", help="only time the imports")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = measure(args.scripts, not args.no_render)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    # The news view must start without the YouTube stack.
+    return 1 if report["imports"]["media_app.news_view"]["loaded"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
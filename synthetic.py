@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from bq_upload import NEWS_SCHEMA, YOUTUBE_DATA_SCHEMA
+
+# Category ids YouTube actually assigns, and the HuffPost categories of the news dataset.
+YOUTUBE_CATEGORIES = [10, 24, 22, 20, 17, 25, 23, 28, 26, 27, 1, 2, 15, 19, 29]
+NEWS_CATEGORIES = [
+    "POLITICS", "WELLNESS", "ENTERTAINMENT", "TRAVEL", "STYLE & BEAUTY", "PARENTING", "HEALTHY LIVING",
+    "QUEER VOICES", "FOOD & DRINK", "BUSINESS", "COMEDY", "SPORTS", "BLACK VOICES", "HOME & LIVING",
+    "PARENTS", "THE WORLDPOST", "WEDDINGS", "WOMEN", "CRIME", "IMPACT", "DIVORCE", "WORLD NEWS", "MEDIA",
+    "WEIRD NEWS", "GREEN", "WORLDPOST", "RELIGION", "STYLE", "SCIENCE", "TECH", "TASTE", "MONEY", "ARTS",
+    "ENVIRONMENT", "FIFTY", "GOOD NEWS", "U.S. NEWS", "ARTS & CULTURE", "COLLEGE", "LATINO VOICES",
+    "CULTURE & ARTS", "EDUCATION",
+]
+WORDS = [
+    "live", "official", "video", "song", "trailer", "news", "match", "highlights", "full", "episode",
+    "new", "best", "world", "music", "cup", "final", "review", "how", "why", "what", "the", "day",
+    "people", "says", "trump", "health", "year", "week", "could", "study", "women", "life", "star",
+    "family", "school", "city", "police", "love", "game", "team", "show", "first", "time", "home",
+]
+FIRST_NAMES = ["Anna", "Ben", "Carla", "David", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jamal", "Kate",
+               "Liam", "Maya", "Nikhil", "Olga", "Priya", "Quinn", "Rosa", "Sam", "Tara"]
+LAST_NAMES = ["Smith", "Kumar", "Garcia", "Chen", "Okafor", "Novak", "Rossi", "Haddad", "Kim", "Silva",
+              "Murphy", "Singh", "Ivanova", "Dubois", "Tanaka", "Reddy", "Lopez", "Berg", "Adams", "Shah"]
+
+
+def zipf_choice(rng, num_values, size, exponent=1.1):
+    """Indices into num_values options where option k is drawn with weight 1 / (k + 1) ** exponent."""
+    weights = 1.0 / np.arange(1, num_values + 1) ** exponent
+    return rng.choice(num_values, size=size, p=weights / weights.sum())
+
+
+def phrases(rng, count, min_words=3, max_words=10):
+    lengths = rng.integers(min_words, max_words + 1, count)
+    words = np.asarray(WORDS, dtype=object)[rng.integers(0, len(WORDS), lengths.sum())]
+    ends = np.cumsum(lengths)
+    return [" ".join(words[end - length:end]).capitalize() for end, length in zip(ends, lengths)]
+
+
+def numbered(prefix, num_rows, width=10):
+    """Unique ids such as v0000000042, built in Arrow so ten million of them stay cheap."""
+    digits = pc.utf8_lpad(pc.cast(pa.array(np.arange(num_rows)), pa.string()), width, "0")
+    return pd.Series(pd.arrays.ArrowStringArray(pc.binary_join_element_wise(prefix, digits, "")))
+
+
+def pooled(pool, indices):
+    """Pick rows from a pool of distinct strings, keeping the result as Arrow strings."""
+    return pd.Series(pd.arrays.ArrowStringArray(pa.array(pool, pa.string()).take(pa.array(indices))))
+
+
+def timestamps(rng, num_rows, start, days):
+    # Volume grows over time, as in the real feeds: later days get more rows.
+    offsets = np.sqrt(rng.random(num_rows)) * days * 86400
+    return pd.Series(pd.Timestamp(start) + pd.to_timedelta(offsets.astype(np.int64), unit="s"))
+
+
+def make_youtube(num_rows, seed=0, num_channels=2000):
+    """Synthetic rows with the 16 youtube_data columns, skewed like the real crawl."""
+    rng = np.random.default_rng(seed)
+    kinds = rng.choice(["TV", "Music", "Official", "Vlogs"], num_channels)
+    names = phrases(rng, num_channels, 1, 2)
+    channels = [f"{name} {kind} {i}" for i, (name, kind) in enumerate(zip(names, kinds))]
+    channel = zipf_choice(rng, num_channels, num_rows)
+    subscribers = rng.lognormal(12, 2, num_channels).astype(np.int64)
+    total_videos = rng.integers(50, 20000, num_channels)
+    title_pool = phrases(rng, min(num_rows, 200000), 3, 12)
+    tag_pool = [", ".join(tags.lower().split()) for tags in phrases(rng, 5000, 1, 6)]
+
+    views = rng.lognormal(9, 2.5, num_rows).astype(np.int64)
+    likes = (views * rng.beta(2, 60, num_rows)).astype(np.int64)
+    comments_disabled = rng.random(num_rows) < 0.03
+    video_ids = numbered("v", num_rows)
+    df = pd.DataFrame({
+        "video_id": video_ids,
+        "title": pooled(title_pool, rng.integers(0, len(title_pool), num_rows)),
+        "channel_title": pooled(channels, channel),
+        "category_id": np.asarray(YOUTUBE_CATEGORIES)[zipf_choice(rng, len(YOUTUBE_CATEGORIES), num_rows, 1.3)],
+        "publish_time": timestamps(rng, num_rows, "2021-01-01", 4 * 365),
+        "description": pooled(title_pool, rng.integers(0, len(title_pool), num_rows)),
+        "tags": pooled(tag_pool, zipf_choice(rng, len(tag_pool), num_rows, 0.8)),
+        "thumbnail_link": "https://i.ytimg.com/vi/" + video_ids + "/hqdefault.jpg",
+        "video_link": "https://www.youtube.com/watch?v=" + video_ids,
+        "views": views,
+        "likes": likes,
+        "comment_count": np.where(comments_disabled, 0, (likes * rng.beta(2, 30, num_rows)).astype(np.int64)),
+        "comments_disabled": comments_disabled,
+        "channel_name": pooled(channels, channel),
+        "subscribers_count": subscribers[channel],
+        "total_videos": total_videos[channel],
+    })
+    return df[[name for name, _ in YOUTUBE_DATA_SCHEMA]]
+
+
+def make_authors(rng, num_authors):
+    first = rng.integers(0, len(FIRST_NAMES), num_authors)
+    last = rng.integers(0, len(LAST_NAMES), num_authors)
+    return [f"{FIRST_NAMES[f]} {LAST_NAMES[l]} {i}" for i, (f, l) in enumerate(zip(first, last))]
+
+
+def make_news(num_rows, seed=0, num_authors=30000):
+    """Synthetic rows with the news columns, skewed like the HuffPost dataset.
+
+    Categories and authors are Zipf-distributed; about 9% of rows have no author and 5% are
+    co-authored ("A and B", "A, B and C").
+    """
+    rng = np.random.default_rng(seed)
+    names = make_authors(rng, num_authors)
+    author = zipf_choice(rng, num_authors, num_rows)
+    author_pool = names + [""]
+    for second, third in zip(rng.integers(0, num_authors, 2000), rng.integers(0, num_authors, 2000)):
+        author_pool.append(f"{names[second]} and {names[third]}")
+        author_pool.append(f"{names[second]}, {names[third]} and {names[(second + third) % num_authors]}")
+    kind = rng.random(num_rows)
+    author = np.where(kind < 0.09, num_authors, author)
+    coauthored = kind > 0.95
+    author[coauthored] = num_authors + 1 + rng.integers(0, len(author_pool) - num_authors - 1, coauthored.sum())
+
+    headline_pool = phrases(rng, min(num_rows, 200000), 5, 14)
+    summary_pool = phrases(rng, min(num_rows, 100000), 10, 30)
+    df = pd.DataFrame({
+        "category": pooled(NEWS_CATEGORIES, zipf_choice(rng, len(NEWS_CATEGORIES), num_rows, 1.0)),
+        "headline": pooled(headline_pool, rng.integers(0, len(headline_pool), num_rows)),
+        "authors": pooled(author_pool, author),
+        "link": "https://www.huffpost.com/entry/" + numbered("n", num_rows),
+        "short_description": pooled(summary_pool, rng.integers(0, len(summary_pool), num_rows)),
+        "date": timestamps(rng, num_rows, "2012-01-28", 10 * 365).dt.floor("D"),
+    })
+    return df[[name for name, _ in NEWS_SCHEMA]]
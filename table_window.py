@@ -0,0 +1,69 @@
+import pandas as pd
+
+PAGE_SIZE = 50
+MAX_CHARS = 80
+
+# Columns shown in the tables; the rest of the row is only sent when a row is expanded.
+YOUTUBE_TABLE_COLUMNS = ["title", "channel_title", "category_id", "publish_time", "views", "likes",
+                         "comment_count", "tags"]
+NEWS_TABLE_COLUMNS = ["date", "category", "headline", "authors", "short_description"]
+
+
+def num_pages(num_rows, page_size=PAGE_SIZE):
+    return max(-(-num_rows // page_size), 1)
+
+
+def page_bounds(num_rows, page, page_size=PAGE_SIZE):
+    """Clamp a 1-based page number and return the [start, end) offsets it covers."""
+    page = min(max(int(page), 1), num_pages(num_rows, page_size))
+    start = (page - 1) * page_size
+    return start, min(start + page_size, num_rows)
+
+
+def truncate(values, max_chars=MAX_CHARS):
+    """Cut strings longer than max_chars, marking the cut with an ellipsis."""
+    text = values.astype("string")
+    long = text.str.len() > max_chars
+    return text.where(~long, text.str.slice(0, max_chars - 1) + "…")
+
+
+def page_window(df, page, page_size=PAGE_SIZE, columns=None, max_chars=MAX_CHARS):
+    """Return only the rows of one page, restricted to the displayed columns.
+
+    The slice is taken before any column is touched, so the cost and the payload handed to
+    st.dataframe follow the page size rather than the size of the filtered result.
+    """
+    start, end = page_bounds(len(df), page, page_size)
+    columns = [column for column in (columns or df.columns) if column in df.columns]
+    window = df.iloc[start:end][columns].copy()
+    for column in columns:
+        if window[column].dtype == object or isinstance(window[column].dtype, pd.StringDtype):
+            window[column] = truncate(window[column], max_chars)
+    window.index = pd.RangeIndex(start + 1, end + 1, name="#")
+    return window
+
+
+def expand_row(df, page, offset, page_size=PAGE_SIZE):
+    """The full, untruncated row at a 0-based offset within a page."""
+    start, end = page_bounds(len(df), page, page_size)
+    return df.iloc[min(start + offset, end - 1)]
+
+
+def article_cards(df, show_link=True):
+    """Render a page of articles as one markdown block instead of a widget call per field."""
+    cards = []
+    for headline, authors, category, date, summary, link in zip(
+        df["headline"], df["authors"], df["category"], df["date"], df["short_description"],
+        df["link"] if show_link and "link" in df.columns else [None] * len(df),
+    ):
+        card = [
+            f"**Headline:** {headline}",
+            f"**Author(s):** {authors}",
+            f"**Category:** {category}",
+            f"**Published On:** {pd.Timestamp(date).date()}",
+            f"**Summary:** {summary}",
+        ]
+        if pd.notna(link):
+            card.append(f"[Read more]({link})")
+        cards.append("  \n".join(card))
+    return "\n\n---\n\n".join(cards)
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from authors import AuthorIndex, split_authors
+from synthetic import make_news
+
+BYLINES = pd.Series([
+    "Anna Smith, Ben Kumar and Carla Chen",
+    "anna  smith",
+    None,
+    "",
+    "By Ben Kumar & Dave Lee",
+    "Andrew Anderson and Anna Smith",
+], dtype="category")
+
+
+class TestAuthorIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = AuthorIndex(BYLINES)
+
+    def test_split_authors(self):
+        """Bylines split on commas, "and" and "&" without breaking names that contain "and" """
+        self.assertEqual(split_authors("A One, B Two, and C Three"), ["A One", "B Two", "C Three"])
+        self.assertEqual(split_authors("By Sandra Anderson"), ["Sandra Anderson"])
+        self.assertEqual(split_authors(None), [])
+        self.assertEqual(split_authors("  "), [])
+
+    def test_split_authors_keeps_roles_and_agencies_off(self):
+        """Roles, agencies and name suffixes after a comma are not credited as separate authors"""
+        self.assertEqual(split_authors("Sara Boboltz, Contributor"), ["Sara Boboltz"])
+        self.assertEqual(split_authors("Carla K. Johnson, AP"), ["Carla K. Johnson"])
+        self.assertEqual(split_authors("Ron Dicker, Senior Writer, HuffPost"), ["Ron Dicker"])
+        self.assertEqual(split_authors("Ann Lee, Reuters and Bo Park, Associated Press"), ["Ann Lee", "Bo Park"])
+        self.assertEqual(split_authors("Martin Luther King, Jr., and Ann Lee"), ["Martin Luther King Jr.", "Ann Lee"])
+        self.assertEqual(split_authors("Associated Press"), ["Associated Press"])
+        self.assertEqual(split_authors("Anna Smith, Ben Kumar and Carla Chen"),
+                         ["Anna Smith", "Ben Kumar", "Carla Chen"])
+
+    def test_coauthored_articles_count_for_each_author(self):
+        """Each author named in a byline is credited, with names matched case-insensitively"""
+        self.assertEqual(list(self.index.names), ["Anna Smith", "Ben Kumar", "Carla Chen", "Dave Lee",
+                                                  "Andrew Anderson"])
+        self.assertEqual(self.index.top(2).to_dict(), {"Anna Smith": 3, "Ben Kumar": 2})
+        self.assertEqual(self.index.rows("ANNA SMITH").tolist(), [0, 1, 5])
+        self.assertEqual(self.index.rows("Nobody").tolist(), [])
+        self.assertEqual(self.index.authors_of(4), ["Ben Kumar", "Dave Lee"])
+        self.assertEqual(self.index.authors_of(2), [])
+
+    def test_top_over_a_subset_of_rows(self):
+        """Ranking filtered rows counts only the authors credited on those rows"""
+        self.assertEqual(self.index.top(3, [0, 4]).to_dict(), {"Ben Kumar": 2, "Anna Smith": 1, "Carla Chen": 1})
+        self.assertTrue(self.index.top(3, []).empty)
+
+    def test_prefix_search(self):
+        """Prefix lookup matches any word of a name and ranks by article count"""
+        self.assertEqual(self.index.search("an"), ["Anna Smith", "Andrew Anderson"])
+        self.assertEqual(self.index.search("ku"), ["Ben Kumar"])
+        self.assertEqual(self.index.search("anna s"), ["Anna Smith"])
+        self.assertEqual(self.index.search("zz"), [])
+        self.assertEqual(self.index.search("", limit=2), ["Anna Smith", "Ben Kumar"])
+
+    def test_matches_exploded_value_counts(self):
+        """Counts equal value_counts over bylines exploded into individual authors"""
+        df = make_news(5000, seed=2, num_authors=400)
+        index = AuthorIndex(df["authors"])
+        exploded = df["authors"].str.replace(" and ", ", ").str.split(", ").explode()
+        # An author named twice in one byline is credited once.
+        exploded = exploded[exploded != ""].reset_index().drop_duplicates()
+        expected = exploded["authors"].value_counts()
+        self.assertEqual(dict(zip(index.names, index.counts)), expected.to_dict())
+        author = expected.index[0]
+        expected_rows = np.sort(exploded.loc[exploded["authors"] == author, "index"].to_numpy())
+        self.assertTrue(np.array_equal(index.rows(author), expected_rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from benchmarks import check_thresholds, main, run_benchmarks
+from bq_upload import NEWS_SCHEMA, YOUTUBE_DATA_SCHEMA
+from synthetic import make_news, make_youtube
+
+KINDS = {"STRING": "OSU", "INTEGER": "iu", "DATETIME": "M", "BOOLEAN": "b"}
+
+
+class TestSyntheticData(unittest.TestCase):
+
+    def assertMatchesSchema(self, df, schema):
+        self.assertEqual(list(df.columns), [name for name, _ in schema])
+        for name, kind in schema:
+            dtype = df[name].dtype
+            actual = "S" if pd.api.types.is_string_dtype(dtype) else dtype.kind
+            self.assertIn(actual, KINDS[kind], f"{name} should be {kind}, got {dtype}")
+
+    def test_youtube_matches_schema(self):
+        """Test that the YouTube generator produces the 16 youtube_data fields"""
+        df = make_youtube(5000)
+        self.assertMatchesSchema(df, YOUTUBE_DATA_SCHEMA)
+        self.assertTrue(df["video_id"].is_unique)
+        top_share = df["channel_title"].value_counts(normalize=True).iloc[0]
+        self.assertGreater(top_share, 0.05, "Channels should be skewed towards a few large ones")
+
+    def test_news_matches_schema(self):
+        """Test that the news generator produces the news columns with co-authored rows"""
+        df = make_news(5000)
+        self.assertMatchesSchema(df, NEWS_SCHEMA)
+        self.assertTrue(df["authors"].str.contains(" and ").any())
+        self.assertTrue((df["authors"] == "").any())
+
+    def test_generators_are_seeded(self):
+        """Test that the same seed yields the same rows"""
+        pd.testing.assert_frame_equal(make_news(1000, seed=3), make_news(1000, seed=3))
+        self.assertFalse(make_youtube(1000, seed=1)["views"].equals(make_youtube(1000, seed=2)["views"]))
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_report_covers_every_stage(self):
+        """Test that a small run times each dashboard stage for both datasets"""
+        report = run_benchmarks([3000], repeats=1)
+        stages = {(result["dataset"], result["stage"]) for result in report["results"]}
+        for stage in ["load", "filter_date", "search", "table_page"]:
+            self.assertIn(("youtube", stage), stages)
+            self.assertIn(("news", stage), stages)
+        self.assertIn(("youtube", "scatter_grid"), stages)
+        self.assertIn(("news", "per_day"), stages)
+        json.dumps(report)
+
+    def test_channel_rollup_beats_groupby(self):
+        """Test that top channels from the rollup are faster than value_counts on the filtered rows at 100k rows"""
+        report = run_benchmarks([100000], repeats=5, datasets=["youtube"])
+        best = {result["stage"]: result["best_s"] for result in report["results"]}
+        self.assertLess(best["top_channels"], best["top_channels_groupby"])
+
+    def test_thresholds_flag_regressions(self):
+        """Test that a stage slower than its threshold is reported"""
+        report = {"results": [{"dataset": "news", "stage": "search", "rows": 100, "ns_per_row": 50.0}]}
+        self.assertEqual(check_thresholds(report, {"news.search": 100}), [])
+        self.assertEqual(len(check_thresholds(report, {"news.search": 10})), 1)
+
+    def test_absolute_thresholds_do_not_scale_with_rows(self):
+        """Test that millisecond budgets hold at any scale, or at the scales they list"""
+        report = {"results": [{"dataset": "news", "stage": "author_search", "rows": 10000000,
+                               "best_s": 0.2, "ns_per_row": 20.0}]}
+        self.assertEqual(check_thresholds(report, {"news.author_search": 50}), [], "A per-row budget hides it")
+        self.assertEqual(len(check_thresholds(report, {"news.author_search": {"ms": 10}})), 1)
+        per_scale = {"news.author_search": {"ms": {"100000": 10, "10000000": 100}}}
+        self.assertEqual(len(check_thresholds(report, per_scale)), 1)
+        self.assertEqual(check_thresholds(report, {"news.author_search": {"ms": {"100000": 10}}}), [])
+
+    def test_main_writes_json_and_exit_code(self):
+        """Test that the command line writes the report and fails on a regression"""
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "report.json")
+            thresholds = os.path.join(tmp, "thresholds.json")
+            with open(thresholds, "w") as f:
+                json.dump({"news.load": 0}, f)
+            code = main(["--rows", "2000", "--repeats", "1", "--datasets", "news",
+                         "--output", output, "--thresholds", thresholds])
+            self.assertEqual(code, 1)
+            with open(output) as f:
+                self.assertEqual(json.load(f)["results"][0]["rows"], 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import re
+import tempfile
+import threading
+import unittest
+
+import pandas as pd
+from google.cloud import bigquery
+
+from bq_upload import DeltaUploader
+
+
+class FakeJob:
+    def result(self):
+        return self
+
+
+class FakeBigQueryClient:
+    """In-memory stand-in for bigquery.Client supporting the calls DeltaUploader makes"""
+
+    def __init__(self):
+        self.tables = {}
+        self.loads = 0
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def create_table(self, table, exists_ok=False):
+        table_id = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        if table_id in self.tables and not exists_ok:
+            raise ValueError(f"Already exists: {table_id}")
+        self.tables.setdefault(table_id, pd.DataFrame(columns=[field.name for field in table.schema]))
+
+    def get_table(self, table_id):
+        return bigquery.Table(table_id, schema=[bigquery.SchemaField(column, "STRING")
+                                                for column in self.tables[table_id].columns])
+
+    def update_table(self, table, fields):
+        table_id = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        for field in table.schema:
+            if field.name not in self.tables[table_id].columns:
+                self.tables[table_id][field.name] = None
+
+    def delete_table(self, table_id, not_found_ok=False):
+        self.tables.pop(table_id, None)
+
+    def load_table_from_file(self, f, table_id, job_config=None):
+        rows = pd.read_parquet(f)
+        with self._lock:
+            self.loads += 1
+            self.tables[table_id] = pd.concat([self.tables[table_id], rows], ignore_index=True)
+        return FakeJob()
+
+    def query(self, query, job_config=None):
+        self.queries.append(query)
+        target, staging = re.match(r"MERGE `([^`]+)` T USING `([^`]+)` S", query).groups()
+        keys = re.findall(r"T\.(\w+) = S\.", query.split(" WHEN ")[0])
+        unknown = set(re.findall(r"(\w+) = S\.", query)) - set(self.tables[target].columns)
+        if unknown:
+            raise ValueError(f"Unrecognized name: {sorted(unknown)[0]}")
+        merged = pd.concat([self.tables[target], self.tables[staging]], ignore_index=True)
+        self.tables[target] = merged.drop_duplicates(keys, keep="last").reset_index(drop=True)
+        return FakeJob()
+
+
+def make_news(links, headline="Headline"):
+    return pd.DataFrame({
+        "category": ["POLITICS"] * len(links),
+        "headline": [f"{headline} {link}" for link in links],
+        "authors": ["Author A"] * len(links),
+        "link": [f"https://example.com/{link}" for link in links],
+        "short_description": ["Desc"] * len(links),
+        "date": ["2022-09-23"] * len(links),
+    })
+
+
+class TestDeltaUploader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = FakeBigQueryClient()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_uploader(self):
+        return DeltaUploader(self.client, "news_sentiment_data", dataset_id="project.dataset",
+                             state_dir=self.tmp.name, chunk_rows=3)
+
+    def test_first_upload_sends_everything_in_chunks(self):
+        """Test that a first upload stages all rows in parallel chunks and merges them"""
+        sent = self.make_uploader().upload(make_news(range(10)))
+        self.assertEqual(sent, 10)
+        self.assertEqual(self.client.loads, 4)
+        self.assertEqual(len(self.client.tables["project.dataset.news_sentiment_data"]), 10)
+        self.assertEqual(list(self.client.tables), ["project.dataset.news_sentiment_data"], "Staging table not dropped")
+
+    def test_only_delta_is_uploaded(self):
+        """Test that unchanged rows are skipped and changed or new rows are merged"""
+        self.make_uploader().upload(make_news(range(10)))
+        df = pd.concat([make_news(range(9)), make_news([9], headline="Updated"), make_news([10, 11])])
+        sent = self.make_uploader().upload(df)
+        self.assertEqual(sent, 3)
+        target = self.client.tables["project.dataset.news_sentiment_data"]
+        self.assertEqual(len(target), 12)
+        self.assertIn("Updated 9", set(target["headline"]))
+
+    def test_unchanged_frame_is_a_no_op(self):
+        """Test that re-uploading the same frame issues no load or MERGE"""
+        self.make_uploader().upload(make_news(range(5)))
+        self.client.queries.clear()
+        self.assertEqual(self.make_uploader().upload(make_news(range(5))), 0)
+        self.assertEqual(self.client.queries, [])
+
+    def test_missing_target_columns_are_added_before_merge(self):
+        """Test that a table loaded without authors gains the column instead of failing the MERGE"""
+        self.client.tables["project.dataset.news_sentiment_data"] = (
+            make_news(range(3)).drop(columns="authors").assign(date=pd.Timestamp("2022-09-23")))
+        sent = self.make_uploader().upload(make_news(range(5)))
+        self.assertEqual(sent, 5)
+        target = self.client.tables["project.dataset.news_sentiment_data"]
+        self.assertIn("authors", target.columns)
+        self.assertEqual(len(target), 5)
+
+    def test_merge_uses_schema_columns(self):
+        """Test that the MERGE keys on (link, date) and inserts every schema column"""
+        self.make_uploader().upload(make_news(range(2)))
+        query = self.client.queries[0]
+        self.assertIn("ON T.link = S.link AND T.date = S.date", query)
+        self.assertIn("INSERT (category, headline, authors, link, short_description, date)", query)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from charts import density_grid, draw_density_grid, lttb
+
+
+def make_videos(num_rows=50000, seed=0):
+    rng = np.random.default_rng(seed)
+    views = rng.lognormal(8, 2, num_rows).astype(np.int64)
+    return pd.DataFrame({
+        "views": views,
+        "likes": (views * rng.uniform(0, 0.1, num_rows)).astype(np.int64),
+        "category_id": rng.choice([10, 17, 24], num_rows, p=[0.6, 0.3, 0.1]),
+    })
+
+
+class TestDensityGrid(unittest.TestCase):
+
+    def test_grid_counts_every_row(self):
+        """Test that the binned grid accounts for every row in a fixed number of cells"""
+        df = make_videos()
+        grid = density_grid(df, bins=32)
+        self.assertEqual(grid.counts.shape, (32, 32), "Grid size should not depend on the row count")
+        self.assertEqual(grid.counts.sum(), len(df), "Every row should fall in one cell")
+        self.assertEqual(grid.categories, ["10", "17", "24"])
+
+    def test_dominant_category_per_cell(self):
+        """Test that each cell keeps its most common category"""
+        df = pd.DataFrame({
+            "views": [10, 10, 10, 100000, 100000],
+            "likes": [1, 1, 1, 5000, 5000],
+            "category_id": [17, 17, 10, 24, 24],
+        })
+        grid = density_grid(df, bins=8)
+        occupied = grid.dominant[grid.counts > 0]
+        self.assertEqual(sorted(grid.categories[code] for code in occupied), ["17", "24"])
+
+    def test_draws_without_raw_points(self):
+        """Test that the grid renders as a single image artist"""
+        fig, ax = plt.subplots()
+        draw_density_grid(ax, density_grid(make_videos(5000)))
+        self.assertEqual(len(ax.images), 1)
+        self.assertEqual(len(ax.collections), 0)
+        plt.close(fig)
+
+
+class TestLTTB(unittest.TestCase):
+
+    def test_downsamples_and_keeps_extremes(self):
+        """Test that LTTB bounds the point count while keeping endpoints and the peak"""
+        dates = pd.date_range("2015-01-01", periods=3000, freq="D")
+        values = np.sin(np.arange(3000) / 50.0) * 10 + 20
+        values[1234] = 500
+        series = pd.Series(values, index=[day.date() for day in dates])
+        sampled = lttb(series, 200)
+        self.assertEqual(len(sampled), 200)
+        self.assertEqual(sampled.index[0], series.index[0])
+        self.assertEqual(sampled.index[-1], series.index[-1])
+        self.assertEqual(sampled.max(), 500, "The spike should survive downsampling")
+        self.assertTrue(sampled.index.is_monotonic_increasing)
+
+    def test_short_series_unchanged(self):
+        """Test that series below the limit are returned as is"""
+        series = pd.Series([1, 2, 3])
+        self.assertIs(lttb(series, 10), series)
+
+
+if __name__ == '__main__':
+    unittest.main()
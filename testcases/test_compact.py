@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from compact import NEWS_LAYOUT, YOUTUBE_LAYOUT, compact_frame, memory_footprint
+from filter_engine import FilterEngine
+from rollups import RollupCube
+from search_index import SearchIndex
+
+
+def make_videos(num_rows=100000, seed=0):
+    rng = np.random.default_rng(seed)
+    channels = [f"Channel {i}" for i in range(40)]
+    return pd.DataFrame({
+        "video_id": [f"vid{i:08d}" for i in range(num_rows)],
+        "title": [f"Video title number {i}" for i in range(num_rows)],
+        "channel_title": pd.Series(rng.choice(channels, num_rows), dtype=object),
+        "category_id": pd.Series(rng.choice([1, 10, 17, 24], num_rows), dtype="Int64"),
+        "publish_time": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24, num_rows), unit="h"),
+        "views": rng.integers(0, 5_000_000, num_rows),
+        "likes": rng.integers(0, 50_000, num_rows),
+        "comment_count": rng.integers(0, 2_000, num_rows),
+        "tags": pd.Series(rng.choice(["music, live", "sports", "news, daily"], num_rows), dtype=object),
+    })
+
+
+def make_news(num_rows=100000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "category": pd.Series(rng.choice(["POLITICS", "SPORTS", "WELLNESS", "BUSINESS"], num_rows), dtype=object),
+        "headline": pd.Series([f"Headline {i}" for i in range(num_rows)], dtype=object),
+        "authors": pd.Series(rng.choice([f"Author {i}" for i in range(300)] + [None], num_rows), dtype=object),
+        "short_description": pd.Series(["A short description of the story."] * num_rows, dtype=object),
+        "date": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1000, num_rows), unit="D"),
+    })
+
+
+class TestCompactFrame(unittest.TestCase):
+
+    def test_footprint_shrinks(self):
+        """Test that compact encoding reports a several-fold smaller footprint"""
+        for name, df, layout in [("youtube", make_videos(), YOUTUBE_LAYOUT), ("news", make_news(), NEWS_LAYOUT)]:
+            before = memory_footprint(df)
+            after = memory_footprint(compact_frame(df, **layout))
+            print(f"\n{name}: {before / 2**20:.1f} MiB -> {after / 2**20:.1f} MiB ({before / after:.1f}x)")
+            self.assertLess(after * 2, before, f"{name} footprint should at least halve")
+
+    def test_dtypes(self):
+        """Test that labels, counters and text get their compact dtypes"""
+        df = compact_frame(make_videos(1000), **YOUTUBE_LAYOUT)
+        self.assertIsInstance(df["channel_title"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["category_id"].dtype, "UInt8")
+        self.assertEqual(df["comment_count"].dtype, np.uint16)
+        self.assertEqual(df["views"].dtype, np.uint32)
+        self.assertEqual(df["title"].dtype, "string[pyarrow]")
+
+    def test_indexes_unchanged_on_compact_frame(self):
+        """Test that filter, rollup and search results are the same on the compact frame"""
+        df = make_news(20000)
+        compacted = compact_frame(df, **NEWS_LAYOUT)
+        equals = {"category": "SPORTS", "authors": "Author 7"}
+        expected = FilterEngine(df, "date", ["category", "authors"]).query("2020-03-01", "2021-06-01", equals)
+        actual = FilterEngine(compacted, "date", ["category", "authors"]).query("2020-03-01", "2021-06-01", equals)
+        np.testing.assert_array_equal(actual, expected)
+        self.assertEqual(RollupCube(compacted, "date", ["authors"]).top("authors", 5).to_dict(),
+                         RollupCube(df, "date", ["authors"]).top("authors", 5).to_dict())
+        np.testing.assert_array_equal(SearchIndex(compacted, ["headline"]).search("line 12"),
+                                      SearchIndex(df, ["headline"]).search("line 12"))
+
+
+if __name__ == '__main__':
+    unittest.main()
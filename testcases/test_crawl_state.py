@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import timedelta
+
+from crawl_state import CrawlState, utcnow
+from test_youtube_ingest import StubYouTubeAPI, make_channels
+from youtube_ingest import TokenBucket, YouTubeIngestor
+
+
+class TestDeltaCrawl(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = CrawlState(os.path.join(self.tmp.name, "crawl_state.db"))
+        self.api = StubYouTubeAPI(make_channels())
+        self.base_url = await self.api.start()
+
+    async def asyncTearDown(self):
+        await self.api.stop()
+        self.state.close()
+        self.tmp.cleanup()
+
+    async def crawl(self):
+        ingestor = YouTubeIngestor(api_key="test", base_url=self.base_url,
+                                   limiter=TokenBucket(rate=1e6, capacity=1e6), state=self.state)
+        return await ingestor.crawl({"One": "UC_one"})
+
+    async def test_repeat_crawl_stops_at_known_ids(self):
+        """Test that an unchanged channel costs one search page and no video batches"""
+        await self.crawl()
+        self.api.calls.update(search=0, videos=0)
+        df = await self.crawl()
+        self.assertEqual(self.api.calls["search"], 1)
+        self.assertEqual(self.api.calls["videos"], 0)
+        self.assertEqual(len(df), 7)
+
+    async def test_only_new_videos_fetched(self):
+        """Test that newly published videos are discovered and merged with stored ones"""
+        await self.crawl()
+        self.api.channels["UC_one"] = ["new0", "new1"] + self.api.channels["UC_one"]
+        self.api.calls.update(search=0, videos=0)
+        df = await self.crawl()
+        self.assertEqual(self.api.calls["videos"], 1)
+        self.assertEqual(len(df), 9)
+        self.assertIn("new0", set(df["video_id"]))
+        self.assertIsNotNone(self.state.last_seen("UC_one"))
+
+    async def test_due_batches_use_conditional_requests(self):
+        """Test that refreshing an unchanged batch is answered by 304 and keeps stored records"""
+        await self.crawl()
+        stale = utcnow() - timedelta(days=365)
+        # The first refresh of a stored batch saves its ETag; the next one sends it.
+        self.state.touch(list(self.state.known_ids("UC_one")), now=stale)
+        await self.crawl()
+        self.assertEqual(self.api.calls["not_modified"], 0)
+        self.state.touch(list(self.state.known_ids("UC_one")), now=stale)
+        df = await self.crawl()
+        self.assertEqual(self.api.calls["not_modified"], 1)
+        self.assertEqual(len(df), 7)
+        self.assertEqual(self.state.due_for_refresh("UC_one"), [])
+
+    async def test_new_uploads_do_not_break_stored_etags(self):
+        """Test that a new upload is fetched on its own while the due stored batch still gets a 304"""
+        await self.crawl()
+        stale = utcnow() - timedelta(days=365)
+        self.state.touch(list(self.state.known_ids("UC_one")), now=stale)
+        await self.crawl()
+        self.state.touch(list(self.state.known_ids("UC_one")), now=stale)
+        self.api.channels["UC_one"] = ["new0"] + self.api.channels["UC_one"]
+        self.api.calls.update(videos=0)
+        df = await self.crawl()
+        self.assertEqual(self.api.calls["videos"], 2)
+        self.assertEqual(self.api.calls["not_modified"], 1)
+        self.assertEqual(len(df), 8)
+
+    async def test_resumes_from_checkpoint(self):
+        """Test that an interrupted discovery pass continues from its saved page token"""
+        self.state.save_checkpoint("UC_one", "3", ["one0", "one1", "one2"])
+        df = await self.crawl()
+        self.assertEqual(self.api.search_tokens, ["3", "6"])
+        self.assertEqual(len(df), 7)
+        self.assertIsNone(self.state.checkpoint("UC_one"))
+
+
+class TestRefreshSchedule(unittest.TestCase):
+
+    def test_recent_videos_refresh_more_often(self):
+        """Test that the tiered schedule refreshes new videos before old ones"""
+        with tempfile.TemporaryDirectory() as tmp:
+            state = CrawlState(os.path.join(tmp, "crawl_state.db"))
+            now = utcnow()
+            state.record_videos("UC_one", [
+                {"video_id": "recent", "publish_time": (now - timedelta(days=2)).isoformat()},
+                {"video_id": "old", "publish_time": (now - timedelta(days=400)).isoformat()},
+            ], now=now - timedelta(days=1))
+            self.assertEqual(state.due_for_refresh("UC_one", now=now), ["recent"])
+            self.assertEqual(state.due_for_refresh("UC_one", now=now + timedelta(days=40)), ["old", "recent"])
+            state.close()
+
+
+class TestRefreshBatches(unittest.TestCase):
+
+    def test_batches_are_stable_and_stale_etags_pruned(self):
+        """Test that newer videos only extend the last batch and ETags of vanished batches are dropped"""
+        with tempfile.TemporaryDirectory() as tmp:
+            state = CrawlState(os.path.join(tmp, "crawl_state.db"))
+            now = utcnow()
+
+            def record(ids, days_ago):
+                publish_time = (now - timedelta(days=days_ago)).isoformat()
+                state.record_videos("UC_one", [{"video_id": video_id, "publish_time": publish_time}
+                                               for video_id in ids])
+
+            record([f"v{i}" for i in range(5)], 10)
+            before = state.refresh_batches("UC_one", size=2)
+            for batch in before:
+                state.save_etag("UC_one", batch, f"etag-{batch[0]}")
+            state.save_etag("UC_two", ["w0"], "other channel")
+            record(["new"], 1)
+            after = state.refresh_batches("UC_one", size=2)
+            self.assertEqual(after[:2], before[:2])
+            self.assertEqual(after[2], before[2] + ["new"])
+            state.prune_etags("UC_one", after)
+            self.assertEqual([state.etag(batch) for batch in after], ["etag-v0", "etag-v2", None])
+            self.assertEqual(state.etag(["w0"]), "other channel")
+            state.close()
+
+    def test_old_etag_table_is_replaced(self):
+        """Test that a state file from before per-channel ETags opens with an empty etags table"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "crawl_state.db")
+            conn = sqlite3.connect(path)
+            conn.executescript("CREATE TABLE etags (batch_key TEXT PRIMARY KEY, etag TEXT NOT NULL);"
+                               "INSERT INTO etags VALUES ('k', 'e');")
+            conn.close()
+            state = CrawlState(path)
+            state.save_etag("UC_one", ["v0"], "fresh")
+            self.assertEqual(state.etag(["v0"]), "fresh")
+            state.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from dedup import (
+    FNV_OFFSET, FNV_PRIME, NO_SHINGLES, NearDuplicateIndex, cluster_ids, collapse, combine_text, minhash_signatures, normalize,
+    shingle_hashes, similarity,
+)
+
+HEADLINES = [
+    "Senate passes sweeping climate bill after marathon overnight session",
+    "Senate passes sweeping climate bill after a marathon overnight session!",
+    "Local bakery wins national award for its sourdough bread recipe",
+    "Ok",
+    "",
+    "LOCAL BAKERY wins national award for its sourdough-bread recipe",
+    "Stock markets tumble as investors weigh new interest rate hikes",
+]
+# Different stories from one channel, all carrying the channel's boilerplate tags.
+TAGS = "sakshi tv, telugu news, latest news"
+NON_LATIN_TITLES = [
+    "హైదరాబాద్‌లో భారీ వర్షం, రోడ్లన్నీ జలమయం",
+    "ఎన్నికల ఫలితాలపై ముఖ్యమంత్రి కీలక వ్యాఖ్యలు",
+    "दिल्ली में प्रदूषण का स्तर फिर बढ़ा, स्कूल बंद",
+    "హైదరాబాద్‌లో భారీ వర్షం, రోడ్లన్నీ జలమయం!",
+]
+
+
+def fnv1a(text):
+    value = int(FNV_OFFSET)
+    for char in text:
+        value = ((value ^ ord(char)) * int(FNV_PRIME)) % 2 ** 64
+    return value
+
+
+def jaccard(a, b, size=5):
+    shingles = [{text[i:i + size] for i in range(len(text) - size + 1)} for text in normalize([a, b])]
+    return len(shingles[0] & shingles[1]) / len(shingles[0] | shingles[1])
+
+
+class TestDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "minhash.arrow")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_shingles_are_hashed_character_windows(self):
+        """Each document yields one hashed 5-character window per position, in document order"""
+        hashes, counts = shingle_hashes(["abcdef", "xy", "Hello!", "Ünïcödé"])
+        self.assertEqual(counts.tolist(), [2, 0, 1, 3])
+        self.assertEqual(int(hashes[0]), fnv1a("abcde"))
+        self.assertEqual(int(hashes[2]), fnv1a("hello"))
+        self.assertEqual(int(hashes[3]), fnv1a("ünïcö"))
+
+    def test_non_latin_text_is_kept(self):
+        """Telugu and Hindi letters and vowel signs survive normalization"""
+        self.assertEqual(normalize(["తెలుగు, వార్తలు!", "हिंदी_समाचार"]).tolist(), ["తెలుగు వార్తలు", "हिंदी समाचार"])
+
+    def test_non_latin_titles_with_shared_tags_stay_apart(self):
+        """Different Telugu/Hindi stories are not merged just because their ASCII tags match"""
+        texts = [f"{title} {TAGS}" for title in NON_LATIN_TITLES]
+        clusters = NearDuplicateIndex().add([f"k{i}" for i in range(len(texts))], texts)
+        self.assertEqual(clusters.tolist(), [0, 1, 2, 0])
+
+    def test_signature_similarity_estimates_jaccard(self):
+        """Agreement between MinHash signatures tracks the true shingle Jaccard similarity"""
+        pairs = [(HEADLINES[0], HEADLINES[1]), (HEADLINES[0], HEADLINES[6]), (HEADLINES[2], HEADLINES[5])]
+        for a, b in pairs:
+            signatures = minhash_signatures([a, b])
+            estimate = similarity(signatures[:1], signatures[1:])[0]
+            self.assertAlmostEqual(estimate, jaccard(a, b), delta=0.15, msg=f"{a!r} vs {b!r}")
+        self.assertTrue((minhash_signatures(["Ok"]) == NO_SHINGLES).all())
+
+    def test_near_duplicates_share_a_cluster(self):
+        """Edited re-publications join the earliest copy's cluster; short or empty texts stay alone"""
+        clusters = NearDuplicateIndex().add([f"k{i}" for i in range(len(HEADLINES))], HEADLINES)
+        self.assertEqual(clusters.tolist(), [0, 0, 2, 3, 4, 2, 6])
+
+    def test_incremental_batches_check_against_history(self):
+        """A saved index recognises duplicates of old documents without signing them again"""
+        self.assertEqual(cluster_ids(["a", "b"], HEADLINES[:3:2], self.path).tolist(), [0, 1])
+        index = NearDuplicateIndex.load(self.path)
+        self.assertEqual(len(index), 2)
+        clusters = index.add(["c", "a", "d"], [HEADLINES[5], "ignored: key already indexed", HEADLINES[6]])
+        self.assertEqual(clusters.tolist(), [1, 0, 3])
+        self.assertEqual(len(index), 4, "A known key was signed again!")
+
+    def test_settings_change_starts_over(self):
+        """An index saved with other settings is not reused"""
+        cluster_ids(["a"], HEADLINES[:1], self.path)
+        self.assertEqual(len(NearDuplicateIndex.load(self.path, threshold=0.9)), 0)
+
+    def test_save_new_appends_segments(self):
+        """Only documents added since the last save are written, and loading reads them back in order"""
+        cluster_ids(["a", "b"], HEADLINES[:3:2], self.path)
+        size = os.path.getsize(self.path)
+        index = NearDuplicateIndex.load(self.path)
+        index.add(["c"], HEADLINES[5:6])
+        index.save_new(self.path)
+        index.add(["d", "e"], HEADLINES[1:2] + HEADLINES[6:7])
+        index.save_new(self.path)
+        self.assertEqual(os.path.getsize(self.path), size, "The saved index was rewritten!")
+        self.assertTrue(os.path.exists(self.path + ".2") and os.path.exists(self.path + ".3"))
+        loaded = NearDuplicateIndex.load(self.path)
+        self.assertEqual(loaded.keys, ["a", "b", "c", "d", "e"])
+        self.assertEqual(loaded.clusters.tolist(), [0, 1, 1, 0, 4])
+        self.assertEqual(loaded.add(["f"], HEADLINES[1:2]).tolist(), [0])
+
+        loaded.save(self.path)
+        self.assertFalse(os.path.exists(self.path + ".2"), "A full save leaves stale segments behind")
+        self.assertEqual(NearDuplicateIndex.load(self.path).keys, ["a", "b", "c", "d", "e", "f"])
+
+    def test_batched_matches_single_pass_on_exact_copies(self):
+        """Copies are clustered with their original whether they arrive in the same batch or a later one"""
+        rng = np.random.default_rng(0)
+        words = np.array("the a of news video live match final season world cup team city".split())
+        texts = [" ".join(rng.choice(words, 12)) + f" story {i}" for i in range(300)]
+        copies = rng.choice(300, 50, replace=False)
+        all_texts = texts + [texts[i] for i in copies]
+        keys = [f"k{i}" for i in range(len(all_texts))]
+        clusters = NearDuplicateIndex().add(keys, all_texts, batch_size=64)
+        self.assertTrue((clusters[300:] == clusters[copies]).all(), "A copy missed its original!")
+
+    def test_collapse_keeps_first_row_per_cluster(self):
+        """collapse() drops later members of a cluster and ignores frames without cluster ids"""
+        df = pd.DataFrame({"headline": HEADLINES, "short_description": ["x"] * len(HEADLINES)})
+        df["cluster_id"] = NearDuplicateIndex().add(df.index, combine_text(df, ["headline", "short_description"]))
+        self.assertEqual(collapse(df).index.tolist(), [0, 2, 3, 4, 6])
+        self.assertEqual(len(collapse(df.drop(columns="cluster_id"))), len(df))
+
+
+if __name__ == "__main__":
+    unittest.main()
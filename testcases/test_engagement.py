@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from compact import YOUTUBE_LAYOUT, compact_frame
+from engagement import (
+    LEADERBOARD_METRICS, EngagementAnalytics, engagement_rate, group_sums, summarize_groups, top_k, top_videos,
+)
+from synthetic import make_youtube
+
+
+def full_sort_top(df, metric, k=10):
+    ranked = df.assign(engagement_rate=engagement_rate(df["likes"], df["views"]))
+    return list(ranked.sort_values(metric, ascending=False, kind="stable").head(k)["video_id"])
+
+
+class TestEngagement(unittest.TestCase):
+
+    def setUp(self):
+        self.df = compact_frame(make_youtube(20000, seed=3, num_channels=300), **YOUTUBE_LAYOUT)
+
+    def test_engagement_rate_handles_zero_and_missing_views(self):
+        """Zero or missing views give a rate of 0 instead of inf or NaN"""
+        rate = engagement_rate(pd.Series([5, 2, 3, None]), pd.Series([0, 4, None, 10], dtype="Int64"))
+        self.assertEqual(rate.tolist(), [0.0, 0.5, 0.0, 0.0])
+
+    def test_top_k_matches_stable_sort_with_ties(self):
+        """Partial selection returns the same positions as a stable descending sort, NaN last"""
+        values = np.array([3, 7, 7, np.nan, 1, 7, 5, 3])
+        self.assertEqual(top_k(values, 4).tolist(), [1, 2, 5, 6])
+        self.assertEqual(top_k(values, 20).tolist(), [1, 2, 5, 6, 0, 7, 4, 3])
+        self.assertEqual(top_k(values, 0).tolist(), [])
+
+    def test_top_videos_match_full_sort(self):
+        """top_videos picks the same videos as sort_values(...).head(10) for every metric"""
+        for metric in LEADERBOARD_METRICS:
+            self.assertEqual(list(top_videos(self.df, metric)["video_id"]), full_sort_top(self.df, metric), metric)
+
+    def test_leaderboards_update_incrementally(self):
+        """Folding rows in batch by batch gives the leaderboards of the whole frame"""
+        analytics = EngagementAnalytics()
+        for start in range(0, len(self.df), 3000):
+            analytics.update(self.df.iloc[start:start + 3000])
+        category = self.df["category_id"].iloc[0]
+        in_category = self.df[self.df["category_id"] == category]
+        for metric in LEADERBOARD_METRICS:
+            self.assertEqual(list(analytics.leaderboard(metric)["video_id"]), full_sort_top(self.df, metric))
+            self.assertEqual(list(analytics.leaderboard(metric, str(category))["video_id"]),
+                             full_sort_top(in_category, metric), f"Category board for {metric} is wrong!")
+
+    def test_running_sums_match_groupby(self):
+        """Running per-category sums give the notebook's groupby mean of likes"""
+        analytics = EngagementAnalytics(self.df.iloc[:7000]).update(self.df.iloc[7000:])
+        expected = self.df.groupby("category_id")["likes"].mean()
+        actual = analytics.categories()["avg_likes"]
+        self.assertTrue(np.allclose(actual.sort_index().to_numpy(), expected.sort_index().to_numpy()))
+        self.assertEqual(int(analytics.categories()["videos"].sum()), len(self.df))
+        channels = summarize_groups(group_sums(self.df), "channel_title")
+        self.assertTrue(np.allclose(analytics.channels()["likes"].sort_index(), channels["likes"].sort_index()))
+
+    def test_extended_only_folds_in_appended_rows(self):
+        """extended() advances a copy when rows were appended and leaves the original untouched"""
+        head = EngagementAnalytics(self.df.iloc[:15000])
+        before = list(head.leaderboard("likes")["video_id"])
+        advanced = head.extended(self.df)
+        self.assertEqual(advanced.rows, len(self.df))
+        self.assertEqual(list(advanced.leaderboard("likes")["video_id"]), full_sort_top(self.df, "likes"))
+        self.assertEqual(list(head.leaderboard("likes")["video_id"]), before, "The served analytics changed!")
+        rebuilt = head.extended(self.df.iloc[::-1])
+        self.assertEqual(list(rebuilt.leaderboard("likes")["video_id"]), full_sort_top(self.df.iloc[::-1], "likes"))
+
+
+if __name__ == "__main__":
+    unittest.main()
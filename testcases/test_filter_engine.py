@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from filter_engine import FilterEngine
+
+
+def make_videos(num_rows=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    times = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24, num_rows), unit="h")
+    times = pd.Series(times)
+    times[rng.random(num_rows) < 0.02] = pd.NaT
+    return pd.DataFrame({
+        "category_id": rng.choice([1, 10, 22, 24], num_rows),
+        "channel_title": rng.choice(["Channel 1", "Channel 2", "Channel 3", None], num_rows),
+        "publish_time": times,
+    })
+
+
+def mask_chain(df, start, end, category, channel):
+    """Reference implementation: the boolean mask chain, with the end date counted in full"""
+    end = pd.Timestamp(end) + pd.Timedelta(days=1)
+    filtered = df[(df['publish_time'] >= pd.Timestamp(start)) & (df['publish_time'] < end)]
+    if category != "All":
+        filtered = filtered[filtered['category_id'].astype(str) == category]
+    if channel != "All":
+        filtered = filtered[filtered['channel_title'] == channel]
+    return filtered
+
+
+class TestFilterEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.df = make_videos()
+        self.engine = FilterEngine(self.df, "publish_time", ["category_id", "channel_title"])
+
+    def test_matches_mask_chain(self):
+        """Test that engine queries return the same rows as the mask chain"""
+        for start, end in [("2023-01-01", "2023-12-31"), ("2023-03-05", "2023-03-20"), ("2024-01-01", "2024-02-01")]:
+            for category in ["All", "10", "99"]:
+                for channel in ["All", "Channel 2"]:
+                    expected = mask_chain(self.df, start, end, category, channel)
+                    actual = self.engine.filter(start, end, {"category_id": category, "channel_title": channel})
+                    pd.testing.assert_frame_equal(actual, expected)
+
+    def test_keyword_rows_restrict_result(self):
+        """Test that precomputed keyword matches are intersected with the other filters"""
+        rows = np.arange(0, len(self.df), 7)
+        expected = mask_chain(self.df, "2023-01-01", "2023-12-31", "22", "All")
+        expected = expected[expected.index.isin(rows)]
+        actual = self.engine.filter("2023-01-01", "2023-12-31", {"category_id": "22"}, rows)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_end_date_includes_whole_day(self):
+        """Test that rows later on the end date are kept and the next midnight is not"""
+        df = pd.DataFrame({
+            "publish_time": pd.to_datetime(["2023-05-02 00:00", "2023-05-02 23:59", "2023-05-03 00:00"]),
+            "channel_title": ["Channel 1", "Channel 1", "Channel 1"],
+        })
+        engine = FilterEngine(df, "publish_time", ["channel_title"])
+        self.assertEqual(list(engine.query("2023-05-01", "2023-05-02")), [0, 1])
+        self.assertEqual(list(engine.query("2023-05-01", "2023-05-02", {"channel_title": "Channel 1"})), [0, 1])
+
+    def test_values_are_strings_without_nulls(self):
+        """Test that selectbox options come back as strings and skip missing values"""
+        self.assertEqual(sorted(self.engine.values("category_id")), ["1", "10", "22", "24"])
+        self.assertNotIn("None", self.engine.values("channel_title"))
+
+    def test_time_bounds_skip_missing_dates(self):
+        """Test that the date range defaults ignore NaT rows"""
+        start, end = self.engine.time_bounds()
+        self.assertEqual(start, self.df['publish_time'].min())
+        self.assertEqual(end, self.df['publish_time'].max())
+
+
+if __name__ == '__main__':
+    unittest.main()
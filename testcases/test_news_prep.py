@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from news_prep import prepare_news_dataset, read_news_dataset
+
+
+def write_news_json(path, num_rows=250):
+    with open(path, "w") as f:
+        for i in range(num_rows):
+            f.write(json.dumps({
+                "link": f"https://example.com/{i}",
+                "headline": None if i % 50 == 0 else f"Headline {i}",
+                "category": ["POLITICS", "SPORTS"][i % 2],
+                "short_description": "Desc",
+                "authors": "Author A",
+                "date": (pd.Timestamp("2022-01-15") + pd.Timedelta(days=i)).strftime("%Y-%m-%d"),
+            }) + "\n")
+
+
+class TestNewsPrep(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp.name, "News_Category_Dataset_v3.json")
+        self.dataset_path = os.path.join(self.tmp.name, "news_dataset")
+        write_news_json(self.json_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunked_conversion_matches_in_memory_cleaning(self):
+        """Test that streaming in small chunks gives the same rows as the notebook's in-memory prep"""
+        prepare_news_dataset(self.json_path, self.dataset_path, chunk_size=17)
+        df = read_news_dataset(self.dataset_path)
+        expected = pd.read_json(self.json_path, lines=True).dropna()
+        self.assertEqual(len(df), len(expected))
+        self.assertEqual(list(df.columns), ["category", "headline", "authors", "link", "short_description", "date"])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["date"]))
+
+    def test_optional_csv_output(self):
+        """Test that the cleaned rows can also be streamed to the CSV the dashboards read"""
+        csv_path = os.path.join(self.tmp.name, "news_category_cleaned.csv")
+        total = prepare_news_dataset(self.json_path, self.dataset_path, chunk_size=40, csv_path=csv_path)
+        self.assertEqual(len(pd.read_csv(csv_path)), total)
+
+    def test_dedup_adds_cluster_ids(self):
+        """Test that dedup_path tags near-duplicate articles and only signs new links on a rerun"""
+        dedup_path = os.path.join(self.tmp.name, "minhash.arrow")
+        with open(self.json_path, "a") as f:
+            for i, headline in enumerate(["Senate passes sweeping climate bill after marathon session",
+                                          "Senate passes sweeping climate bill after a marathon session!",
+                                          "Local bakery wins national award for its sourdough recipe"]):
+                f.write(json.dumps({
+                    "link": f"https://example.com/extra-{i}", "headline": headline, "category": "POLITICS",
+                    "short_description": "Desc", "authors": "Author B", "date": "2022-02-01",
+                }) + "\n")
+        csv_path = os.path.join(self.tmp.name, "news_category_cleaned.csv")
+        prepare_news_dataset(self.json_path, self.dataset_path, chunk_size=40, csv_path=csv_path,
+                             dedup_path=dedup_path)
+        df = read_news_dataset(self.dataset_path)
+        self.assertIn("cluster_id", df.columns)
+        self.assertIn("cluster_id", pd.read_csv(csv_path).columns)
+        clusters = df.set_index("link")["cluster_id"]
+        self.assertEqual(clusters["https://example.com/extra-1"], clusters["https://example.com/extra-0"])
+        self.assertNotEqual(clusters["https://example.com/extra-2"], clusters["https://example.com/extra-0"])
+
+        prepare_news_dataset(self.json_path, self.dataset_path, chunk_size=40, dedup_path=dedup_path)
+        rerun = read_news_dataset(self.dataset_path).set_index("link")["cluster_id"]
+        self.assertTrue((rerun.sort_index() == clusters.sort_index()).all(), "Cluster ids changed on rerun!")
+
+    def test_partitioned_by_year_and_month(self):
+        """Test that the dataset is laid out as year=/month= directories"""
+        prepare_news_dataset(self.json_path, self.dataset_path, chunk_size=100)
+        self.assertTrue(os.path.isdir(os.path.join(self.dataset_path, "year=2022", "month=1")))
+        self.assertTrue(os.path.isdir(os.path.join(self.dataset_path, "year=2022", "month=9")))
+
+    def test_date_window_query(self):
+        """Test that date-range reads return only rows inside the window"""
+        prepare_news_dataset(self.json_path, self.dataset_path, chunk_size=100)
+        df = read_news_dataset(self.dataset_path, "2022-03-10", "2022-04-05")
+        self.assertEqual(df["date"].min(), pd.Timestamp("2022-03-10"))
+        self.assertEqual(df["date"].max(), pd.Timestamp("2022-04-05"))
+        self.assertEqual(len(df), 27)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+from news_snapshot import build_news_snapshot, load_news_snapshot, read_snapshot_metadata
+
+
+class TestNewsSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "news_category_cleaned.csv")
+        self.snapshot_path = os.path.join(self.tmp.name, "news_category.arrow")
+        self.write_csv(["Politics", "Sports"])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_csv(self, categories):
+        pd.DataFrame({
+            "category": categories,
+            "headline": [f"Headline {i}" for i in range(len(categories))],
+            "authors": ["Author A"] * len(categories),
+            "link": ["https://example.com"] * len(categories),
+            "short_description": ["Desc"] * len(categories),
+            "date": ["2023-05-01"] * len(categories),
+        }).to_csv(self.csv_path, index=False)
+
+    def test_snapshot_is_typed(self):
+        """Test that the snapshot stores parsed dates and categorical categories"""
+        df = load_news_snapshot(self.csv_path, self.snapshot_path)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["date"]), "Date column was not parsed")
+        self.assertIsInstance(df["category"].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(df.columns), ["category", "headline", "authors", "link", "short_description", "date"])
+
+    def test_layout_recorded_in_metadata(self):
+        """Test that the 6-column layout is stored with the snapshot"""
+        build_news_snapshot(self.csv_path, self.snapshot_path)
+        metadata = read_snapshot_metadata(self.snapshot_path)
+        self.assertEqual(len(metadata["columns"]), 6)
+
+    def test_snapshot_rebuilt_when_csv_changes(self):
+        """Test that a modified CSV invalidates the snapshot"""
+        load_news_snapshot(self.csv_path, self.snapshot_path)
+        time.sleep(0.01)
+        self.write_csv(["Politics", "Sports", "Business"])
+        df = load_news_snapshot(self.csv_path, self.snapshot_path)
+        self.assertEqual(len(df), 3)
+
+    def test_unchanged_csv_reuses_snapshot(self):
+        """Test that a touched but identical CSV is restamped with its new mtime, so it is hashed only once"""
+        load_news_snapshot(self.csv_path, self.snapshot_path)
+        digest = read_snapshot_metadata(self.snapshot_path)["source_sha256"]
+        os.utime(self.csv_path, (time.time() + 10, time.time() + 10))
+        load_news_snapshot(self.csv_path, self.snapshot_path)
+        metadata = read_snapshot_metadata(self.snapshot_path)
+        self.assertEqual(metadata["source_mtime"], os.stat(self.csv_path).st_mtime)
+        self.assertEqual(metadata["source_sha256"], digest)
+        restamped_at = os.stat(self.snapshot_path).st_mtime_ns
+        self.assertEqual(len(load_news_snapshot(self.csv_path, self.snapshot_path)), 2)
+        self.assertEqual(os.stat(self.snapshot_path).st_mtime_ns, restamped_at)
+
+    def test_unexpected_layout_rejected(self):
+        """Test that an unknown column count raises a clear error"""
+        pd.DataFrame({"a": [1], "b": [2]}).to_csv(self.csv_path, index=False)
+        with self.assertRaises(ValueError):
+            load_news_snapshot(self.csv_path, self.snapshot_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import io
+import json
+import logging
+import time
+import unittest
+
+import pandas as pd
+
+from perf import PERF_PREFIX, count_cache, record_query_job, stage_breakdown, start_trace, summarize
+from pushdown import QueryResultCache, YouTubeFilters, YouTubePushdown
+
+
+class FakeJob:
+    total_bytes_processed = 1024
+    total_bytes_billed = 10485760
+    cache_hit = False
+
+    def to_dataframe(self):
+        return pd.DataFrame({"title": ["Video A"], "publish_time": [pd.Timestamp("2023-05-01")]})
+
+
+class FakeClient:
+    def query(self, query, job_config=None):
+        return FakeJob()
+
+
+class TestRerunTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = logging.StreamHandler(self.stream)
+        self.handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        logging.getLogger().addHandler(self.handler)
+        logging.getLogger().setLevel(logging.INFO)
+
+    def tearDown(self):
+        logging.getLogger().removeHandler(self.handler)
+
+    def test_rerun_record_is_json_with_stages(self):
+        """Test that a rerun is logged as one JSON record with spans, volumes and filters"""
+        trace = start_trace("News Articles")
+        trace.set_filters(category="Politics", keyword="")
+        with trace.span("filter", rows_in=1000) as span:
+            time.sleep(0.01)
+            span["rows_out"] = 10
+        history = []
+        trace.finish(history)
+
+        line = self.stream.getvalue().strip().splitlines()[-1]
+        record = json.loads(line.split(PERF_PREFIX, 1)[1])
+        self.assertEqual(record["view"], "News Articles")
+        self.assertEqual(record["filters"]["category"], "Politics")
+        self.assertEqual(record["stages"][0]["rows_in"], 1000)
+        self.assertEqual(record["stages"][0]["rows_out"], 10)
+        self.assertGreaterEqual(record["stages"][0]["ms"], 10)
+        self.assertEqual(history, [record])
+
+    def test_bigquery_stats_and_cache_land_on_active_trace(self):
+        """Test that pushdown job stats and cache hits are attached to the current rerun"""
+        pushdown = YouTubePushdown(FakeClient(), cache=QueryResultCache())
+        filters = YouTubeFilters("All", "All", "2023-01-01", "2023-12-31", "")
+        trace = start_trace("YouTube Analytics")
+        pushdown.fetch(filters, ["preview"])
+        pushdown.fetch(filters, ["preview"])
+        record = trace.finish()
+        self.assertEqual(record["bigquery"][0]["bytes_processed"], 1024)
+        self.assertFalse(record["bigquery"][0]["cache_hit"])
+        self.assertEqual(record["cache"]["pushdown"], {"hits": 1, "misses": 1})
+
+    def test_stats_without_trace_are_logged_alone(self):
+        """Test that jobs run outside a rerun, e.g. background refreshes, still get logged"""
+        record_query_job(FakeJob(), "youtube_delta")
+        count_cache("pushdown", True)
+        self.assertIn('"event": "bigquery"', self.stream.getvalue())
+
+
+class TestSummarize(unittest.TestCase):
+
+    def test_percentiles_per_stage(self):
+        """Test that the offline summary reports p50/p95 per view and stage"""
+        lines = ["2024-01-01 10:00:00,000 - INFO - Streamlit Dashboard Started"]
+        for i in range(1, 101):
+            record = {"event": "rerun", "rerun_id": str(i), "view": "News Articles", "total_ms": i * 2,
+                      "stages": [{"stage": "filter", "ms": i}], "bigquery": [], "cache": {}}
+            lines.append(f"2024-01-01 10:00:00,000 - INFO - {PERF_PREFIX}{json.dumps(record)}")
+        summary = summarize(lines).set_index("stage")
+        self.assertEqual(summary.loc["filter", "count"], 100)
+        self.assertAlmostEqual(summary.loc["filter", "p50_ms"], 50.5)
+        self.assertAlmostEqual(summary.loc["filter", "p95_ms"], 95.05)
+        self.assertAlmostEqual(summary.loc["total", "max_ms"], 200)
+
+    def test_stage_breakdown(self):
+        """Test that the panel table has one row per rerun and one column per stage"""
+        records = [{"rerun_id": "a", "total_ms": 5.0, "stages": [{"stage": "filter", "ms": 2.0},
+                                                                  {"stage": "render_table", "ms": 3.0}]}]
+        table = stage_breakdown(records)
+        self.assertEqual(table.loc["a", "render_table"], 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import time
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from pushdown import (QueryResultCache, YouTubeFilters, YouTubePushdown, columns_for, compile_youtube_query,
+                      normalize_filters)
+
+
+class FakeQueryJob:
+    def __init__(self, df):
+        self.df = df
+
+    def to_dataframe(self):
+        return self.df.copy()
+
+
+class FakeBigQueryClient:
+    """Records every query and answers it with a canned frame"""
+
+    def __init__(self, df):
+        self.df = df
+        self.queries = []
+
+    def query(self, query, job_config=None):
+        params = {p.name: p.value for p in job_config.query_parameters} if job_config else {}
+        self.queries.append((query, params))
+        return FakeQueryJob(self.df)
+
+
+def make_result():
+    return pd.DataFrame({
+        "title": ["Video A"],
+        "channel_title": ["Channel 1"],
+        "category_id": [1],
+        "publish_time": [pd.Timestamp("2023-05-01")],
+        "views": [1000],
+        "likes": [100],
+        "comment_count": [10],
+        "thumbnail_link": ["link1"],
+    })
+
+
+class TestPushdown(unittest.TestCase):
+
+    def test_compile_query_is_parameterized(self):
+        """Test that filter values become query parameters, not SQL text"""
+        filters = YouTubeFilters("1", "Channel 1", "2023-01-01", "2023-12-31", " Election ")
+        query, params = compile_youtube_query(normalize_filters(filters, columns_for(["scatter"])))
+        self.assertTrue(query.startswith("SELECT category_id, views, likes, comment_count FROM"))
+        self.assertNotIn("Channel 1", query, "Filter values must not be inlined into the SQL")
+        self.assertEqual(dict((name, value) for name, _, value in params)["keyword"], "election")
+
+    def test_end_date_includes_whole_day(self):
+        """Test that the end bound is exclusive at the midnight after the end date"""
+        filters = YouTubeFilters("All", "All", "2023-01-01", "2023-12-31", "")
+        query, params = compile_youtube_query(normalize_filters(filters, columns_for(["channels"])))
+        self.assertIn("publish_time < @end_time", query)
+        self.assertEqual(dict((name, value) for name, _, value in params)["end_time"], datetime(2024, 1, 1))
+
+    def test_all_selections_are_not_filtered(self):
+        """Test that "All" and empty keyword produce no WHERE clause"""
+        filters = YouTubeFilters("All", "All", None, None, "")
+        query, params = compile_youtube_query(normalize_filters(filters, columns_for(["channels"])))
+        self.assertNotIn("WHERE", query)
+        self.assertEqual(params, [])
+
+    def test_equivalent_filters_share_cache_key(self):
+        """Test that case and whitespace differences normalize to the same key"""
+        columns = columns_for(["table"])
+        first = normalize_filters(YouTubeFilters("All", "All", "2023-01-01", "2023-12-31", "Goal"), columns)
+        second = normalize_filters(YouTubeFilters(None, "All", pd.Timestamp("2023-01-01"),
+                                                  pd.Timestamp("2023-12-31"), " goal "), columns)
+        self.assertEqual(first, second)
+
+    def test_repeated_filters_served_from_cache(self):
+        """Test that the second identical request does not hit BigQuery"""
+        client = FakeBigQueryClient(make_result())
+        pushdown = YouTubePushdown(client)
+        filters = YouTubeFilters("All", "Channel 1", "2023-01-01", "2023-12-31", "")
+        pushdown.fetch(filters)
+        df = pushdown.fetch(filters)
+        self.assertEqual(len(client.queries), 1)
+        self.assertEqual(pushdown.cache.hits, 1)
+        self.assertEqual(len(df), 1)
+
+    def test_cached_results_expire(self):
+        """Test that a cached filter state is queried again once its entry is older than the ttl"""
+        client = FakeBigQueryClient(make_result())
+        pushdown = YouTubePushdown(client, cache=QueryResultCache(ttl=0.05))
+        filters = YouTubeFilters("All", "Channel 1", "2023-01-01", "2023-12-31", "")
+        pushdown.fetch(filters)
+        pushdown.fetch(filters)
+        time.sleep(0.06)
+        pushdown.fetch(filters)
+        self.assertEqual(len(client.queries), 2)
+        self.assertEqual(pushdown.cache.current_bytes, int(make_result().memory_usage(deep=True).sum()))
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache stays within its memory budget"""
+        df = make_result()
+        size = int(df.memory_usage(deep=True).sum())
+        cache = QueryResultCache(max_bytes=size * 2)
+        cache.put("a", df)
+        cache.put("b", df)
+        cache.get("a")
+        cache.put("c", df)
+        self.assertIsNone(cache.get("b"), "Least recently used entry was not evicted")
+        self.assertIsNotNone(cache.get("a"))
+        self.assertLessEqual(cache.current_bytes, cache.max_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import threading
+import time
+import unittest
+
+import pandas as pd
+
+from refresher import BackgroundRefresher
+
+
+class FlakySource:
+    """Stand-in for BigQuery that can be slowed down or made to fail"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def load(self):
+        self.calls += 1
+        self.release.wait()
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("BigQuery unavailable")
+        return pd.DataFrame({"views": range(self.calls)})
+
+
+def derive(df):
+    return {"total": int(df["views"].sum())}
+
+
+class TestBackgroundRefresher(unittest.TestCase):
+
+    def test_serves_initial_snapshot_without_waiting(self):
+        """Test that a local snapshot is served at once while the reload runs in the background"""
+        source = FlakySource()
+        source.release.clear()
+        refresher = BackgroundRefresher(source.load, ttl=600, derive=derive,
+                                        initial=lambda: pd.DataFrame({"views": [5, 5]}))
+        started = time.perf_counter()
+        snapshot = refresher.get()
+        self.assertLess(time.perf_counter() - started, 0.5, "get() should not wait on the reload")
+        self.assertEqual(snapshot.derived["total"], 10)
+        source.release.set()
+        fresh = refresher.refresh().result()
+        self.assertEqual(len(fresh.data), 1)
+        self.assertEqual(fresh.derived["total"], 0, "Derived indexes should be swapped with the data")
+        refresher.close()
+
+    def test_concurrent_reloads_coalesce(self):
+        """Test that reloads requested while one is running share it"""
+        source = FlakySource(delay=0.2)
+        refresher = BackgroundRefresher(source.load, ttl=600, derive=derive)
+        refresher.get()
+        futures = [refresher.refresh() for _ in range(10)]
+        self.assertTrue(all(future is futures[0] for future in futures))
+        futures[0].result()
+        self.assertEqual(source.calls, 2)
+        refresher.close()
+
+    def test_failure_keeps_last_good_snapshot(self):
+        """Test that a failed reload keeps serving the previous data"""
+        source = FlakySource()
+        refresher = BackgroundRefresher(source.load, ttl=0, derive=derive)
+        good = refresher.get()
+        source.fail = True
+        refresher.refresh().result()
+        self.assertIs(refresher.get().data, good.data)
+        self.assertIsInstance(refresher.last_error, RuntimeError)
+        refresher.close()
+
+    def test_failed_reload_is_not_retried_on_every_read(self):
+        """Test that reads after a failed reload wait for the retry interval, backing off per failure"""
+        source = FlakySource()
+        source.fail = True
+        refresher = BackgroundRefresher(source.load, ttl=600, derive=derive, retry=0.2,
+                                        initial=lambda: pd.DataFrame({"views": [1]}))
+        refresher.get()
+        refresher.refresh().result()
+        for _ in range(50):
+            refresher.get()
+            time.sleep(0.002)
+        self.assertEqual(source.calls, 1, "Every read past the ttl retried the failed load!")
+        time.sleep(0.2)
+        refresher.get()
+        refresher.refresh().result()
+        self.assertEqual(source.calls, 2)
+        self.assertEqual(refresher.failures, 2)
+        time.sleep(0.2)
+        refresher.get()
+        self.assertEqual(source.calls, 2, "The second retry should wait twice as long")
+        source.fail = False
+        time.sleep(0.25)
+        refresher.get()
+        refresher.refresh().result()
+        self.assertEqual(refresher.failures, 0)
+        self.assertIsNone(refresher.last_error)
+        refresher.close()
+
+    def test_failed_first_load_waits_for_retry(self):
+        """Test that reads with nothing to serve do not reload on every call after a failed first load"""
+        source = FlakySource()
+        source.fail = True
+        refresher = BackgroundRefresher(source.load, ttl=600, derive=derive, retry=0.2)
+        self.assertIsNone(refresher.get())
+        self.assertIsInstance(refresher.last_error, RuntimeError)
+        for _ in range(50):
+            self.assertIsNone(refresher.get())
+        self.assertEqual(source.calls, 1, "Every read retried the failed first load!")
+        source.fail = False
+        time.sleep(0.25)
+        self.assertEqual(refresher.get().derived["total"], 1)
+        self.assertEqual(source.calls, 2)
+        self.assertIsNone(refresher.last_error)
+        refresher.close()
+
+    def test_expired_snapshot_triggers_background_reload(self):
+        """Test that reads past the ttl start a reload but still return immediately"""
+        source = FlakySource(delay=0.3)
+        refresher = BackgroundRefresher(source.load, ttl=0.05, derive=derive)
+        first = refresher.get()
+        time.sleep(0.1)
+        started = time.perf_counter()
+        self.assertIs(refresher.get(), first)
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertGreater(refresher.refresh().result().version, first.version)
+        refresher.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
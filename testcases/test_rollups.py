@@ -0,0 +1,109 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from rollups import RollupCube
+
+
+def make_news(num_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.Series(pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 120, num_rows), unit="D"))
+    dates[rng.random(num_rows) < 0.01] = pd.NaT
+    return pd.DataFrame({
+        "category": rng.choice(["Politics", "Sports", "Business"], num_rows),
+        "authors": rng.choice(["Author A", "Author B", "Author C", "Author D", None], num_rows,
+                              p=[0.4, 0.3, 0.15, 0.1, 0.05]),
+        "date": dates,
+    })
+
+
+def filter_news(df, start, end, category):
+    filtered = df[(df['date'] >= pd.Timestamp(start)) & (df['date'] < pd.Timestamp(end) + pd.Timedelta(days=1))]
+    if category != "All":
+        filtered = filtered[filtered['category'] == category]
+    return filtered
+
+
+class TestRollupCube(unittest.TestCase):
+
+    def setUp(self):
+        self.df = make_news()
+        self.cube = RollupCube(self.df, "date", ["category", "authors"])
+
+    def test_per_day_matches_groupby(self):
+        """Test that per-day counts equal groupby(date.dt.date).size() on the filtered frame"""
+        for category in ["All", "Sports"]:
+            filtered = filter_news(self.df, "2022-02-01", "2022-03-15", category)
+            expected = filtered.groupby(filtered['date'].dt.date).size()
+            actual = self.cube.per_day("2022-02-01", "2022-03-15", {"category": category})
+            self.assertEqual(actual.to_dict(), expected.to_dict())
+
+    def test_top_matches_value_counts(self):
+        """Test that top authors equal value_counts() on the filtered frame"""
+        filtered = filter_news(self.df, "2022-01-01", "2022-04-30", "Politics")
+        expected = filtered['authors'].value_counts().head(3)
+        actual = self.cube.top("authors", 3, "2022-01-01", "2022-04-30", {"category": "Politics"})
+        self.assertEqual(actual.to_dict(), expected.to_dict())
+
+    def test_end_date_counts_whole_day(self):
+        """Test that every timestamp on the end date counts, as in FilterEngine"""
+        df = pd.DataFrame({
+            "publish_time": pd.to_datetime(["2023-05-01 10:00", "2023-05-02 00:00", "2023-05-02 08:00",
+                                            "2023-05-03 00:00"]),
+            "channel_title": ["Channel 1", "Channel 1", "Channel 2", "Channel 2"],
+        })
+        cube = RollupCube(df, "publish_time", ["channel_title"])
+        self.assertEqual(cube.top("channel_title", 10, "2023-05-01", "2023-05-02").to_dict(),
+                         {"Channel 1": 2, "Channel 2": 1})
+
+    def test_totals_match_value_counts_over_full_range(self):
+        """Test that top() over a totals column equals value_counts() when the range covers every row"""
+        cube = RollupCube(self.df, "date", ["category"], totals=["authors"])
+        dated = self.df[self.df['date'].notna()]
+        first, last = dated['date'].min(), dated['date'].max()
+        for equals in [{}, {"category": "Sports"}, {"category": "All", "authors": "Author B"}]:
+            expected = dated
+            for column, value in equals.items():
+                expected = expected if value == "All" else expected[expected[column] == value]
+            self.assertEqual(cube.top("authors", 10, first, last, equals).to_dict(),
+                             expected['authors'].value_counts().to_dict())
+        self.assertEqual(cube.top("authors", 10, None, None, {"category": "Unknown"}).to_dict(), {})
+
+    def test_totals_refuse_partial_ranges(self):
+        """Test that a date range cutting into the data is not answered from the totals"""
+        cube = RollupCube(self.df, "date", ["category"], totals=["authors"])
+        self.assertTrue(cube.covers("2022-01-01", "2022-04-30"))
+        self.assertFalse(cube.covers("2022-02-01", "2022-04-30"))
+        with self.assertRaises(ValueError):
+            cube.top("authors", 10, "2022-02-01", "2022-04-30")
+        self.assertEqual(cube.per_day("2022-02-01", "2022-03-15").to_dict(),
+                         self.cube.per_day("2022-02-01", "2022-03-15").to_dict())
+
+    def test_update_adds_new_rows(self):
+        """Test that incremental updates match a cube rebuilt from scratch"""
+        first, second = self.df.iloc[:1500], self.df.iloc[1500:]
+        cube = RollupCube(first, "date", ["category", "authors"])
+        cube.update(second)
+        self.assertEqual(cube.per_day().to_dict(), self.cube.per_day().to_dict())
+        self.assertEqual(cube.top("authors", 4).to_dict(), self.cube.top("authors", 4).to_dict())
+        totals = RollupCube(first, "date", ["category"], totals=["authors"]).update(second)
+        self.assertEqual(totals.top("authors", 4, equals={"category": "Sports"}).to_dict(),
+                         self.cube.top("authors", 4, equals={"category": "Sports"}).to_dict())
+
+    def test_extended_folds_in_appended_rows_only(self):
+        """Test that extended() leaves the old cube intact and rebuilds when the prefix changed"""
+        df = self.df.assign(row_id=range(len(self.df)))
+        old = RollupCube(df.iloc[:1500], "date", ["category"], key="row_id")
+        old_cells = old.cells
+        new = old.extended(df)
+        self.assertIs(old.cells, old_cells, "The cube readers hold was modified")
+        self.assertEqual(new.rows, len(df))
+        self.assertEqual(new.per_day().to_dict(), RollupCube(df, "date", ["category"]).per_day().to_dict())
+        rebuilt = old.extended(df.iloc[::-1])
+        self.assertEqual(rebuilt.per_day().to_dict(), new.per_day().to_dict())
+        self.assertEqual(rebuilt.last_key, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
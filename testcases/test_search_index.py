@@ -0,0 +1,85 @@
+import random
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from search_index import NgramIndex, SearchIndex
+
+
+def make_videos(num_rows=500, seed=0):
+    rng = random.Random(seed)
+    words = ["Goal", "goal!", "Election", "ÉTÉ", "match", "Final", "news", "a", "ab", "Cricket", "IPL", "t-series"]
+    return pd.DataFrame({
+        "title": [" ".join(rng.choice(words) for _ in range(rng.randint(0, 6))) for _ in range(num_rows)],
+        "tags": [None if rng.random() < 0.1 else ", ".join(rng.choice(words) for _ in range(3))
+                 for _ in range(num_rows)],
+    })
+
+
+def scan(df, keyword):
+    """Reference implementation: the literal, lowercased substring test the pushdown query runs"""
+    needle = keyword.strip().lower()
+    mask = (df['title'].str.lower().str.contains(needle, regex=False, na=False) |
+            df['tags'].str.lower().str.contains(needle, regex=False, na=False))
+    return np.flatnonzero(mask.to_numpy())
+
+
+class TwoColumnNgramIndex(NgramIndex):
+    """Sorts postings on (gram, value id) columns, as an index too large for packed keys does"""
+    PACKED_KEY_LIMIT = 0
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.df = make_videos()
+        self.index = SearchIndex(self.df, ["title", "tags"])
+
+    def test_matches_case_insensitive_substring_scan(self):
+        """Test that index lookups return exactly the rows str.contains would"""
+        for keyword in ["go", "GOAL", "oal!", "ion", "a", "é", "ÉtÉ", "t-s", "Final match", "zzz", "日本"]:
+            np.testing.assert_array_equal(self.index.search(keyword), scan(self.df, keyword),
+                                          err_msg=f"Mismatch for keyword {keyword!r}")
+
+    def test_matches_across_tag_separators(self):
+        """Test that substrings spanning comma-joined tags still match"""
+        np.testing.assert_array_equal(self.index.search("l, m"), scan(self.df, "l, m"))
+
+    def test_regex_metacharacters_match_literally(self):
+        """Test that keywords with regex metacharacters are plain substrings, as in the pushdown query"""
+        for keyword in ["goal!", "goal.", "(ab)", "^final", " Goal "]:
+            np.testing.assert_array_equal(self.index.search(keyword), scan(self.df, keyword))
+        self.assertEqual(len(self.index.search("goal.")), 0)
+
+    def test_short_needles_match_literal_contains(self):
+        """Test that every needle of up to three characters returns the rows str.contains(regex=False) does"""
+        needles = {"!", "-", ", ", "é", "日"}
+        for word in ["Goal", "goal!", "ÉTÉ", "Final", "t-series", "IPL"]:
+            needles.update(word[i:i + n] for n in range(1, 4) for i in range(len(word) - n + 1))
+        titles = NgramIndex(self.df["title"])
+        two_column = TwoColumnNgramIndex(self.df["title"])
+        for needle in sorted(needles):
+            expected = np.flatnonzero(self.df["title"].str.contains(needle, case=False, regex=False).to_numpy())
+            for index in (titles, two_column):
+                np.testing.assert_array_equal(index.rows(index.matching_values(needle).astype(np.intp)), expected,
+                                              err_msg=f"Mismatch for needle {needle!r}")
+
+    def test_two_column_postings_match_packed_keys(self):
+        """Test that indexes past the packed key bound answer longer keywords like packed ones"""
+        packed, two_column = NgramIndex(self.df["tags"]), TwoColumnNgramIndex(self.df["tags"])
+        for keyword in ["goal", "final match", "l, m", "zzz"]:
+            np.testing.assert_array_equal(two_column.matching_values(keyword), packed.matching_values(keyword))
+
+    def test_empty_keyword_matches_everything(self):
+        """Test that an empty search box keeps every row"""
+        self.assertEqual(len(self.index.search("")), len(self.df))
+
+    def test_empty_and_null_columns(self):
+        """Test that frames without any text return no matches"""
+        df = pd.DataFrame({"headline": [None, None]})
+        self.assertEqual(len(SearchIndex(df, ["headline"]).search("abc")), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
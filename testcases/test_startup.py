@@ -0,0 +1,35 @@
+import importlib.util
+import unittest
+
+from startup import HEAVY_MODULES, import_profile
+
+HAS_STREAMLIT = importlib.util.find_spec("streamlit") is not None
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_import_profile_measures_a_cold_import(self):
+        """A fresh interpreter times the import and reports which heavy modules it loaded"""
+        profile = import_profile("table_window")
+        self.assertGreater(profile["seconds"], 0, "Import time was not measured!")
+        self.assertEqual(profile["loaded"], [], "table_window should not load the YouTube stack!")
+
+    def test_import_profile_reports_heavy_modules(self):
+        """Importing the thumbnail client is reported as loading it"""
+        self.assertIn("thumbnails", HEAVY_MODULES)
+        self.assertIn("thumbnails", import_profile("thumbnails")["loaded"], "Heavy import went unreported!")
+
+    def test_import_profile_raises_on_failed_import(self):
+        """A probe that cannot import its module raises instead of reporting a time"""
+        with self.assertRaises(RuntimeError):
+            import_profile("no_such_module_here")
+
+    @unittest.skipUnless(HAS_STREAMLIT, "streamlit is not installed")
+    def test_app_core_imports_lazily(self):
+        """Importing the app core and the news view loads neither BigQuery, matplotlib nor the YouTube view"""
+        for module in ["media_app.app", "media_app.news_view"]:
+            self.assertEqual(import_profile(module)["loaded"], [], f"{module} imported the YouTube stack!")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+import pandas as pd
+
+from table_window import article_cards, expand_row, num_pages, page_window
+
+
+def make_news(num_rows=250):
+    return pd.DataFrame({
+        "category": ["Politics", "Sports"] * (num_rows // 2),
+        "headline": [f"Headline {i}" for i in range(num_rows)],
+        "authors": ["Author A", "Author B"] * (num_rows // 2),
+        "link": [f"https://example.com/{i}" for i in range(num_rows)],
+        "short_description": ["word " * 100] * num_rows,
+        "date": pd.date_range("2023-01-01", periods=num_rows, freq="h"),
+    })
+
+
+class TestTableWindow(unittest.TestCase):
+
+    def test_page_holds_only_displayed_rows_and_columns(self):
+        """Test that a page slices rows and columns before sending them"""
+        df = make_news()
+        window = page_window(df, 3, 100, ["date", "headline", "short_description"])
+        self.assertEqual(num_pages(len(df), 100), 3)
+        self.assertEqual(len(window), 50, "Last page should hold the remainder")
+        self.assertEqual(list(window.columns), ["date", "headline", "short_description"])
+        self.assertEqual(window["headline"].iloc[0], "Headline 200")
+        self.assertEqual(window.index[0], 201, "Rows should be numbered by their position in the result")
+
+    def test_long_text_truncated_until_expanded(self):
+        """Test that long text is cut in the table but complete in the expanded row"""
+        df = make_news()
+        window = page_window(df, 1, 10, max_chars=40)
+        self.assertEqual(len(window["short_description"].iloc[0]), 40)
+        self.assertTrue(window["short_description"].iloc[0].endswith("…"))
+        self.assertEqual(expand_row(df, 1, 0, 10)["short_description"], "word " * 100)
+
+    def test_out_of_range_page_is_clamped(self):
+        """Test that a stale page number falls back to the last page"""
+        window = page_window(make_news(30), 9, 10)
+        self.assertEqual(window["headline"].iloc[-1], "Headline 29")
+
+    def test_article_cards_single_block(self):
+        """Test that a page of articles renders as one markdown string"""
+        df = make_news(4)
+        df.loc[1, "link"] = None
+        cards = article_cards(df)
+        self.assertEqual(cards.count("**Headline:**"), 4)
+        self.assertEqual(cards.count("[Read more]"), 3)
+        self.assertIn("**Published On:** 2023-01-01", cards)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+from thumbnails import ThumbnailCache
+
+
+def make_jpeg(width=480, height=360):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(out, format="JPEG")
+    return out.getvalue()
+
+
+class StubThumbnailHost:
+    """Local stand-in for the thumbnail host that counts requests per path"""
+
+    def __init__(self, delay=0.0):
+        self.requests = {}
+        image = make_jpeg()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests[self.path] = stub.requests.get(self.path, 0) + 1
+                time.sleep(delay)
+                if self.path.startswith("/missing"):
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(image)))
+                self.end_headers()
+                self.wfile.write(image)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def url(self, video_id):
+        return f"{self.base_url}/vi/{video_id}/hqdefault.jpg"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestThumbnailCache(unittest.TestCase):
+
+    def setUp(self):
+        self.host = StubThumbnailHost()
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.host.stop()
+        self.tmp.cleanup()
+
+    def test_get_downscales_and_serves_from_disk(self):
+        """Test that a thumbnail is fetched once, downscaled and then served locally"""
+        cache = ThumbnailCache(self.tmp.name, width=160)
+        first = cache.get("vid1", self.host.url("vid1"))
+        second = cache.get("vid1", self.host.url("vid1"))
+        cache.close()
+        self.assertEqual(first, second)
+        self.assertEqual(Image.open(io.BytesIO(first)).size, (160, 120))
+        self.assertEqual(sum(self.host.requests.values()), 1, "Cached thumbnails should not be refetched")
+
+    def test_prefetch_runs_in_background(self):
+        """Test that prefetched thumbnails are on disk without blocking the caller"""
+        cache = ThumbnailCache(self.tmp.name)
+        cache.prefetch([(f"vid{i}", self.host.url(f"vid{i}")) for i in range(10)])
+        cache.prefetch([(f"vid{i}", self.host.url(f"vid{i}")) for i in range(10)])
+        cache.close()
+        self.assertEqual(len(self.host.requests), 10)
+        self.assertTrue(all(count == 1 for count in self.host.requests.values()),
+                        "Duplicate prefetches should share a download")
+        self.assertTrue(os.path.exists(cache.path("vid9")))
+
+    def test_lru_eviction_bounds_disk_use(self):
+        """Test that least recently used thumbnails are evicted once the cache is over budget"""
+        probe = ThumbnailCache(self.tmp.name)
+        size = len(probe.get("probe", self.host.url("probe")))
+        probe.close()
+        cache = ThumbnailCache(self.tmp.name, max_bytes=size * 3)
+        for video_id in ["a", "b", "c"]:
+            cache.get(video_id, self.host.url(video_id))
+        cache.get("a", self.host.url("a"))
+        cache.get("d", self.host.url("d"))
+        cache.close()
+        stored = sorted(name[:-4] for name in os.listdir(self.tmp.name))
+        self.assertEqual(stored, ["a", "c", "d"])
+        used = sum(os.path.getsize(os.path.join(self.tmp.name, name)) for name in os.listdir(self.tmp.name))
+        self.assertLessEqual(used, size * 3)
+
+    def test_failed_fetch_returns_none(self):
+        """Test that a failing host yields None so the page can fall back to the URL"""
+        cache = ThumbnailCache(self.tmp.name)
+        self.assertIsNone(cache.get("missing", f"{self.host.base_url}/missing.jpg"))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
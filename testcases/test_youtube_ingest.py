@@ -0,0 +1,148 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from aiohttp import web
+
+from youtube_ingest import TokenBucket, YouTubeIngestor, run_ingestion
+
+
+class StubYouTubeAPI:
+    """Local stand-in for the YouTube Data API with search paging and injected failures"""
+
+    def __init__(self, channels, page_size=3, failures=0):
+        self.channels = channels
+        self.page_size = page_size
+        self.failures = failures
+        self.calls = {"channels": 0, "search": 0, "videos": 0, "not_modified": 0}
+        self.search_tokens = []
+        self.app = web.Application()
+        self.app.router.add_get("/channels", self.channels_handler)
+        self.app.router.add_get("/search", self.search_handler)
+        self.app.router.add_get("/videos", self.videos_handler)
+
+    async def start(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def channels_handler(self, request):
+        self.calls["channels"] += 1
+        video_ids = self.channels[request.query["id"]]
+        return web.json_response({"items": [{"statistics": {"subscriberCount": "100",
+                                                            "videoCount": str(len(video_ids))}}]})
+
+    async def search_handler(self, request):
+        self.calls["search"] += 1
+        video_ids = self.channels[request.query["channelId"]]
+        self.search_tokens.append(request.query.get("pageToken"))
+        start = int(request.query.get("pageToken", 0))
+        page = video_ids[start:start + self.page_size]
+        body = {"items": [{"id": {"videoId": video_id}} for video_id in page]}
+        if start + self.page_size < len(video_ids):
+            body["nextPageToken"] = str(start + self.page_size)
+        return web.json_response(body)
+
+    async def videos_handler(self, request):
+        self.calls["videos"] += 1
+        if self.failures:
+            self.failures -= 1
+            return web.json_response({"error": "backendError"}, status=503)
+        etag = f'"{request.query["id"]}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.calls["not_modified"] += 1
+            return web.Response(status=304)
+        items = []
+        for video_id in request.query["id"].split(","):
+            items.append({
+                "id": video_id,
+                "snippet": {
+                    "title": f"Video {video_id}",
+                    "channelTitle": "Channel",
+                    "categoryId": "10",
+                    "publishedAt": "2023-05-01T10:00:00Z",
+                    "tags": ["tag1", "tag2"],
+                    "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+                },
+                "statistics": {"viewCount": "1000", "likeCount": "100", "commentCount": "10"},
+            })
+        return web.json_response({"etag": etag, "items": items})
+
+
+def make_channels():
+    return {
+        "UC_one": [f"one{i}" for i in range(7)],
+        "UC_two": [f"two{i}" for i in range(60)],
+    }
+
+
+class TestYouTubeIngest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.api = StubYouTubeAPI(make_channels(), failures=1)
+        self.base_url = await self.api.start()
+
+    async def asyncTearDown(self):
+        await self.api.stop()
+
+    def make_ingestor(self):
+        return YouTubeIngestor(api_key="test", base_url=self.base_url,
+                               limiter=TokenBucket(rate=1e6, capacity=1e6), backoff=0.01)
+
+    async def test_crawl_pages_and_batches(self):
+        """Test that every page and 50-id batch is fetched and typed"""
+        df = await self.make_ingestor().crawl({"One": "UC_one", "Two": " UC_two"})
+        self.assertEqual(len(df), 67)
+        self.assertEqual(self.api.calls["search"], 3 + 20)
+        self.assertEqual(sorted(df["channel_name"].unique()), ["One", "Two"])
+        self.assertEqual(df["views"].dtype.kind, "i")
+        self.assertEqual(df["tags"].iloc[0], "tag1, tag2")
+
+    async def test_retries_transient_errors(self):
+        """Test that a 503 from the videos endpoint is retried"""
+        df = await self.make_ingestor().crawl({"One": "UC_one"})
+        self.assertEqual(len(df), 7)
+        self.assertEqual(self.api.calls["videos"], 2)
+
+    async def test_token_bucket_paces_calls(self):
+        """Test that the limiter delays calls beyond its capacity"""
+        bucket = TokenBucket(rate=100, capacity=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            await bucket.acquire()
+        self.assertGreaterEqual(loop.time() - start, 0.025)
+
+
+class TestRunIngestion(unittest.TestCase):
+
+    def test_writes_single_parquet_file(self):
+        """Test that run_ingestion writes one columnar output file"""
+        api = StubYouTubeAPI(make_channels())
+
+        async def crawl(output_path):
+            base_url = await api.start()
+            try:
+                return await asyncio.to_thread(
+                    run_ingestion, {"One": "UC_one"}, output_path, api_key="test", base_url=base_url,
+                    limiter=TokenBucket(rate=1e6, capacity=1e6),
+                )
+            finally:
+                await api.stop()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "youtube_videos.parquet")
+            df = asyncio.run(crawl(output_path))
+            self.assertTrue(os.path.exists(output_path))
+            self.assertEqual(len(df), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from youtube_loader import IncrementalYouTubeLoader
+
+
+def make_videos(ids, times):
+    return pd.DataFrame({
+        "video_id": ids,
+        "title": [f"Video {i}" for i in ids],
+        "channel_title": ["Channel 1"] * len(ids),
+        "category_id": [1] * len(ids),
+        "publish_time": pd.to_datetime(times),
+        "views": [1000] * len(ids),
+        "likes": [100] * len(ids),
+        "comment_count": [10] * len(ids),
+        "comments_disabled": [False] * len(ids),
+        "tags": ["tag1,tag2"] * len(ids),
+        "thumbnail_link": ["link"] * len(ids),
+        "description": ["Desc"] * len(ids),
+    })
+
+
+class FakeQueryJob:
+    def __init__(self, df):
+        self.df = df
+
+    def to_dataframe(self):
+        return self.df.copy()
+
+
+class FakeBigQueryClient:
+    """Local stand-in for bigquery.Client that applies the watermark parameters itself"""
+
+    def __init__(self, table):
+        self.table = table
+        self.queries = []
+
+    def query(self, query, job_config=None):
+        params = {p.name: p.value for p in job_config.query_parameters}
+        self.queries.append((query, params))
+        df = self.table
+        if params:
+            wm_time = pd.Timestamp(params["wm_time"])
+            df = df[(df["publish_time"] > wm_time) |
+                    ((df["publish_time"] == wm_time) & (df["video_id"] > params["wm_id"]))]
+        return FakeQueryJob(df)
+
+
+class TestIncrementalYouTubeLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.tmp.name, "youtube_videos.parquet")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cold_start_loads_full_table(self):
+        """Test that an empty snapshot triggers an unfiltered query"""
+        client = FakeBigQueryClient(make_videos(["a", "b"], ["2023-05-01", "2023-06-01"]))
+        df = IncrementalYouTubeLoader(client, snapshot_path=self.snapshot_path).load()
+        self.assertEqual(len(df), 2)
+        self.assertNotIn("WHERE", client.queries[0][0], "Cold start should not filter by watermark")
+        self.assertTrue(os.path.exists(self.snapshot_path), "Snapshot was not written")
+
+    def test_refresh_fetches_only_delta(self):
+        """Test that a warm snapshot only pulls rows past the watermark"""
+        client = FakeBigQueryClient(make_videos(["a", "b"], ["2023-05-01", "2023-06-01"]))
+        loader = IncrementalYouTubeLoader(client, snapshot_path=self.snapshot_path)
+        loader.load()
+
+        client.table = make_videos(["a", "b", "c", "d"],
+                                   ["2023-05-01", "2023-06-01", "2023-06-01", "2023-07-01"])
+        df = loader.load()
+        self.assertEqual(client.queries[-1][1]["wm_id"], "b")
+        self.assertEqual(list(df["video_id"]), ["a", "b", "c", "d"])
+
+    def test_empty_delta_keeps_snapshot(self):
+        """Test that a refresh with no new rows returns the snapshot unchanged"""
+        client = FakeBigQueryClient(make_videos(["a"], ["2023-05-01"]))
+        loader = IncrementalYouTubeLoader(client, snapshot_path=self.snapshot_path)
+        first = loader.load()
+        second = loader.load()
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_watermark_of_empty_frame(self):
+        """Test that an empty snapshot has no watermark"""
+        self.assertIsNone(IncrementalYouTubeLoader.watermark(pd.DataFrame(columns=["publish_time", "video_id"])))
+
+
+if __name__ == '__main__':
+    unittest.main()
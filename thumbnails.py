@@ -0,0 +1,128 @@
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import Image
+
+THUMBNAIL_DIR = "thumbnail_cache"
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+THUMBNAIL_WIDTH = 320
+PREFETCH_ROWS = 50
+
+
+def downscale(data, width=THUMBNAIL_WIDTH):
+    """Re-encode an image as a JPEG at most width pixels wide."""
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGB")
+        if image.width > width:
+            image = image.resize((width, max(round(image.height * width / image.width), 1)), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, format="JPEG", quality=85, optimize=True)
+        return out.getvalue()
+
+
+class ThumbnailCache:
+    """Size-bounded on-disk LRU of downscaled thumbnails keyed by video_id.
+
+    Pages read thumbnails as local bytes; misses are fetched once over a pooled session, with
+    concurrent requests for the same video sharing one download. prefetch queues the rows a
+    user is likely to page to next on a background thread pool. When the files on disk exceed
+    max_bytes the least recently used ones are deleted.
+    """
+
+    def __init__(self, directory=THUMBNAIL_DIR, max_bytes=MAX_CACHE_BYTES, width=THUMBNAIL_WIDTH,
+                 max_workers=8, timeout=10):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.width = width
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnails")
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._entries = OrderedDict()
+        self._size = 0
+        os.makedirs(directory, exist_ok=True)
+        files = [entry for entry in os.scandir(directory) if entry.name.endswith(".jpg")]
+        for entry in sorted(files, key=lambda entry: entry.stat().st_mtime):
+            self._entries[entry.name[:-4]] = entry.stat().st_size
+            self._size += entry.stat().st_size
+
+    def path(self, video_id):
+        return os.path.join(self.directory, f"{video_id}.jpg")
+
+    def _read(self, video_id):
+        with self._lock:
+            if video_id not in self._entries:
+                return None
+            self._entries.move_to_end(video_id)
+        try:
+            with open(self.path(video_id), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._entries.pop(video_id, 0)
+            return None
+
+    def _store(self, video_id, data):
+        tmp_path = f"{self.path(video_id)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path(video_id))
+        evicted = []
+        with self._lock:
+            self._size += len(data) - self._entries.pop(video_id, 0)
+            self._entries[video_id] = len(data)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                old_id, size = self._entries.popitem(last=False)
+                self._size -= size
+                evicted.append(old_id)
+        for old_id in evicted:
+            try:
+                os.remove(self.path(old_id))
+            except FileNotFoundError:
+                pass
+
+    def _download(self, video_id, url):
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            data = downscale(response.content, self.width)
+            self._store(video_id, data)
+            return data
+        except Exception as e:
+            logging.warning(f"Thumbnail fetch failed for {video_id}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._pending.pop(video_id, None)
+
+    def _submit(self, video_id, url):
+        with self._lock:
+            future = self._pending.get(video_id)
+            if future is None:
+                future = self._pending[video_id] = self.pool.submit(self._download, video_id, url)
+            return future
+
+    def get(self, video_id, url):
+        """Thumbnail bytes for a video, downloading on a miss; None if the fetch failed."""
+        data = self._read(video_id)
+        if data is not None:
+            return data
+        return self._submit(video_id, url).result()
+
+    def prefetch(self, rows):
+        """Queue (video_id, url) pairs that are not cached yet and return immediately."""
+        for video_id, url in rows:
+            with self._lock:
+                cached = video_id in self._entries
+            if not cached:
+                self._submit(video_id, url)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        self.session.close()
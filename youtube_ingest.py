@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from itertools import takewhile
+
+import aiohttp
+import pandas as pd
+
+from crawl_state import BATCH_SIZE, STATE_PATH, CrawlState
+
+API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+API_KEY = os.environ.get("YOUTUBE_API_KEY", "")
+OUTPUT_PATH = "youtube_videos.parquet"
+
+CHANNELS = {
+    "Alanana Ivor": "UChUJbP5pivwW9wuJecKAADg",
+    "Mahishivan": "UCxuRUI3Z0f70BcYyyFg9mbw",
+    "Juhithvlogs": "UCuLk-qQYRLSl3W0rdjeUIJA",
+    "tseries": "UCq-Fj5jknLsUf-MWSy4_brA",
+    "SaregamaMusic": "UCRh-4WUJx8M86gUYL2pyKSQ",
+    "adityamusic": "UCNApqoVYJbYSrni4YsbXzyQ",
+    "abn tv": "UC_2irx_BQR7RsBKmUV9fePQ",
+    "SakshiTV": "UCZ9m4KOh8Ei60428xeGYDCQ",
+    "Sports": "UCBLnMSERk0FVjoSO1atiu1g",
+    "Football": "UCvWuQfTMrRny57Cl3qtEmmg",
+}
+
+# Data API quota units charged per call.
+QUOTA_COSTS = {"search": 100, "channels": 1, "videos": 1}
+RETRY_STATUSES = {403, 429, 500, 502, 503, 504}
+MAX_VIDEOS_PER_CHANNEL = 10000
+
+
+class TokenBucket:
+    """Async token bucket: refills at rate tokens per second up to capacity."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, cost=1):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+                await asyncio.sleep((cost - self.tokens) / self.rate)
+
+
+class YouTubeIngestor:
+    """Crawls channels concurrently over one pooled session, paced by a quota token bucket.
+
+    With a CrawlState, runs are delta-only: search paging stops at the first already-known id,
+    only new videos plus the stored batches holding a video due under the tiered refresh
+    schedule are fetched, stored batches are sent with If-None-Match, and an interrupted crawl
+    resumes from its checkpoints.
+    """
+
+    def __init__(self, api_key=API_KEY, base_url=API_BASE_URL, limiter=None, channel_concurrency=4,
+                 batch_concurrency=8, max_retries=5, backoff=1.0, max_videos=MAX_VIDEOS_PER_CHANNEL, state=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        # The default daily Data API quota is 10,000 units.
+        self.limiter = limiter or TokenBucket(rate=10000 / 86400, capacity=10000)
+        self.channel_slots = asyncio.Semaphore(channel_concurrency)
+        self.batch_slots = asyncio.Semaphore(batch_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_videos = max_videos
+        self.state = state
+        self.session = None
+
+    async def get(self, endpoint, params, headers=None):
+        """GET an API endpoint, retrying 403/429/5xx with exponential backoff and jitter.
+
+        Returns None when a conditional request comes back 304 Not Modified.
+        """
+        params = {key: value for key, value in params.items() if value is not None}
+        params["key"] = self.api_key
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(QUOTA_COSTS.get(endpoint, 1))
+            async with self.session.get(f"{self.base_url}/{endpoint}", params=params, headers=headers) as response:
+                if response.status == 304:
+                    return None
+                if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return await response.json()
+            delay = self.backoff * 2 ** attempt * (0.5 + random.random() / 2)
+            logging.warning(f"{endpoint} returned {response.status}, retrying in {delay:.1f}s.")
+            await asyncio.sleep(delay)
+
+    async def channel_statistics(self, channel_id):
+        response = await self.get("channels", {"part": "statistics", "id": channel_id})
+        if response.get("items"):
+            stats = response["items"][0]["statistics"]
+            return {
+                "subscribers_count": int(stats.get("subscriberCount", 0)),
+                "total_videos": int(stats.get("videoCount", 0)),
+            }
+        return {"subscribers_count": 0, "total_videos": 0}
+
+    async def channel_video_ids(self, channel_id):
+        """Page through the channel's uploads, newest first, until reaching an already-known id."""
+        known = self.state.known_ids(channel_id) if self.state else set()
+        saved = self.state.checkpoint(channel_id) if self.state else None
+        page_token, video_ids = saved if saved else (None, [])
+        if saved and page_token is None:
+            return video_ids
+        while len(video_ids) < self.max_videos:
+            response = await self.get("search", {
+                "part": "id",
+                "channelId": channel_id,
+                "maxResults": BATCH_SIZE,
+                "order": "date",
+                "type": "video",
+                "pageToken": page_token,
+            })
+            page = [item["id"]["videoId"] for item in response.get("items", [])]
+            new_ids = list(takewhile(lambda video_id: video_id not in known, page))
+            video_ids.extend(new_ids)
+            page_token = response.get("nextPageToken") if len(new_ids) == len(page) else None
+            if self.state:
+                self.state.save_checkpoint(channel_id, page_token, video_ids)
+            if not page_token:
+                break
+        return video_ids[:self.max_videos]
+
+    async def video_batch(self, video_ids, channel_id, channel_fields, conditional=False):
+        """Fetch one batch; conditional batches are stored ones whose id set recurs between runs."""
+        etag = self.state.etag(video_ids) if conditional else None
+        headers = {"If-None-Match": etag} if etag else None
+        async with self.batch_slots:
+            response = await self.get("videos", {"part": "snippet,statistics", "id": ",".join(video_ids)}, headers)
+        if response is None:
+            self.state.touch(video_ids)
+            return self.state.records(video_ids)
+        videos = [{**video_record(item), **channel_fields} for item in response.get("items", [])]
+        if self.state:
+            self.state.record_videos(channel_id, videos)
+            if conditional and response.get("etag"):
+                self.state.save_etag(channel_id, video_ids, response["etag"])
+        return videos
+
+    async def video_details(self, video_ids, channel_id=None, channel_fields=None, refresh_batches=()):
+        """Fetch video_ids in batches of BATCH_SIZE plus each of refresh_batches as it is."""
+        batches = [video_ids[i:i + BATCH_SIZE] for i in range(0, len(video_ids), BATCH_SIZE)]
+        results = await asyncio.gather(
+            *(self.video_batch(batch, channel_id, channel_fields or {}) for batch in batches),
+            *(self.video_batch(batch, channel_id, channel_fields or {}, True) for batch in refresh_batches),
+        )
+        return [video for batch in results for video in batch]
+
+    async def crawl_channel(self, channel_name, channel_id):
+        async with self.channel_slots:
+            logging.info(f"Fetching data for {channel_name}...")
+            channel_stats, video_ids = await asyncio.gather(
+                self.channel_statistics(channel_id), self.channel_video_ids(channel_id)
+            )
+        refresh = []
+        if self.state:
+            # Known videos are refreshed in their stored batches, never mixed with new ids, so a
+            # new upload does not shift the batches whose ETags were saved.
+            batches = self.state.refresh_batches(channel_id)
+            self.state.prune_etags(channel_id, batches)
+            stored = {video_id for batch in batches for video_id in batch}
+            due = set(self.state.due_for_refresh(channel_id))
+            video_ids = [video_id for video_id in video_ids if video_id not in stored]
+            refresh = [batch for batch in batches if due.intersection(batch)]
+        if not video_ids and not refresh:
+            logging.warning(f"No new or due videos found for {channel_name}")
+            if self.state:
+                self.state.clear_checkpoint(channel_id)
+            return []
+        videos = await self.video_details(video_ids, channel_id, {"channel_name": channel_name, **channel_stats},
+                                          refresh)
+        if self.state:
+            self.state.clear_checkpoint(channel_id)
+        return videos
+
+    async def crawl(self, channels=CHANNELS, session=None):
+        """Crawl every channel and return one frame with the notebook's youtube_videos columns.
+
+        With a CrawlState the frame holds every stored video, not only this run's delta.
+        """
+        own_session = session is None
+        self.session = session or aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=32))
+        try:
+            results = await asyncio.gather(
+                *(self.crawl_channel(name, channel_id.strip()) for name, channel_id in channels.items())
+            )
+        finally:
+            if own_session:
+                await self.session.close()
+        if self.state:
+            return videos_frame(self.state.all_records())
+        return videos_frame([video for videos in results for video in videos])
+
+
+def video_record(item):
+    snippet = item["snippet"]
+    stats = item.get("statistics", {})
+    return {
+        "video_id": item["id"],
+        "title": snippet["title"],
+        "channel_title": snippet["channelTitle"],
+        "category_id": snippet.get("categoryId", ""),
+        "publish_time": snippet["publishedAt"],
+        "description": snippet.get("description", ""),
+        "tags": ", ".join(snippet.get("tags", [])),
+        "thumbnail_link": snippet["thumbnails"]["high"]["url"],
+        "video_link": f"https://www.youtube.com/watch?v={item['id']}",
+        "views": int(stats.get("viewCount", 0)),
+        "likes": int(stats.get("likeCount", 0)),
+        "comment_count": int(stats.get("commentCount", 0)),
+        "comments_disabled": "commentCount" not in stats,
+    }
+
+
+def videos_frame(videos):
+    df = pd.DataFrame(videos)
+    if not df.empty:
+        df["publish_time"] = pd.to_datetime(df["publish_time"]).dt.tz_localize(None)
+        df["category_id"] = pd.to_numeric(df["category_id"], errors="coerce").astype("Int64")
+    return df
+
+
+def run_ingestion(channels=CHANNELS, output_path=OUTPUT_PATH, state_path=None, **kwargs):
+    """Crawl the channels and write the result to a single Parquet file.
+
+    Passing state_path keeps a CrawlState there so repeated runs only fetch the delta.
+    """
+    state = CrawlState(state_path) if state_path else None
+    try:
+        df = asyncio.run(YouTubeIngestor(state=state, **kwargs).crawl(channels))
+    finally:
+        if state:
+            state.close()
+    if df.empty:
+        logging.warning("No data was fetched. Please check your API key or channel IDs.")
+        return df
+    df.to_parquet(output_path, index=False)
+    logging.info(f"Data saved to {output_path} (Total Videos Fetched: {len(df)})")
+    return df
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_ingestion(state_path=STATE_PATH)
@@ -0,0 +1,103 @@
+import logging
+import os
+
+import pandas as pd
+
+from perf import record_query_job
+
+YOUTUBE_TABLE = "youtube-analytics-454211.media_analytics.youtube_videos"
+YOUTUBE_COLUMNS = [
+    "video_id", "title", "channel_title", "category_id", "publish_time", "views", "likes", "comment_count",
+    "comments_disabled", "tags", "thumbnail_link", "description",
+]
+SNAPSHOT_PATH = os.path.join("snapshots", "youtube_videos.parquet")
+
+
+def query_job_config(params):
+    """Build a QueryJobConfig from (name, type, value) tuples."""
+    from google.cloud import bigquery
+
+    return bigquery.QueryJobConfig(
+        query_parameters=[bigquery.ScalarQueryParameter(name, kind, value) for name, kind, value in params]
+    )
+
+
+class IncrementalYouTubeLoader:
+    """Keeps a local Parquet copy of the YouTube table and only pulls rows past its high-water mark.
+
+    The watermark is the (publish_time, video_id) of the newest row in the snapshot, so each
+    refresh scans just the delta. Counter updates on already-loaded videos are not picked up;
+    call full_refresh() to rebuild the snapshot from scratch.
+    """
+
+    def __init__(self, client, table=YOUTUBE_TABLE, snapshot_path=SNAPSHOT_PATH, columns=YOUTUBE_COLUMNS):
+        self.client = client
+        self.table = table
+        self.snapshot_path = snapshot_path
+        self.columns = list(columns)
+
+    def read_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return pd.DataFrame(columns=self.columns)
+        return pd.read_parquet(self.snapshot_path)
+
+    @staticmethod
+    def watermark(df):
+        """Return (publish_time, video_id) of the newest row, or None for an empty frame."""
+        if df.empty:
+            return None
+        newest = df["publish_time"].max()
+        return newest, df.loc[df["publish_time"] == newest, "video_id"].max()
+
+    def fetch_delta(self, watermark):
+        query = f"SELECT {', '.join(self.columns)} FROM `{self.table}`"
+        params = []
+        if watermark is not None:
+            query += (
+                " WHERE publish_time > @wm_time"
+                " OR (publish_time = @wm_time AND video_id > @wm_id)"
+            )
+            params = [
+                ("wm_time", "DATETIME", pd.Timestamp(watermark[0]).to_pydatetime()),
+                ("wm_id", "STRING", watermark[1]),
+            ]
+        query += " ORDER BY publish_time, video_id"
+        job = self.client.query(query, job_config=query_job_config(params))
+        df = job.to_dataframe()
+        record_query_job(job, "youtube_delta")
+        df["publish_time"] = pd.to_datetime(df["publish_time"]).dt.tz_localize(None)
+        return df
+
+    def merge(self, snapshot, delta):
+        if snapshot.empty:
+            merged = delta
+        elif delta.empty:
+            merged = snapshot
+        else:
+            merged = pd.concat([snapshot, delta], ignore_index=True)
+        merged = merged.drop_duplicates("video_id", keep="last")
+        return merged.sort_values(["publish_time", "video_id"], ignore_index=True)
+
+    def write_snapshot(self, df):
+        directory = os.path.dirname(self.snapshot_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = self.snapshot_path + ".tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def load(self):
+        """Return the snapshot merged with any rows newer than its watermark."""
+        snapshot = self.read_snapshot()
+        delta = self.fetch_delta(self.watermark(snapshot))
+        logging.info(f"YouTube delta fetched: {delta.shape[0]} new records.")
+        if delta.empty:
+            return snapshot
+        merged = self.merge(snapshot, delta)
+        self.write_snapshot(merged)
+        return merged
+
+    def full_refresh(self):
+        df = self.merge(pd.DataFrame(columns=self.columns), self.fetch_delta(None))
+        self.write_snapshot(df)
+        return df